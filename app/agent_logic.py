@@ -2,13 +2,17 @@
 Rule-based mock AI agent for resource analysis (Правиловий псевдо-АІ агент для аналізу ресурсів).
 Simulates the "Resource Analyst" step in the cybernetic control cycle (Імітує крок "Аналіз ресурсу" у кібернетичному циклі).
 Reads growth coefficients from environment (.env) with sane defaults (Зчитує коефіцієнти зростання з оточення (.env) з типовими значеннями).
+The active rule set can be replaced at runtime with install_rule_config (Активний набір правил можна замінити під час роботи через install_rule_config).
 """
 
 import copy
 import os
-from typing import Dict, Tuple, List
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple, List
 
 from dotenv import load_dotenv
+from app.agent_rules import KeywordRule, RuleIndex
 from app.models import SystemState, ResourceType
 
 
@@ -57,21 +61,169 @@ DEF_STRAT = _get_int_env("RULE_DEFAULT_STRAT", 5)
 DEF_FIN = _get_int_env("RULE_DEFAULT_FIN", 5)
 
 
-def run_mock_analysis(goal: str, current_state: SystemState, capture_logs: bool = False) -> Tuple[SystemState, Dict[str, int], List[str]]:
+# Coefficients from the environment; the starting point that stored rule configs override (Коефіцієнти з оточення; початкова точка, яку перевизначають збережені конфігурації правил)
+DEFAULT_COEFFICIENTS: Dict[str, int] = {
+    "ECO_TECH": ECO_TECH, "ECO_EDU": ECO_EDU, "ECO_RISK": ECO_RISK,
+    "CUST_COMM": CUST_COMM, "CUST_INFO": CUST_INFO, "CUST_OPER": CUST_OPER,
+    "INNOV_TECH": INNOV_TECH, "INNOV_STRAT": INNOV_STRAT, "INNOV_FIN": INNOV_FIN,
+    "PARTNER_ORG": PARTNER_ORG, "PARTNER_COMM": PARTNER_COMM,
+    "RISK_RISK": RISK_RISK, "RISK_OPER": RISK_OPER,
+    "EDU_EDU": EDU_EDU, "EDU_ORG": EDU_ORG,
+    "DEF_TECH": DEF_TECH, "DEF_STRAT": DEF_STRAT, "DEF_FIN": DEF_FIN,
+}
+
+# Keyword rules in priority order, the first matching rule wins; deltas name coefficients
+# (Ключові правила в порядку пріоритету, перемагає перше відповідне; дельти посилаються на коефіцієнти)
+RULE_SPECS: Tuple[Tuple[str, Tuple[str, ...], Dict[ResourceType, str], str, str], ...] = (
+    (
+        "ecology",
+        ("переробк", "екологі", "circular"),
+        {ResourceType.TECHNOLOGICAL: "ECO_TECH", ResourceType.EDUCATIONAL: "ECO_EDU", ResourceType.RISK: "ECO_RISK"},
+        "📊 Виявлено ключові слова: Переробка, Екологія",
+        "💡 Recommendation: Increase Technological, Educational, Risk resources (Рекомендація: Збільшити Технологічний, Освітній, Ризиковий ресурси)",
+    ),
+    (
+        "customer",
+        ("клієнт", "сервіс", "клієнтськ"),
+        {ResourceType.COMMUNICATION: "CUST_COMM", ResourceType.INFORMATIONAL: "CUST_INFO", ResourceType.OPERATIONAL: "CUST_OPER"},
+        "📊 Виявлено ключові слова: Клієнт, Сервіс",
+        "💡 Recommendation: Increase Communication, Informational, Operational resources (Рекомендація: Збільшити Комунікаційний, Інформаційний, Операційний ресурси)",
+    ),
+    (
+        "innovation",
+        ("інновац", "цифров", "автоматизац"),
+        {ResourceType.TECHNOLOGICAL: "INNOV_TECH", ResourceType.STRATEGIC: "INNOV_STRAT", ResourceType.FINANCIAL: "INNOV_FIN"},
+        "📊 Виявлено ключові слова: Інновація, Цифрова трансформація",
+        "💡 Recommendation: Increase Technological, Strategic, Financial resources (Рекомендація: Збільшити Технологічний, Стратегічний, Фінансовий ресурси)",
+    ),
+    (
+        "partnership",
+        ("партнер", "екосистем", "співпрац"),
+        {ResourceType.ORGANIZATIONAL: "PARTNER_ORG", ResourceType.COMMUNICATION: "PARTNER_COMM"},
+        "📊 Виявлено ключові слова: Партнерство, Екосистема",
+        "💡 Recommendation: Increase Organizational, Communication resources (Рекомендація: Збільшити Організаційний, Комунікаційний ресурси)",
+    ),
+    (
+        "risk",
+        ("ризик", "безпека", "комплаєнс"),
+        {ResourceType.RISK: "RISK_RISK", ResourceType.OPERATIONAL: "RISK_OPER"},
+        "📊 Виявлено ключові слова: Ризики, Безпека",
+        "💡 Recommendation: Increase Risk and Operational resources (Рекомендація: Збільшити Ризиковий та Операційний ресурси)",
+    ),
+    (
+        "education",
+        ("освят", "трен", "знанн", "навчан"),
+        {ResourceType.EDUCATIONAL: "EDU_EDU", ResourceType.ORGANIZATIONAL: "EDU_ORG"},
+        "📊 Виявлено ключові слова: Освіта, Тренінги",
+        "💡 Recommendation: Increase Educational and Organizational resources (Рекомендація: Збільшити Освітній та Організаційний ресурси)",
+    ),
+)
+
+# Rule applied when no keyword matches (Правило, що застосовується, коли жодне ключове слово не знайдено)
+DEFAULT_RULE_SPEC: Tuple[str, Tuple[str, ...], Dict[ResourceType, str], str, str] = (
+    "default",
+    (),
+    {ResourceType.TECHNOLOGICAL: "DEF_TECH", ResourceType.STRATEGIC: "DEF_STRAT", ResourceType.FINANCIAL: "DEF_FIN"},
+    "📊 Ціль не розпізнано чітко - застосовую базові покращення",
+    "💡 Recommendation: Even improvement of core resources (Рекомендація: Рівномірне підвищення основних ресурсів)",
+)
+
+# Bound of the goal classification cache (Межа кешу класифікації цілей)
+GOAL_CACHE_SIZE = max(0, _get_int_env("AGENT_GOAL_CACHE_SIZE", 4096))
+
+
+def build_rule_index(coefficients: Dict[str, int]) -> RuleIndex:
     """
-    Simulate AI agent analysis based on the manager's goal (Симулювати аналіз АІ-агента на основі цілі менеджера).
+    Compile the rule table with the given coefficients (Скомпілювати таблицю правил із заданими коефіцієнтами).
+
+    Args:
+        coefficients: Coefficient values by name, missing names use DEFAULT_COEFFICIENTS (Значення коефіцієнтів за назвою, відсутні беруться з DEFAULT_COEFFICIENTS)
+
+    Returns:
+        Compiled RuleIndex (Скомпільований RuleIndex)
+    """
+    values = {**DEFAULT_COEFFICIENTS, **coefficients}
+
+    def make_rule(spec: Tuple[str, Tuple[str, ...], Dict[ResourceType, str], str, str]) -> KeywordRule:
+        """Resolve coefficient names of one rule spec (Підставити коефіцієнти в опис одного правила)."""
+        name, stems, deltas, detected, recommendation = spec
+        return KeywordRule(name, stems, {r_type: values[key] for r_type, key in deltas.items()}, detected, recommendation)
+
+    return RuleIndex([make_rule(spec) for spec in RULE_SPECS], make_rule(DEFAULT_RULE_SPEC), cache_size=GOAL_CACHE_SIZE)
+
+
+@dataclass(frozen=True)
+class RuleConfig:
+    """Active agent rule set: stored config version, coefficients, compiled rules and the stored overrides (Активний набір правил агента: версія збереженої конфігурації, коефіцієнти, скомпільовані правила та збережені перевизначення)."""
+    version: int
+    coefficients: Dict[str, int]
+    index: RuleIndex
+    overrides: Dict[str, int] = field(default_factory=dict)
+
+
+# Version 0 is the environment defaults; the whole config is swapped by rebinding one global (Версія 0 - типові значення з оточення; вся конфігурація замінюється переприв'язуванням однієї глобальної змінної)
+_active_config = RuleConfig(version=0, coefficients=dict(DEFAULT_COEFFICIENTS), index=build_rule_index(DEFAULT_COEFFICIENTS))
+_install_lock = threading.Lock()
+
+
+def rule_config() -> RuleConfig:
+    """Active rule config (Активна конфігурація правил)."""
+    return _active_config
+
+
+def rule_index() -> RuleIndex:
+    """Active compiled rule table (Активна скомпільована таблиця правил)."""
+    return _active_config.index
+
+
+def rule_coefficients() -> Dict[str, int]:
+    """Current rule coefficients by name, used to key cached results (Поточні коефіцієнти правил за назвою для ключів кешу результатів)."""
+    return dict(_active_config.coefficients)
+
+
+def install_rule_config(version: int, coefficients: Dict[str, int]) -> RuleConfig:
+    """
+    Compile coefficient overrides and swap them in as the active rule set (Скомпілювати перевизначення коефіцієнтів та зробити їх активним набором правил).
+
+    Overrides apply on top of DEFAULT_COEFFICIENTS, so coefficients that were never overridden follow the RULE_*
+    environment of this process (Перевизначення накладаються на DEFAULT_COEFFICIENTS, тож коефіцієнти, які не
+    перевизначалися, відповідають оточенню RULE_* цього процесу).
+
+    The new table is compiled before the swap, so readers keep using the previous one until the new one is complete and
+    never see a partial set; older versions than the active one are ignored
+    (Нова таблиця компілюється до заміни, тож читачі користуються попередньою, доки нова не готова, і ніколи не бачать
+    частковий набір; версії, старші за активну, ігноруються).
+
+    Args:
+        version: Stored config version (Версія збереженої конфігурації)
+        coefficients: Coefficient overrides by name, unknown names are ignored (Перевизначення коефіцієнтів за назвою, невідомі назви ігноруються)
+
+    Returns:
+        The rule config active after the call (Конфігурація правил, активна після виклику)
+    """
+    global _active_config
+    overrides = {key: int(value) for key, value in coefficients.items() if key in DEFAULT_COEFFICIENTS}
+    values = {**DEFAULT_COEFFICIENTS, **overrides}
+    with _install_lock:
+        current = _active_config
+        if version < current.version or (version == current.version and values == current.coefficients):
+            return current
+        _active_config = RuleConfig(version=version, coefficients=values, index=build_rule_index(values), overrides=overrides)
+        return _active_config
+
+
+def analyze_goal(goal: str, capture_logs: bool = False, rules: Optional[RuleIndex] = None) -> Tuple[Dict[ResourceType, int], List[str]]:
+    """
+    Classify the manager's goal into resource deltas without touching any state (Класифікувати ціль менеджера в дельти ресурсів, не змінюючи стан).
 
     Args:
         goal: Strategic goal text from the manager (Текст стратегічної цілі менеджера)
-        current_state: Current system state (Поточний стан системи)
         capture_logs: If True, capture log messages instead of printing (Якщо True, зберігати повідомлення логів замість виводу)
+        rules: Rule table to use, the active one if None (Таблиця правил, активна якщо None)
 
     Returns:
-        Tuple of (new_state, deltas_by_resource_type, log_messages) where deltas map resource type label to delta
-        (Кортеж (новий_стан, дельти_за_типом_ресурсу, повідомлення_логів), де дельти — мапа типу ресурсу до зміни)
+        Tuple of (deltas_by_resource_type, log_messages) (Кортеж (дельти_за_типом_ресурсу, повідомлення_логів))
     """
-    new_state = copy.deepcopy(current_state)
-    deltas_by_type: Dict[ResourceType, int] = {}
     log_messages: List[str] = []
     
     def log(msg: str) -> None:
@@ -85,94 +237,45 @@ def run_mock_analysis(goal: str, current_state: SystemState, capture_logs: bool
     log(f"🤖 AI Агент аналізує ціль: '{goal}'")
     log(f"{'='*60}")
 
-    goal_lower = goal.lower()
-
-    def apply_deltas(local_deltas: Dict[ResourceType, int], message: str) -> None:
-        """Apply resource deltas and log message (Застосувати дельти ресурсів і залогувати повідомлення)."""
-        nonlocal deltas_by_type
-        deltas_by_type = local_deltas
-        log(message)
-        for r_type, delta in local_deltas.items():
-            for resource in new_state.resources:
-                if resource.type == r_type:
-                    resource.value = min(100, resource.value + delta)
-        human_readable = "; ".join(
-            f"{r_type.value} (+{delta})" for r_type, delta in local_deltas.items()
-        )
-        log(f"✅ Updated resources: {human_readable}")
-
-    if "переробк" in goal_lower or "екологі" in goal_lower or "circular" in goal_lower:
-        log("📊 Виявлено ключові слова: Переробка, Екологія")
-        apply_deltas(
-            {
-                ResourceType.TECHNOLOGICAL: ECO_TECH,
-                ResourceType.EDUCATIONAL: ECO_EDU,
-                ResourceType.RISK: ECO_RISK,
-            },
-            "💡 Recommendation: Increase Technological, Educational, Risk resources (Рекомендація: Збільшити Технологічний, Освітній, Ризиковий ресурси)",
-        )
-    elif "клієнт" in goal_lower or "сервіс" in goal_lower or "клієнтськ" in goal_lower:
-        log("📊 Виявлено ключові слова: Клієнт, Сервіс")
-        apply_deltas(
-            {
-                ResourceType.COMMUNICATION: CUST_COMM,
-                ResourceType.INFORMATIONAL: CUST_INFO,
-                ResourceType.OPERATIONAL: CUST_OPER,
-            },
-            "💡 Recommendation: Increase Communication, Informational, Operational resources (Рекомендація: Збільшити Комунікаційний, Інформаційний, Операційний ресурси)",
-        )
-    elif "інновац" in goal_lower or "цифров" in goal_lower or "автоматизац" in goal_lower:
-        log("📊 Виявлено ключові слова: Інновація, Цифрова трансформація")
-        apply_deltas(
-            {
-                ResourceType.TECHNOLOGICAL: INNOV_TECH,
-                ResourceType.STRATEGIC: INNOV_STRAT,
-                ResourceType.FINANCIAL: INNOV_FIN,
-            },
-            "💡 Recommendation: Increase Technological, Strategic, Financial resources (Рекомендація: Збільшити Технологічний, Стратегічний, Фінансовий ресурси)",
-        )
-    elif "партнер" in goal_lower or "екосистем" in goal_lower or "співпрац" in goal_lower:
-        log("📊 Виявлено ключові слова: Партнерство, Екосистема")
-        apply_deltas(
-            {
-                ResourceType.ORGANIZATIONAL: PARTNER_ORG,
-                ResourceType.COMMUNICATION: PARTNER_COMM,
-            },
-            "💡 Recommendation: Increase Organizational, Communication resources (Рекомендація: Збільшити Організаційний, Комунікаційний ресурси)",
-        )
-    elif "ризик" in goal_lower or "безпека" in goal_lower or "комплаєнс" in goal_lower:
-        log("📊 Виявлено ключові слова: Ризики, Безпека")
-        apply_deltas(
-            {
-                ResourceType.RISK: RISK_RISK,
-                ResourceType.OPERATIONAL: RISK_OPER,
-            },
-            "💡 Recommendation: Increase Risk and Operational resources (Рекомендація: Збільшити Ризиковий та Операційний ресурси)",
-        )
-    elif "освят" in goal_lower or "трен" in goal_lower or "знанн" in goal_lower or "навчан" in goal_lower:
-        log("📊 Виявлено ключові слова: Освіта, Тренінги")
-        apply_deltas(
-            {
-                ResourceType.EDUCATIONAL: EDU_EDU,
-                ResourceType.ORGANIZATIONAL: EDU_ORG,
-            },
-            "💡 Recommendation: Increase Educational and Organizational resources (Рекомендація: Збільшити Освітній та Організаційний ресурси)",
-        )
-    else:
-        log("📊 Ціль не розпізнано чітко - застосовую базові покращення")
-        apply_deltas(
-            {
-                ResourceType.TECHNOLOGICAL: DEF_TECH,
-                ResourceType.STRATEGIC: DEF_STRAT,
-                ResourceType.FINANCIAL: DEF_FIN,
-            },
-            "💡 Recommendation: Even improvement of core resources (Рекомендація: Рівномірне підвищення основних ресурсів)",
-        )
+    rule = (rules if rules is not None else rule_index()).match(goal)
+    deltas_by_type = dict(rule.deltas)
+    log(rule.detected)
+    log(rule.recommendation)
+    human_readable = "; ".join(
+        f"{r_type.value} (+{delta})" for r_type, delta in deltas_by_type.items()
+    )
+    log(f"✅ Updated resources: {human_readable}")
 
     log(f"{'='*60}\n")
 
+    return deltas_by_type, log_messages if capture_logs else []
+
+
+def apply_resource_deltas(state: SystemState, deltas: Dict[ResourceType, int]) -> None:
+    """Add deltas to resources of the matching types in place, capped at 100 (Додати дельти до ресурсів відповідних типів на місці з обмеженням 100)."""
+    for r_type, delta in deltas.items():
+        for resource in state.resources_of_type(r_type):
+            resource.value = min(100, resource.value + delta)
+
+
+def run_mock_analysis(goal: str, current_state: SystemState, capture_logs: bool = False) -> Tuple[SystemState, Dict[str, int], List[str]]:
+    """
+    Simulate AI agent analysis based on the manager's goal (Симулювати аналіз АІ-агента на основі цілі менеджера).
+
+    Args:
+        goal: Strategic goal text from the manager (Текст стратегічної цілі менеджера)
+        current_state: Current system state (Поточний стан системи)
+        capture_logs: If True, capture log messages instead of printing (Якщо True, зберігати повідомлення логів замість виводу)
+
+    Returns:
+        Tuple of (new_state, deltas_by_resource_type, log_messages) where deltas map resource type label to delta
+        (Кортеж (новий_стан, дельти_за_типом_ресурсу, повідомлення_логів), де дельти — мапа типу ресурсу до зміни)
+    """
+    deltas_by_type, log_messages = analyze_goal(goal, capture_logs=capture_logs)
+    new_state = copy.deepcopy(current_state)
+    apply_resource_deltas(new_state, deltas_by_type)
     deltas_serialized: Dict[str, int] = {r_type.value: delta for r_type, delta in deltas_by_type.items()}
-    return new_state, deltas_serialized, log_messages if capture_logs else []
+    return new_state, deltas_serialized, log_messages
 
 
 
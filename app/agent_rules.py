@@ -0,0 +1,129 @@
+"""
+Keyword rule table of the mock agent compiled into a single matcher (Таблиця ключових правил псевдо-агента, скомпільована в один матчер).
+All keyword stems of all rules are compiled into one Aho-Corasick automaton that reads each goal character once, so
+classification cost depends on the goal length, not on the number of rules
+(Усі основи ключових слів усіх правил компілюються в один автомат Ахо-Корасік, що читає кожен символ цілі один раз, тож
+вартість класифікації залежить від довжини цілі, а не від кількості правил).
+Matches are memoized per compiled table, so a new table starts with an empty cache
+(Збіги запам'ятовуються для кожної скомпільованої таблиці, тож нова таблиця починає з порожнім кешем).
+"""
+
+import hashlib
+import json
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from app.models import ResourceType
+
+
+@dataclass(frozen=True)
+class KeywordRule:
+    """One classification rule: keyword stems and the resource deltas they trigger (Одне правило класифікації: основи ключових слів і дельти ресурсів, які вони викликають)."""
+    name: str
+    stems: Tuple[str, ...]
+    deltas: Dict[ResourceType, int]
+    detected: str
+    recommendation: str
+
+
+def rule_table_version(rules: Iterable[KeywordRule], default: KeywordRule) -> str:
+    """Content hash of a rule table, changes whenever stems, deltas or order change (Хеш вмісту таблиці правил, змінюється при зміні основ, дельт або порядку)."""
+    payload = [
+        [rule.name, list(rule.stems), {r_type.value: delta for r_type, delta in rule.deltas.items()}, rule.detected, rule.recommendation]
+        for rule in (*rules, default)
+    ]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+class RuleIndex:
+    """
+    Compiled rule table (Скомпільована таблиця правил).
+
+    Rules keep their table order as priority: when stems of several rules occur in a goal, the earliest rule wins, as in the
+    former if/elif chain (Правила зберігають порядок таблиці як пріоритет: якщо в цілі є основи кількох правил, перемагає
+    найраніше правило, як у колишньому ланцюжку if/elif).
+    """
+
+    __slots__ = ("rules", "default", "version", "_ranked", "_goto", "_fail", "_best", "_cached_scan")
+
+    def __init__(self, rules: Iterable[KeywordRule], default: KeywordRule, cache_size: int = 4096) -> None:
+        self.rules: Tuple[KeywordRule, ...] = tuple(rules)
+        self.default = default
+        self.version = rule_table_version(self.rules, default)
+        # Priority len(rules) means "no rule" and resolves to the default (Пріоритет len(rules) означає "немає правила" і веде до типового)
+        self._ranked: Tuple[KeywordRule, ...] = (*self.rules, default)
+        no_rule = len(self.rules)
+        # Trie of all stems; a node's best priority is the earliest rule owning a stem that ends there
+        # (Префіксне дерево всіх основ; найкращий пріоритет вузла — найраніше правило з основою, що там закінчується)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._best: List[int] = [no_rule]
+        for priority, rule in enumerate(self.rules):
+            for stem in rule.stems:
+                node = 0
+                for char in stem.lower():
+                    child = self._goto[node].get(char)
+                    if child is None:
+                        child = len(self._goto)
+                        self._goto[node][char] = child
+                        self._goto.append({})
+                        self._best.append(no_rule)
+                    node = child
+                self._best[node] = min(self._best[node], priority)
+        # Failure links point to the longest proper suffix that is also a trie node; breadth-first order lets each node
+        # inherit the best priority of stems ending as its suffixes (Посилання відмови ведуть до найдовшого власного
+        # суфікса, що теж є вузлом дерева; обхід у ширину дає кожному вузлу найкращий пріоритет основ, що є його суфіксами)
+        self._fail: List[int] = [0] * len(self._goto)
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target
+                self._best[child] = min(self._best[child], self._best[self._fail[child]])
+                pending.append(child)
+        self._cached_scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def match(self, goal: str) -> KeywordRule:
+        """
+        Rule that applies to a goal, memoized by the lower-cased text (Правило, що застосовується до цілі, із запам'ятовуванням за текстом у нижньому регістрі).
+
+        Args:
+            goal: Goal text in any case (Текст цілі в будь-якому регістрі)
+
+        Returns:
+            The highest-priority matching rule, or the default rule (Правило з найвищим пріоритетом або типове правило)
+        """
+        return self._cached_scan(goal.lower())
+
+    def cache_stats(self) -> Dict[str, object]:
+        """Hit/miss counters of the match cache (Лічильники влучань/промахів кешу збігів)."""
+        info = self._cached_scan.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "version": self.version,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_ratio": info.hits / lookups if lookups else 0.0,
+            "entries": info.currsize,
+            "max_entries": info.maxsize,
+        }
+
+    def _scan(self, normalized: str) -> KeywordRule:
+        """Scan lower-cased goal text for the best rule in one pass (Просканувати ціль у нижньому регістрі за один прохід у пошуку найкращого правила)."""
+        goto, fail, best_of = self._goto, self._fail, self._best
+        best = best_of[0]
+        node = 0
+        for char in normalized:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best_of[node] < best:
+                best = best_of[node]
+                if best == 0:
+                    break
+        return self._ranked[best]
@@ -3,7 +3,7 @@ Analytics module for calculating scientific metrics indices (Модуль ана
 Implements formulas from ai_agents_nervous_system article (Реалізує формули зі статті ai_agents_nervous_system).
 """
 
-from typing import Optional
+from typing import Dict, Optional
 from app.models import SystemState, ResourceType, ComponentType
 
 
@@ -105,6 +105,40 @@ def calculate_a_index(t_adapt: float, t_market: float) -> float:
     return max(0.0, a_index)
 
 
+def resource_type_means(state: SystemState) -> Dict[ResourceType, float]:
+    """
+    Average resource value per type from the state's type index (Середнє значення ресурсів за типом з індексу типів стану).
+    
+    Args:
+        state: Current system state (Поточний стан системи)
+    
+    Returns:
+        Mapping resource type → mean value, types without resources are absent (Мапа тип ресурсу → середнє значення, типів без ресурсів немає)
+    """
+    means = {r_type: state.type_mean(r_type) for r_type in ResourceType}
+    return {r_type: mean for r_type, mean in means.items() if mean is not None}
+
+
+def _tech_level(state: SystemState) -> float:
+    """Technological resource level [0, 1] from the type mean (Рівень технологічного ресурсу [0, 1] із середнього за типом)."""
+    avg_value = state.type_mean(ResourceType.TECHNOLOGICAL)
+    return avg_value / 100.0 if avg_value is not None else 0.0
+
+
+def _soc_level(state: SystemState, culture_value: float) -> float:
+    """Social/cultural resource level [0, 1] from the educational mean and culture (Рівень соціального/культурного ресурсу [0, 1] із середнього освітніх ресурсів і культури)."""
+    edu_value = state.type_mean(ResourceType.EDUCATIONAL)
+    return ((edu_value if edu_value is not None else 0.0) + culture_value) / 2.0 / 100.0
+
+
+def _waste_level(state: SystemState) -> float:
+    """Waste level [0, 1] from the operational mean (Рівень відходів [0, 1] із середнього операційних ресурсів)."""
+    avg_operational = state.type_mean(ResourceType.OPERATIONAL)
+    if avg_operational is None:
+        return 0.5  # Default waste if no operational resources (Типові відходи, якщо немає операційних ресурсів)
+    return max(0.0, min(1.0, 1.0 - avg_operational / 100.0))
+
+
 def extract_tech_resource(state: SystemState) -> float:
     """
     Extract technological resource level from system state (Витягти рівень технологічного ресурсу зі стану системи).
@@ -115,53 +149,63 @@ def extract_tech_resource(state: SystemState) -> float:
     Returns:
         Normalized technological resource value [0, 1] (Нормалізоване значення технологічного ресурсу [0, 1])
     """
-    tech_resources = [r for r in state.resources if r.type == ResourceType.TECHNOLOGICAL]
-    if not tech_resources:
-        return 0.0
-    
     # Average of all technological resources, normalized to [0, 1] (Середнє всіх технологічних ресурсів, нормалізоване до [0, 1])
-    avg_value = sum(r.value for r in tech_resources) / len(tech_resources)
-    return avg_value / 100.0
+    return _tech_level(state)
 
 
-def extract_soc_resource(state: SystemState) -> float:
+def culture_level(status: Optional[str]) -> float:
     """
-    Extract social/cultural resource level from system state (Витягти рівень соціального/культурного ресурсу зі стану системи).
+    Map a CULTURE component status to a numeric level 0-100 (Перетворити статус компонента культури на числовий рівень 0-100).
     
-    Uses EDUCATIONAL resource and CULTURE component status (Використовує освітній ресурс та статус компонента культури).
+    Args:
+        status: Culture component status, None if there is no culture component (Статус компонента культури, None якщо його немає)
+    
+    Returns:
+        Culture level in points (Рівень культури в пунктах)
+    """
+    if status is None:
+        return 50.0  # Default (За замовчуванням)
+    
+    # Map culture status to numeric value (Маппінг статусу культури до числового значення)
+    status = status.lower()
+    if "healthy" in status or "active" in status:
+        return 80.0
+    if "stable" in status:
+        return 60.0
+    if "progress" in status or "improving" in status:
+        return 70.0
+    return 40.0
+
+
+def extract_culture_value(state: SystemState) -> float:
+    """
+    Map CULTURE component status to a numeric level 0-100 (Перетворити статус компонента культури на числовий рівень 0-100).
     
     Args:
         state: Current system state (Поточний стан системи)
     
     Returns:
-        Normalized social/cultural resource value [0, 1] (Нормалізоване значення соціального/культурного ресурсу [0, 1])
+        Culture level in points, 50.0 if there is no culture component (Рівень культури в пунктах, 50.0 якщо компонента культури немає)
     """
-    # Get educational resources (Отримати освітні ресурси)
-    edu_resources = [r for r in state.resources if r.type == ResourceType.EDUCATIONAL]
-    
     # Get culture component status (Отримати статус компонента культури)
     culture_components = [c for c in state.components if c.name == ComponentType.CULTURE]
+    return culture_level(culture_components[0].status if culture_components else None)
+
+
+def extract_soc_resource(state: SystemState) -> float:
+    """
+    Extract social/cultural resource level from system state (Витягти рівень соціального/культурного ресурсу зі стану системи).
     
-    edu_value = 0.0
-    if edu_resources:
-        edu_value = sum(r.value for r in edu_resources) / len(edu_resources)
+    Uses EDUCATIONAL resource and CULTURE component status (Використовує освітній ресурс та статус компонента культури).
     
-    # Map culture status to numeric value (Маппінг статусу культури до числового значення)
-    culture_value = 50.0  # Default (За замовчуванням)
-    if culture_components:
-        status = culture_components[0].status.lower()
-        if "healthy" in status or "active" in status:
-            culture_value = 80.0
-        elif "stable" in status:
-            culture_value = 60.0
-        elif "progress" in status or "improving" in status:
-            culture_value = 70.0
-        else:
-            culture_value = 40.0
+    Args:
+        state: Current system state (Поточний стан системи)
     
+    Returns:
+        Normalized social/cultural resource value [0, 1] (Нормалізоване значення соціального/культурного ресурсу [0, 1])
+    """
     # Average of educational and culture, normalized to [0, 1] (Середнє освітнього та культури, нормалізоване до [0, 1])
-    combined_value = (edu_value + culture_value) / 2.0
-    return combined_value / 100.0
+    return _soc_level(state, extract_culture_value(state))
 
 
 def extract_waste_from_processes(state: SystemState) -> float:
@@ -177,22 +221,9 @@ def extract_waste_from_processes(state: SystemState) -> float:
     Returns:
         Normalized waste level [0, 1] (Нормалізований рівень відходів [0, 1])
     """
-    # Get operational resources (Отримати операційні ресурси)
-    operational_resources = [r for r in state.resources if r.type == ResourceType.OPERATIONAL]
-    
-    if not operational_resources:
-        return 0.5  # Default waste if no operational resources (Типові відходи, якщо немає операційних ресурсів)
-    
-    # Calculate average operational resource value (Обчислити середнє значення операційного ресурсу)
-    avg_operational = sum(r.value for r in operational_resources) / len(operational_resources)
-    
-    # Waste is inverse of operational efficiency (Відходи - обернене до операційної ефективності)
+    # Waste is inverse of operational efficiency, clamped to [0, 1] (Відходи - обернене до операційної ефективності, обмежене [0, 1])
     # Formula: waste = 1.0 - (operational_value / 100.0) (Формула: waste = 1.0 - (operational_value / 100.0))
-    efficiency = avg_operational / 100.0
-    waste = 1.0 - efficiency
-    
-    # Clamp to valid range (Обмежити до валідного діапазону)
-    return max(0.0, min(1.0, waste))
+    return _waste_level(state)
 
 
 def calculate_metrics_from_state(
@@ -215,10 +246,10 @@ def calculate_metrics_from_state(
     Returns:
         Tuple of (s_index, c_index, a_index) (Кортеж (s_index, c_index, a_index))
     """
-    # Extract resources for S index (Витягти ресурси для індексу S)
-    tech_resource = extract_tech_resource(state)
-    soc_resource = extract_soc_resource(state)
-    waste = extract_waste_from_processes(state)
+    # Extract resources for S index from the state's type index (Витягти ресурси для індексу S з індексу типів стану)
+    tech_resource = _tech_level(state)
+    soc_resource = _soc_level(state, extract_culture_value(state))
+    waste = _waste_level(state)
     
     # Calculate S index (Обчислити індекс S)
     s_index = calculate_s_index(tech_resource, soc_resource, waste)
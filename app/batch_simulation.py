@@ -0,0 +1,204 @@
+"""
+Vectorized batch simulation engine (Векторизований пакетний рушій симуляції).
+Runs many replications of one scenario at once on NumPy arrays of shape replications × resources
+(Виконує багато реплікацій одного сценарію одночасно на масивах NumPy розміром реплікації × ресурси).
+Uses the same event tables, draw distributions and S/C/A formulas as the scalar engine in app.simulation
+(Використовує ті самі таблиці подій, розподіли та формули S/C/A, що й скалярний рушій у app.simulation).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.agent_logic import analyze_goal
+from app.agent_rules import RuleIndex
+from app.analytics import calculate_a_index, extract_culture_value
+from app.initial_state import INITIAL_STATE
+from app.models import SystemState, ResourceType
+from app.simulation import INTENSITY_EVENTS, EVENT_PERIODS, INTENSITY_MULTIPLIERS, DEGRADATION_RATES
+
+
+# Default percentiles for confidence bands (Типові перцентилі для довірчих смуг)
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+
+@dataclass
+class BatchSimulationResult:
+    """Per-replication index series, each array has shape (replications, days + 1) (Ряди індексів по реплікаціях, кожен масив має форму (реплікації, дні + 1))."""
+    s_index: np.ndarray
+    c_index: np.ndarray
+    a_index: np.ndarray
+
+    @property
+    def replications(self) -> int:
+        """Number of replications (Кількість реплікацій)."""
+        return int(self.s_index.shape[0])
+
+
+def _event_delta_matrix(events: Sequence[str], state: SystemState, rules: Optional[RuleIndex] = None) -> np.ndarray:
+    """
+    Build a matrix of resource deltas, one row per event (Побудувати матрицю дельт ресурсів, по рядку на подію).
+
+    Deltas are taken from the agent itself so the batch path never drifts from the scalar rules
+    (Дельти беруться від самого агента, тож пакетний шлях не розходиться зі скалярними правилами).
+    """
+    matrix = np.zeros((len(events), len(state.resources)), dtype=float)
+    for row, goal in enumerate(events):
+        deltas, _ = analyze_goal(goal, capture_logs=True, rules=rules)
+        for col, resource in enumerate(state.resources):
+            matrix[row, col] = deltas.get(resource.type, 0)
+    return matrix
+
+
+def _type_mean(values: np.ndarray, mask: np.ndarray) -> Optional[np.ndarray]:
+    """Mean of the masked resource columns per replication, None if none match (Середнє вибраних стовпців ресурсів по реплікаціях, None якщо таких немає)."""
+    if not mask.any():
+        return None
+    return values[:, mask].mean(axis=1)
+
+
+def _s_index_batch(values: np.ndarray, masks: Dict[ResourceType, np.ndarray], culture_value: float) -> np.ndarray:
+    """
+    Vectorized S index: S = (R_eco + R_soc) / 2 * (1 - W) (Векторизований індекс S).
+
+    Mirrors extract_tech_resource, extract_soc_resource, extract_waste_from_processes and calculate_s_index
+    (Відтворює extract_tech_resource, extract_soc_resource, extract_waste_from_processes та calculate_s_index).
+    """
+    replications = values.shape[0]
+
+    tech_mean = _type_mean(values, masks[ResourceType.TECHNOLOGICAL])
+    tech = tech_mean / 100.0 if tech_mean is not None else np.zeros(replications)
+
+    edu_mean = _type_mean(values, masks[ResourceType.EDUCATIONAL])
+    edu = edu_mean if edu_mean is not None else np.zeros(replications)
+    soc = (edu + culture_value) / 2.0 / 100.0
+
+    oper_mean = _type_mean(values, masks[ResourceType.OPERATIONAL])
+    if oper_mean is None:
+        waste = np.full(replications, 0.5)
+    else:
+        waste = np.clip(1.0 - oper_mean / 100.0, 0.0, 1.0)
+
+    return np.clip((tech + soc) / 2.0 * (1.0 - waste), 0.0, 1.0)
+
+
+def _c_index_batch(total_ops: np.ndarray, total_alerts: np.ndarray) -> np.ndarray:
+    """Vectorized C index: C = 1 - N_alerts / N_ops (Векторизований індекс C)."""
+    ratio = np.minimum(1.0, np.maximum(total_alerts, 0) / np.maximum(total_ops, 1))
+    return np.where(total_ops == 0, 1.0, np.clip(1.0 - ratio, 0.0, 1.0))
+
+
+def run_batch_simulation(
+    days: int = 30,
+    intensity: str = "high",
+    t_market: float = 30.0,
+    use_agent: bool = True,
+    replications: int = 1000,
+    seed: Optional[Union[int, np.random.SeedSequence]] = None,
+    initial_state: Optional[SystemState] = None,
+    base_ops: int = 100,
+    base_alerts: int = 5,
+    rules: Optional[RuleIndex] = None
+) -> BatchSimulationResult:
+    """
+    Run many independent replications of one simulation scenario at once (Запустити багато незалежних реплікацій одного сценарію симуляції одночасно).
+
+    Args:
+        days: Number of simulation days (Кількість днів симуляції)
+        intensity: Event intensity level ("low", "medium", "high") (Рівень інтенсивності подій)
+        t_market: Market change time in days (Час змін на ринку в днях)
+        use_agent: If True, agent responds to events; if False, entropy degrades resources (Якщо True, агент реагує на події; якщо False, ентропія деградує ресурси)
+        replications: Number of independent replications (Кількість незалежних реплікацій)
+        seed: Optional seed or SeedSequence for the NumPy generator (Опціональне зерно або SeedSequence для генератора NumPy)
+        initial_state: Starting state, defaults to INITIAL_STATE (Початковий стан, за замовчуванням INITIAL_STATE)
+        base_ops: Base number of operations per day (Базова кількість операцій на день)
+        base_alerts: Base number of alerts per day (Базова кількість алертів на день)
+        rules: Rule table for the agent deltas, the active one if None (Таблиця правил для дельт агента, активна якщо None)
+
+    Returns:
+        BatchSimulationResult with S, C, A series per replication (BatchSimulationResult з рядами S, C, A для кожної реплікації)
+    """
+    if replications < 1:
+        raise ValueError("replications must be >= 1")
+
+    rng = np.random.default_rng(seed)
+    state = initial_state if initial_state is not None else INITIAL_STATE
+
+    # Unknown intensities fall back to the same defaults as the scalar engine (Невідомі інтенсивності мають ті самі значення за замовчуванням, що й у скалярному рушії)
+    event_key = intensity if intensity in INTENSITY_EVENTS else "high"
+    events = INTENSITY_EVENTS[event_key]
+    period = EVENT_PERIODS[event_key]
+    ops_mult, alerts_mult = INTENSITY_MULTIPLIERS.get(intensity, (1.0, 1.0))
+    degradation = DEGRADATION_RATES.get(intensity, 1.0)
+
+    # Resource values for all replications (Значення ресурсів для всіх реплікацій)
+    initial_values = np.array([r.value for r in state.resources], dtype=float)
+    values = np.tile(initial_values, (replications, 1))
+    types = [r.type for r in state.resources]
+    masks = {r_type: np.array([t == r_type for t in types], dtype=bool) for r_type in ResourceType}
+    culture_value = extract_culture_value(state)
+    delta_matrix = _event_delta_matrix(events, state, rules) if use_agent else None
+
+    # Draw operations and alerts for all replications and days at once (Згенерувати операції та алерти для всіх реплікацій і днів одразу)
+    shape = (replications, days)
+    ops = np.floor(base_ops * ops_mult * rng.uniform(0.8, 1.2, size=shape))
+    alerts = np.floor(base_alerts * alerts_mult * rng.uniform(0.5, 1.5, size=shape))
+    spikes = rng.random(size=shape) < 0.1  # 10% chance (10% ймовірність)
+    alerts = np.where(spikes, np.floor(alerts * rng.uniform(2.0, 4.0, size=shape)), alerts)
+    total_ops = np.concatenate([np.zeros((replications, 1)), np.cumsum(np.maximum(ops, 0), axis=1)], axis=1)
+    total_alerts = np.concatenate([np.zeros((replications, 1)), np.cumsum(np.maximum(alerts, 0), axis=1)], axis=1)
+
+    s_series = np.empty((replications, days + 1))
+    s_series[:, 0] = _s_index_batch(values, masks, culture_value)
+
+    # A index is identical across replications: adaptation starts on the first event day (Індекс A однаковий для всіх реплікацій: адаптація починається в перший день події)
+    a_values = np.empty(days + 1)
+    a_values[0] = calculate_a_index(1.0, t_market)
+    adaptation_start_day: Optional[int] = None
+
+    for day in range(1, days + 1):
+        is_event_day = day % period == 0
+        if is_event_day:
+            choices = rng.integers(0, len(events), size=replications)
+        if use_agent:
+            if is_event_day:
+                if adaptation_start_day is None:
+                    adaptation_start_day = day
+                np.minimum(values + delta_matrix[choices], 100.0, out=values)
+        else:
+            np.maximum(values - degradation, 0.0, out=values)
+
+        s_series[:, day] = _s_index_batch(values, masks, culture_value)
+        t_adapt = float(day - adaptation_start_day + 1) if adaptation_start_day is not None else 1.0
+        a_values[day] = calculate_a_index(t_adapt, t_market)
+
+    return BatchSimulationResult(
+        s_index=s_series,
+        c_index=_c_index_batch(total_ops, total_alerts),
+        a_index=np.tile(a_values, (replications, 1)),
+    )
+
+
+def percentile_series(
+    result: BatchSimulationResult,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES
+) -> Dict[str, Dict[str, List[float]]]:
+    """
+    Summarize batch results into per-day mean and percentile series (Звести пакетні результати до щоденних рядів середнього та перцентилів).
+
+    Args:
+        result: Batch simulation result (Результат пакетної симуляції)
+        percentiles: Percentiles to compute, e.g. (5, 50, 95) (Перцентилі для обчислення, напр. (5, 50, 95))
+
+    Returns:
+        Mapping index name → {"mean": [...], "p5": [...], ...} (Мапа назва індексу → {"mean": [...], "p5": [...], ...})
+    """
+    summary: Dict[str, Dict[str, List[float]]] = {}
+    for name in ("s_index", "c_index", "a_index"):
+        series = getattr(result, name)
+        bands: Dict[str, List[float]] = {"mean": series.mean(axis=0).tolist()}
+        for q, values in zip(percentiles, np.percentile(series, percentiles, axis=0)):
+            bands[f"p{q:g}"] = values.tolist()
+        summary[name] = bands
+    return summary
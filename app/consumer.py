@@ -24,14 +24,9 @@ def update_resource_value(resource_type: ResourceType, new_value: float) -> None
     """Update specific resource value using repository (Оновити значення ресурсу через репозиторій)."""
     try:
         current_state = read_system_state()
-        updated = False
-        for resource in current_state.resources:
-            if resource.type == resource_type:
-                resource.value = new_value
-                updated = True
-                break
-
-        if updated:
+        matching = current_state.resources_of_type(resource_type)
+        if matching:
+            matching[0].value = new_value
             write_system_state(current_state)
             print(f"[Consumer] Updated DB: {resource_type.value} = {new_value}")
         else:
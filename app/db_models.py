@@ -44,6 +44,76 @@ class SimulationMetricRow(SQLModel, table=True):
     day: int = Field(ge=0, description="Simulation day (День симуляції)")
 
 
-
-
-
+class SimulationRunRow(SQLModel, table=True):
+    """Stores simulation run parameters and seed for replay (Зберігає параметри запуску симуляції та зерно для відтворення)."""
+    id: str = Field(primary_key=True, description="Simulation run ID (ID запуску симуляції)")
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    days: int
+    intensity: str
+    t_market: float
+    use_agent: bool = Field(default=True)
+    seed: int = Field(description="Seed of the run's random generator (Зерно генератора випадкових чисел запуску)")
+
+
+class SimulationRunOptionsRow(SQLModel, table=True):
+    """Scenario and resolution of a simulation run, needed to extend it the same way (Сценарій і роздільність запуску симуляції, потрібні для такого самого продовження)."""
+    simulation_run_id: str = Field(primary_key=True, description="Simulation run ID (ID запуску симуляції)")
+    ticks_per_day: int = Field(default=1, ge=1, description="Operations and alerts resolution (Роздільність операцій та алертів)")
+    scenario: Optional[str] = Field(default=None, description="JSON-encoded SimulationScenario, None for built-in events (SimulationScenario у JSON, None для вбудованих подій)")
+
+
+class SimulationSweepCellRow(SQLModel, table=True):
+    """Compact result of one parameter-sweep cell (Компактний результат однієї клітинки перебору параметрів)."""
+    cell_key: str = Field(primary_key=True, description="Hash of cell parameters (Хеш параметрів клітинки)")
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    days: int
+    intensity: str
+    t_market: float
+    use_agent: bool
+    seed: int
+    replications: int
+    final_s_index: float
+    final_c_index: float
+    final_a_index: float
+    mean_s_index: float
+    mean_c_index: float
+    mean_a_index: float
+
+
+class SimulationCheckpointRow(SQLModel, table=True):
+    """Engine state of a simulation run at the end of a day, used to extend the run (Стан рушія запуску симуляції наприкінці дня для продовження запуску)."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    simulation_run_id: str = Field(index=True, description="Simulation run ID (ID запуску симуляції)")
+    day: int = Field(ge=0, description="Last simulated day (Останній симульований день)")
+    state_json: str  # JSON string of SystemState (JSON-рядок стану)
+    total_ops: int
+    total_alerts: int
+    adaptation_start_day: Optional[int] = None
+    agent_actions: int = 0
+    rng_state: str  # JSON string of random.Random state (JSON-рядок стану random.Random)
+
+
+class SimulationResultCacheRow(SQLModel, table=True):
+    """Cached output of a deterministic simulation request (Кешований результат детермінованого запиту симуляції)."""
+    cache_key: str = Field(primary_key=True, description="Hash of request, seed and rule coefficients (Хеш запиту, зерна та коефіцієнтів правил)")
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    simulation_run_id: str
+    seed: int
+    payload: str = Field(description="Metrics response as JSON (Відповідь з метриками у JSON)")
+    agent_logs: str = Field(description="JSON-encoded agent log lines (Рядки логів агента у JSON)")
+    size_bytes: int
+
+
+class SimulationRunLogRow(SQLModel, table=True):
+    """Completion record of a simulation run with its agent logs, shared by all API workers (Запис про завершення запуску симуляції з логами агента, спільний для всіх робочих процесів API)."""
+    simulation_run_id: str = Field(primary_key=True, description="Simulation run ID (ID запуску симуляції)")
+    completed_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    agent_logs: str = Field(default="[]", description="JSON-encoded agent log lines (Рядки логів агента у JSON)")
+
+
+class AgentRuleConfigRow(SQLModel, table=True):
+    """Published version of the agent rule coefficients, the highest version is active (Опублікована версія коефіцієнтів правил агента, активна найвища версія)."""
+    version: int = Field(primary_key=True, ge=1, description="Monotonic config version (Монотонна версія конфігурації)")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    coefficients: str = Field(description="JSON-encoded coefficient overrides by name, applied on top of the RULE_* environment (Перевизначення коефіцієнтів за назвою у JSON, що накладаються на оточення RULE_*)")
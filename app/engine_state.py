@@ -0,0 +1,210 @@
+"""
+Engine-internal state representation for the simulation hot loop (Внутрішнє представлення стану рушія для гарячого циклу симуляції).
+Resource values live in one flat list indexed through a shared layout, so a simulated day updates numbers in place instead
+of deep-copying and re-validating Pydantic models; SystemState is built only at the API and persistence boundary
+(Значення ресурсів зберігаються в одному плоскому списку з індексацією через спільну розкладку, тож симульований день
+оновлює числа на місці замість глибокого копіювання та повторної валідації моделей Pydantic; SystemState будується лише
+на межі API та збереження).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.analytics import calculate_s_index, calculate_c_index, calculate_a_index, culture_level
+from app.models import SystemState, KeyComponent, Resource, ResourceType, ComponentType
+
+
+@dataclass(frozen=True)
+class StateLayout:
+    """Immutable description of resources and components shared by all copies of an engine state (Незмінний опис ресурсів і компонентів, спільний для всіх копій стану рушія)."""
+    resource_ids: Tuple[str, ...]
+    resource_names: Tuple[str, ...]
+    resource_types: Tuple[ResourceType, ...]
+    type_indices: Dict[ResourceType, Tuple[int, ...]]
+    component_ids: Tuple[str, ...]
+    component_names: Tuple[ComponentType, ...]
+    culture_index: Optional[int]
+
+    @classmethod
+    def from_state(cls, state: SystemState) -> "StateLayout":
+        """Derive the layout from a system state (Отримати розкладку зі стану системи)."""
+        types = tuple(r.type for r in state.resources)
+        type_indices: Dict[ResourceType, Tuple[int, ...]] = {}
+        for index, r_type in enumerate(types):
+            type_indices[r_type] = type_indices.get(r_type, ()) + (index,)
+        names = tuple(c.name for c in state.components)
+        return cls(
+            resource_ids=tuple(r.id for r in state.resources),
+            resource_names=tuple(r.name for r in state.resources),
+            resource_types=types,
+            type_indices=type_indices,
+            component_ids=tuple(c.id for c in state.components),
+            component_names=names,
+            culture_index=names.index(ComponentType.CULTURE) if ComponentType.CULTURE in names else None,
+        )
+
+
+class EngineState:
+    """
+    Mutable simulation state: resource values in layout order plus component statuses (Змінний стан симуляції: значення ресурсів у порядку розкладки та статуси компонентів).
+    """
+
+    __slots__ = ("layout", "values", "statuses", "s_index", "c_index", "a_index")
+
+    def __init__(
+        self,
+        layout: StateLayout,
+        values: List[float],
+        statuses: List[str],
+        s_index: Optional[float] = None,
+        c_index: Optional[float] = None,
+        a_index: Optional[float] = None
+    ) -> None:
+        self.layout = layout
+        self.values = values
+        self.statuses = statuses
+        self.s_index = s_index
+        self.c_index = c_index
+        self.a_index = a_index
+
+    @classmethod
+    def from_state(cls, state: SystemState) -> "EngineState":
+        """Build an engine state from a SystemState; the source is not referenced afterwards (Створити стан рушія із SystemState; джерело далі не використовується)."""
+        return cls(
+            layout=StateLayout.from_state(state),
+            values=[float(r.value) for r in state.resources],
+            statuses=[c.status for c in state.components],
+            s_index=state.s_index,
+            c_index=state.c_index,
+            a_index=state.a_index,
+        )
+
+    def to_state(self) -> SystemState:
+        """Build a SystemState for the API or persistence boundary (Створити SystemState для межі API або збереження)."""
+        layout = self.layout
+        return SystemState(
+            components=[
+                KeyComponent(id=c_id, name=name, status=status)
+                for c_id, name, status in zip(layout.component_ids, layout.component_names, self.statuses)
+            ],
+            resources=[
+                Resource(id=r_id, name=name, type=r_type, value=value)
+                for r_id, name, r_type, value in zip(layout.resource_ids, layout.resource_names, layout.resource_types, self.values)
+            ],
+            s_index=self.s_index,
+            c_index=self.c_index,
+            a_index=self.a_index,
+        )
+
+    def copy(self) -> "EngineState":
+        """Cheap copy sharing the immutable layout (Дешева копія зі спільною незмінною розкладкою)."""
+        return EngineState(self.layout, self.values[:], self.statuses[:], self.s_index, self.c_index, self.a_index)
+
+    def apply_deltas(self, deltas: Dict[ResourceType, int]) -> None:
+        """Add deltas to resources of each type in place, capped at 100 (Додати дельти до ресурсів кожного типу на місці з обмеженням 100)."""
+        values = self.values
+        for r_type, delta in deltas.items():
+            for index in self.layout.type_indices.get(r_type, ()):
+                value = values[index] + delta
+                values[index] = value if value < 100.0 else 100.0
+
+    def degrade(self, rate: float) -> None:
+        """Subtract the degradation rate from every resource in place, floored at 0 (Відняти швидкість деградації від кожного ресурсу на місці з нижньою межею 0)."""
+        self.values[:] = [max(0.0, value - rate) for value in self.values]
+
+    def type_mean(self, r_type: ResourceType) -> Optional[float]:
+        """Average value of resources of a type, None if there are none (Середнє значення ресурсів типу, None якщо таких немає)."""
+        indices = self.layout.type_indices.get(r_type)
+        if not indices:
+            return None
+        values = self.values
+        # Plain left-to-right addition, as in _type_mean_series; built-in sum() compensates rounding since Python 3.12
+        # (Звичайне додавання зліва направо, як у _type_mean_series; вбудований sum() компенсує округлення з Python 3.12)
+        total = 0.0
+        for index in indices:
+            total += values[index]
+        return total / len(indices)
+
+    def culture_value(self) -> float:
+        """Culture level derived from the CULTURE component status (Рівень культури зі статусу компонента культури)."""
+        index = self.layout.culture_index
+        return culture_level(self.statuses[index] if index is not None else None)
+
+    def metrics(
+        self,
+        total_ops: int = 0,
+        alerts_count: int = 0,
+        t_adapt: Optional[float] = None,
+        t_market: float = 30.0
+    ) -> Tuple[float, float, float]:
+        """
+        Calculate S, C, A with the same formulas as analytics.calculate_metrics_from_state (Обчислити S, C, A за тими самими формулами, що й analytics.calculate_metrics_from_state).
+
+        Args:
+            total_ops: Total number of operations (Загальна кількість операцій)
+            alerts_count: Number of alerts/incidents (Кількість алертів/інцидентів)
+            t_adapt: Adaptation time in days, if None uses default (Час адаптації в днях, якщо None - використовує типове значення)
+            t_market: Market change time in days (Час змін на ринку в днях)
+
+        Returns:
+            Tuple of (s_index, c_index, a_index) (Кортеж (s_index, c_index, a_index))
+        """
+        tech_mean = self.type_mean(ResourceType.TECHNOLOGICAL)
+        tech_resource = tech_mean / 100.0 if tech_mean is not None else 0.0
+
+        edu_mean = self.type_mean(ResourceType.EDUCATIONAL)
+        soc_resource = ((edu_mean if edu_mean is not None else 0.0) + self.culture_value()) / 2.0 / 100.0
+
+        oper_mean = self.type_mean(ResourceType.OPERATIONAL)
+        waste = 0.5 if oper_mean is None else max(0.0, min(1.0, 1.0 - oper_mean / 100.0))
+
+        if t_adapt is None:
+            t_adapt = max(1.0, total_ops * 0.1)
+        return (
+            calculate_s_index(tech_resource, soc_resource, waste),
+            calculate_c_index(total_ops, alerts_count),
+            calculate_a_index(t_adapt, t_market),
+        )
+
+
+def _type_mean_series(values: np.ndarray, indices: Optional[Tuple[int, ...]]) -> Optional[np.ndarray]:
+    """Per-row mean of the given columns, summed left to right like EngineState.type_mean (Середнє вказаних стовпців по рядках, підсумоване зліва направо, як у EngineState.type_mean)."""
+    if not indices:
+        return None
+    total = values[:, indices[0]].copy()
+    for index in indices[1:]:
+        total += values[:, index]
+    return total / len(indices)
+
+
+def s_index_series(layout: StateLayout, values: np.ndarray, culture_value: float) -> np.ndarray:
+    """
+    S index for many value rows at once, bit-identical to EngineState.metrics (Індекс S для багатьох рядків значень одразу, побітово ідентичний EngineState.metrics).
+
+    Args:
+        layout: Layout of the value columns (Розкладка стовпців значень)
+        values: Resource values, shape (rows, resources) (Значення ресурсів розміром (рядки, ресурси))
+        culture_value: Culture level in points (Рівень культури в пунктах)
+
+    Returns:
+        S index per row (Індекс S для кожного рядка)
+    """
+    rows = values.shape[0]
+    tech_mean = _type_mean_series(values, layout.type_indices.get(ResourceType.TECHNOLOGICAL))
+    tech_resource = tech_mean / 100.0 if tech_mean is not None else np.zeros(rows)
+
+    edu_mean = _type_mean_series(values, layout.type_indices.get(ResourceType.EDUCATIONAL))
+    soc_resource = ((edu_mean if edu_mean is not None else np.zeros(rows)) + culture_value) / 2.0 / 100.0
+
+    oper_mean = _type_mean_series(values, layout.type_indices.get(ResourceType.OPERATIONAL))
+    waste = np.full(rows, 0.5) if oper_mean is None else np.clip(1.0 - oper_mean / 100.0, 0.0, 1.0)
+
+    return np.clip((tech_resource + soc_resource) / 2.0 * (1.0 - np.clip(waste, 0.0, 1.0)), 0.0, 1.0)
+
+
+def c_index_series(total_ops: np.ndarray, alerts_count: np.ndarray) -> np.ndarray:
+    """C index for cumulative counts, element-wise identical to calculate_c_index (Індекс C для накопичених лічильників, поелементно ідентичний calculate_c_index)."""
+    ratio = np.minimum(1.0, np.maximum(alerts_count, 0) / np.maximum(total_ops, 1))
+    return np.where(total_ops == 0, 1.0, np.clip(1.0 - ratio, 0.0, 1.0))
@@ -0,0 +1,246 @@
+"""
+Ensemble simulation across worker processes (Ансамблева симуляція на кількох робочих процесах).
+Splits replications into chunks, runs each chunk with the batch engine in a ProcessPoolExecutor and merges confidence bands
+(Розбиває реплікації на частини, виконує кожну пакетним рушієм у ProcessPoolExecutor та об'єднує смуги довіри).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.agent_logic import build_rule_index, rule_config
+from app.agent_rules import RuleIndex
+from app.batch_simulation import BatchSimulationResult, run_batch_simulation, percentile_series
+from app.models import (
+    SimulationEnsembleRequest,
+    SimulationEnsembleResponse,
+    SimulationPairedRequest,
+    SimulationPairedResponse,
+    PairedEffect,
+    IndexBands,
+)
+
+
+# Upper bound for the shared process pool (Верхня межа для спільного пулу процесів)
+MAX_WORKERS = max(1, int(os.getenv("ENSEMBLE_MAX_WORKERS", os.cpu_count() or 1)))
+
+# Full coefficient set shipped to workers, which otherwise keep the rules they were started with
+# (Повний набір коефіцієнтів, що передається робочим процесам, які інакше зберігають правила зі старту)
+RuleSnapshot = Tuple[Tuple[str, int], ...]
+
+# Shared pool reused across requests to avoid process start-up per call (Спільний пул, що перевикористовується між запитами, щоб не запускати процеси на кожен виклик)
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Create the shared process pool on first use (Створити спільний пул процесів при першому використанні)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawn behaves the same on Windows and Linux and is safe with server threads (Spawn однаково працює на Windows і Linux та безпечний з потоками сервера)
+            _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def shutdown_ensemble_executor() -> None:
+    """Shut down the shared process pool (Зупинити спільний пул процесів)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def rule_snapshot() -> RuleSnapshot:
+    """Picklable, hashable copy of the active coefficients for worker tasks (Придатна до серіалізації та хешування копія активних коефіцієнтів для завдань робочих процесів)."""
+    return tuple(sorted(rule_config().coefficients.items()))
+
+
+@lru_cache(maxsize=8)
+def snapshot_rule_index(rules: RuleSnapshot) -> RuleIndex:
+    """
+    Rule table compiled from a snapshot, independent of the worker's active config (Таблиця правил, скомпільована зі знімка, незалежна від активної конфігурації робочого процесу).
+
+    Tasks are pinned to exactly the caller's coefficients, whatever version the worker installed meanwhile; tasks of one
+    snapshot share the compiled table and its match cache (Завдання закріплені саме за коефіцієнтами викликача, яку б версію
+    робочий процес не встановив тим часом; завдання одного знімка ділять скомпільовану таблицю та її кеш збігів).
+    """
+    return build_rule_index(dict(rules))
+
+
+def _split_replications(replications: int, chunks: int) -> List[int]:
+    """Split replications into near-equal chunk sizes (Розбити реплікації на майже рівні частини)."""
+    chunks = max(1, min(chunks, replications))
+    base, extra = divmod(replications, chunks)
+    return [base + (1 if i < extra else 0) for i in range(chunks)]
+
+
+def _run_chunk(request: SimulationEnsembleRequest, replications: int, seed: np.random.SeedSequence, rules: RuleSnapshot) -> BatchSimulationResult:
+    """Run one chunk of replications inside a worker process (Виконати одну частину реплікацій у робочому процесі)."""
+    return run_batch_simulation(
+        days=request.days,
+        intensity=request.intensity,
+        t_market=request.t_market,
+        use_agent=request.use_agent,
+        replications=replications,
+        seed=seed,
+        rules=snapshot_rule_index(rules),
+    )
+
+
+def _merge_results(results: List[BatchSimulationResult]) -> BatchSimulationResult:
+    """Concatenate chunk results along the replication axis (Об'єднати результати частин уздовж осі реплікацій)."""
+    return BatchSimulationResult(
+        s_index=np.concatenate([r.s_index for r in results]),
+        c_index=np.concatenate([r.c_index for r in results]),
+        a_index=np.concatenate([r.a_index for r in results]),
+    )
+
+
+def _build_response(request: SimulationEnsembleRequest, result: BatchSimulationResult, workers: int) -> SimulationEnsembleResponse:
+    """Convert merged arrays into the API response (Перетворити об'єднані масиви на відповідь API)."""
+    bands = percentile_series(result)
+    return SimulationEnsembleResponse(
+        replications=result.replications,
+        days=request.days,
+        workers=workers,
+        s_index=IndexBands(**bands["s_index"]),
+        c_index=IndexBands(**bands["c_index"]),
+        a_index=IndexBands(**bands["a_index"]),
+    )
+
+
+async def run_ensemble(request: SimulationEnsembleRequest) -> SimulationEnsembleResponse:
+    """
+    Run an ensemble of replications spread across worker processes (Запустити ансамбль реплікацій, розподілений між робочими процесами).
+
+    Each chunk gets an independent child of one SeedSequence built from request.seed, so chunks never share
+    random streams and a seeded ensemble is reproducible for the same workers count
+    (Кожна частина отримує незалежного нащадка SeedSequence із request.seed, тож частини не ділять випадкові потоки,
+    а ансамбль із зерном відтворюваний за тієї ж кількості процесів).
+
+    Args:
+        request: Simulation parameters with replications and workers (Параметри симуляції з кількістю реплікацій та процесів)
+
+    Returns:
+        SimulationEnsembleResponse with mean and p5/p50/p95 bands per day (SimulationEnsembleResponse із середнім та смугами p5/p50/p95 по днях)
+    """
+    workers = min(request.workers or MAX_WORKERS, MAX_WORKERS)
+    sizes = _split_replications(request.replications, workers)
+    seeds = np.random.SeedSequence(request.seed).spawn(len(sizes))
+    rules = rule_snapshot()
+
+    if len(sizes) == 1:
+        # Single chunk: skip inter-process overhead (Одна частина: обійтися без міжпроцесних витрат)
+        results = [await asyncio.to_thread(_run_chunk, request, sizes[0], seeds[0], rules)]
+    else:
+        executor = get_process_pool()
+        results = await asyncio.gather(*(
+            asyncio.wrap_future(executor.submit(_run_chunk, request, size, seed, rules))
+            for size, seed in zip(sizes, seeds)
+        ))
+
+    return _build_response(request, _merge_results(list(results)), len(sizes))
+
+
+def _run_paired_arm(
+    request: SimulationPairedRequest, use_agent: bool, replications: int, seed: np.random.SeedSequence, rules: RuleSnapshot
+) -> BatchSimulationResult:
+    """Run one arm of a paired chunk inside a worker process (Виконати одну гілку парної частини в робочому процесі)."""
+    return run_batch_simulation(
+        days=request.days,
+        intensity=request.intensity,
+        t_market=request.t_market,
+        use_agent=use_agent,
+        replications=replications,
+        seed=seed,
+        rules=snapshot_rule_index(rules),
+    )
+
+
+def _paired_effect(agent: np.ndarray, control: np.ndarray) -> PairedEffect:
+    """
+    Estimate the agent effect from per-pair day averages (Оцінити ефект агента за середніми по днях для кожної пари).
+
+    The paired standard error uses the spread of the differences, so noise shared by both arms cancels; the unpaired
+    one is what the same runs would give if the arms were independent (Парна стандартна похибка використовує розкид
+    різниць, тож спільний для гілок шум скорочується; непарна - те, що дали б ті самі запуски з незалежними гілками).
+    """
+    agent_means = agent[:, 1:].mean(axis=1)
+    control_means = control[:, 1:].mean(axis=1)
+    differences = agent_means - control_means
+    mean = float(differences.mean())
+    pairs = len(differences)
+    if pairs < 2:
+        return PairedEffect(mean=mean)
+    std_error = float(differences.std(ddof=1) / np.sqrt(pairs))
+    unpaired = float(np.sqrt((agent_means.var(ddof=1) + control_means.var(ddof=1)) / pairs))
+    return PairedEffect(
+        mean=mean,
+        std_error=std_error,
+        ci95_low=mean - 1.96 * std_error,
+        ci95_high=mean + 1.96 * std_error,
+        unpaired_std_error=unpaired,
+    )
+
+
+async def run_paired_ensemble(request: SimulationPairedRequest) -> SimulationPairedResponse:
+    """
+    Run agent and control arms on common random numbers and compare them pair by pair (Запустити гілки агента і контролю на спільних випадкових числах і порівняти їх попарно).
+
+    Both engines draw operations, alerts and event choices regardless of use_agent, so giving both arms of a chunk the same
+    SeedSequence child makes every replication pair see identical noise; the arms of all chunks run concurrently on the
+    shared process pool (Обидва рушії генерують операції, алерти та вибір подій незалежно від use_agent, тож однаковий
+    нащадок SeedSequence для обох гілок частини дає кожній парі реплікацій однаковий шум; гілки всіх частин виконуються
+    паралельно на спільному пулі процесів).
+
+    Args:
+        request: Paired simulation parameters (Параметри парної симуляції)
+
+    Returns:
+        SimulationPairedResponse with agent minus control bands per day and effect estimates (SimulationPairedResponse зі смугами різниці агент мінус контроль по днях та оцінками ефекту)
+    """
+    workers = min(request.workers or MAX_WORKERS, MAX_WORKERS)
+    sizes = _split_replications(request.replications, workers)
+    seeds = np.random.SeedSequence(request.seed).spawn(len(sizes))
+    rules = rule_snapshot()
+    arms = [(use_agent, size, seed, rules) for size, seed in zip(sizes, seeds) for use_agent in (True, False)]
+
+    if len(sizes) == 1:
+        # Single chunk: both arms on threads, skipping inter-process overhead (Одна частина: обидві гілки в потоках, без міжпроцесних витрат)
+        results = await asyncio.gather(*(asyncio.to_thread(_run_paired_arm, request, *arm) for arm in arms))
+    else:
+        executor = get_process_pool()
+        results = await asyncio.gather(*(
+            asyncio.wrap_future(executor.submit(_run_paired_arm, request, *arm))
+            for arm in arms
+        ))
+
+    agent = _merge_results(list(results[0::2]))
+    control = _merge_results(list(results[1::2]))
+    difference = BatchSimulationResult(
+        s_index=agent.s_index - control.s_index,
+        c_index=agent.c_index - control.c_index,
+        a_index=agent.a_index - control.a_index,
+    )
+    bands = percentile_series(difference)
+    effect: Dict[str, PairedEffect] = {
+        name: _paired_effect(getattr(agent, name), getattr(control, name))
+        for name in ("s_index", "c_index", "a_index")
+    }
+    return SimulationPairedResponse(
+        replications=agent.replications,
+        days=request.days,
+        workers=len(sizes),
+        s_index=IndexBands(**bands["s_index"]),
+        c_index=IndexBands(**bands["c_index"]),
+        a_index=IndexBands(**bands["a_index"]),
+        effect=effect,
+    )
@@ -3,6 +3,8 @@ Initial in-memory system state (Початковий стан системи).
 Used for seeding the DB on first run (Використовується для початкового заповнення БД).
 """
 
+import random
+
 from app.models import SystemState, KeyComponent, Resource, ComponentType, ResourceType
 
 
@@ -31,6 +33,31 @@ INITIAL_STATE = SystemState(
 )
 
 
-
-
-
+def generate_synthetic_state(resources: int, seed: int = 0) -> SystemState:
+    """
+    Build a large synthetic organization model for scaling tests and benchmarks (Створити велику синтетичну модель організації для тестів масштабування та бенчмарків).
+
+    Resources are spread round-robin over all resource types with values drawn uniformly from 30-90; components are the
+    same as in INITIAL_STATE (Ресурси рівномірно розподіляються по всіх типах зі значеннями 30-90; компоненти ті самі, що й в INITIAL_STATE).
+
+    Args:
+        resources: Number of resources (Кількість ресурсів)
+        seed: Seed for the resource values (Зерно для значень ресурсів)
+
+    Returns:
+        SystemState with the requested number of resources (SystemState із заданою кількістю ресурсів)
+    """
+    rng = random.Random(seed)
+    types = list(ResourceType)
+    return SystemState(
+        components=[component.model_copy() for component in INITIAL_STATE.components],
+        resources=[
+            Resource(
+                id=f"res-{index:05d}",
+                name=f"{types[index % len(types)].value} unit {index // len(types) + 1}",
+                type=types[index % len(types)],
+                value=round(rng.uniform(30.0, 90.0), 1),
+            )
+            for index in range(resources)
+        ],
+    )
@@ -0,0 +1,301 @@
+"""
+Simulation job queue with a fixed worker pool (Черга завдань симуляції з фіксованим пулом виконавців).
+Jobs are submitted without waiting, run on a bounded thread pool, report progress per simulated day and stop
+cooperatively between days when cancelled (Завдання подаються без очікування, виконуються в обмеженому пулі потоків,
+звітують про прогрес по днях і зупиняються між днями при скасуванні).
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional, Union
+
+from app.models import SimulationJobInfo, SimulationJobStatus, SimulationMetrics, SimulationRunRequest, SimulationExtendRequest, SimulationDayRecord
+from app.repository import get_simulation_run
+from app.scenario import schedule_for_request
+from app.simulation import extend_simulation, iter_simulation, new_simulation_seed, set_simulation_history
+from app.simulation_events import SimulationEventChannel
+
+
+# Simulations running at the same time (Симуляції, що виконуються одночасно)
+JOB_WORKERS = max(1, int(os.getenv("SIMULATION_JOB_WORKERS", "2")))
+# Jobs allowed to wait for a worker before submissions are rejected (Завдання, що можуть чекати на виконавця, доки подання не відхиляються)
+JOB_QUEUE_LIMIT = max(0, int(os.getenv("SIMULATION_JOB_QUEUE_LIMIT", "8")))
+# Finished jobs kept for status and result queries (Завершені завдання, що зберігаються для запитів статусу та результату)
+JOB_HISTORY_LIMIT = max(1, int(os.getenv("SIMULATION_JOB_HISTORY_LIMIT", "100")))
+
+FINISHED_STATUSES = (SimulationJobStatus.COMPLETED, SimulationJobStatus.FAILED, SimulationJobStatus.CANCELLED)
+
+RecordCallback = Callable[[SimulationDayRecord], None]
+# A new run, or more days of a stored one (Новий запуск або додаткові дні збереженого)
+JobRequest = Union[SimulationRunRequest, SimulationExtendRequest]
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when the job queue has no free slot (Виникає, коли в черзі завдань немає вільного місця)."""
+
+
+@dataclass
+class SimulationJob:
+    """One submitted simulation and its progress (Одна подана симуляція та її прогрес)."""
+    job_id: str
+    request: JobRequest
+    simulation_run_id: str
+    seed: int
+    events: Optional[SimulationEventChannel] = None
+    on_record: Optional[RecordCallback] = None
+    include_state_delta: bool = False
+    # False for streamed runs, so memory does not grow with days (False для потокових запусків, щоб пам'ять не зростала з кількістю днів)
+    keep_result: bool = True
+    status: SimulationJobStatus = SimulationJobStatus.QUEUED
+    days_done: int = 0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: List[SimulationMetrics] = field(default_factory=list)
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    future: Optional[Future] = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a final state (Чи досягло завдання фінального стану)."""
+        return self.status in FINISHED_STATUSES
+
+    def info(self) -> SimulationJobInfo:
+        """Public status snapshot (Публічний знімок статусу)."""
+        return SimulationJobInfo(
+            job_id=self.job_id,
+            status=self.status,
+            days=self.request.days,
+            days_done=self.days_done,
+            simulation_run_id=self.simulation_run_id,
+            seed=self.seed,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            error=self.error,
+        )
+
+
+class SimulationJobManager:
+    """
+    Bounded executor for simulation jobs (Обмежений виконавець завдань симуляції).
+
+    At most `workers` jobs run at once and at most `queue_limit` more may wait; further submissions raise JobQueueFullError
+    (Одночасно виконується не більше `workers` завдань і ще не більше `queue_limit` можуть чекати; подальші подання
+    викликають JobQueueFullError).
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_limit: int = JOB_QUEUE_LIMIT, history_limit: int = JOB_HISTORY_LIMIT) -> None:
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.history_limit = history_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, SimulationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        request: SimulationRunRequest,
+        events: Optional[SimulationEventChannel] = None,
+        on_record: Optional[RecordCallback] = None,
+        include_state_delta: bool = False,
+        keep_result: bool = True
+    ) -> SimulationJob:
+        """
+        Queue a simulation without waiting for it (Поставити симуляцію в чергу без очікування).
+
+        Args:
+            request: Simulation parameters (Параметри симуляції)
+            events: Channel for structured events of the run (Канал для структурованих подій запуску)
+            on_record: Called from the worker with every day record (Викликається з виконавця для кожного запису дня)
+            include_state_delta: Add per-resource changes to each record (Додати зміни ресурсів до кожного запису)
+            keep_result: Collect the metrics and publish the run as the latest one; streamed runs pass False (Збирати метрики та публікувати запуск як останній; потокові запуски передають False)
+
+        Returns:
+            The queued job (Поставлене в чергу завдання)
+
+        Raises:
+            JobQueueFullError: If all workers are busy and the queue is full (Якщо всі виконавці зайняті, а черга заповнена)
+        """
+        seed = request.seed if request.seed is not None else new_simulation_seed()
+        job = SimulationJob(
+            job_id=str(uuid.uuid4()),
+            request=request,
+            simulation_run_id=str(uuid.uuid4()),
+            seed=seed,
+            events=events,
+            on_record=on_record,
+            include_state_delta=include_state_delta,
+            keep_result=keep_result,
+        )
+        return self._enqueue(job)
+
+    def submit_extend(self, simulation_run_id: str, request: SimulationExtendRequest) -> SimulationJob:
+        """
+        Queue more days of a stored run without waiting for them (Поставити в чергу додаткові дні збереженого запуску без очікування).
+
+        The extension shares the worker pool and queue limit with new runs; it can only be cancelled before it starts
+        (Продовження ділить пул виконавців і ліміт черги з новими запусками; його можна скасувати лише до початку).
+
+        Args:
+            simulation_run_id: Run to continue (Запуск для продовження)
+            request: Number of additional days and their options (Кількість додаткових днів та їхні параметри)
+
+        Returns:
+            The queued job (Поставлене в чергу завдання)
+
+        Raises:
+            LookupError: If the run does not exist (Якщо запуску не існує)
+            JobQueueFullError: If all workers are busy and the queue is full (Якщо всі виконавці зайняті, а черга заповнена)
+        """
+        run = get_simulation_run(simulation_run_id)
+        if run is None:
+            raise LookupError(f"Simulation run {simulation_run_id} not found")
+        job = SimulationJob(
+            job_id=str(uuid.uuid4()),
+            request=request,
+            simulation_run_id=simulation_run_id,
+            seed=run.seed,
+        )
+        return self._enqueue(job)
+
+    def _enqueue(self, job: SimulationJob) -> SimulationJob:
+        """Hand a job to the workers if the queue has room (Передати завдання виконавцям, якщо в черзі є місце)."""
+        with self._lock:
+            active = sum(1 for j in self._jobs.values() if not j.finished)
+            if active >= self.workers + self.queue_limit:
+                raise JobQueueFullError(f"Simulation queue is full ({active} active jobs)")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="simulation-job")
+            self._jobs[job.job_id] = job
+            self._prune()
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: SimulationJob) -> List[SimulationMetrics]:
+        """Execute a job on a worker thread, checking for cancellation between days (Виконати завдання в потоці виконавця, перевіряючи скасування між днями)."""
+        if job.cancel_event.is_set():
+            self._finish(job, SimulationJobStatus.CANCELLED)
+            return job.result
+        job.status = SimulationJobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        request = job.request
+        if isinstance(request, SimulationExtendRequest):
+            return self._run_extend(job, request)
+        records = iter_simulation(
+            days=request.days,
+            intensity=request.intensity,
+            t_market=request.t_market,
+            use_agent=request.use_agent,
+            in_memory=request.in_memory,
+            seed=job.seed,
+            simulation_run_id=job.simulation_run_id,
+            events=job.events,
+            include_state_delta=job.include_state_delta,
+            schedule=schedule_for_request(request, job.seed),
+            ticks_per_day=request.ticks_per_day,
+            collect_timings=request.collect_timings
+        )
+        try:
+            for record in records:
+                if job.keep_result:
+                    job.result.append(record.to_metrics())
+                job.days_done = record.day
+                if job.on_record is not None:
+                    job.on_record(record)
+                if job.cancel_event.is_set():
+                    break
+        except Exception as exc:
+            job.error = str(exc)
+            self._finish(job, SimulationJobStatus.FAILED)
+            raise
+        finally:
+            # Stops the generator, which saves produced days and restores the live state (Зупиняє генератор, що зберігає отримані дні та відновлює живий стан)
+            records.close()
+
+        if job.cancel_event.is_set() and job.days_done < request.days:
+            self._finish(job, SimulationJobStatus.CANCELLED)
+        else:
+            if job.keep_result:
+                # Make the finished run the latest one for history endpoints (Зробити завершений запуск останнім для ендпоінтів історії)
+                set_simulation_history(job.simulation_run_id, job.result)
+            self._finish(job, SimulationJobStatus.COMPLETED)
+        return job.result
+
+    def _run_extend(self, job: SimulationJob, request: SimulationExtendRequest) -> List[SimulationMetrics]:
+        """Execute an extension job on a worker thread (Виконати завдання продовження в потоці виконавця)."""
+        try:
+            job.result = extend_simulation(
+                job.simulation_run_id,
+                days=request.days,
+                in_memory=request.in_memory,
+                events=job.events,
+                ticks_per_day=request.ticks_per_day
+            )
+        except Exception as exc:
+            job.error = str(exc)
+            self._finish(job, SimulationJobStatus.FAILED)
+            raise
+        job.days_done = request.days
+        self._finish(job, SimulationJobStatus.COMPLETED)
+        return job.result
+
+    def _finish(self, job: SimulationJob, status: SimulationJobStatus) -> None:
+        """Move a job to a final state (Перевести завдання у фінальний стан)."""
+        job.finished_at = datetime.utcnow()
+        job.status = status
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the history limit; caller holds the lock (Забути найстаріші завершені завдання понад ліміт; викликач тримає блокування)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history_limit)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        """Find a job by ID (Знайти завдання за ID)."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[SimulationJob]:
+        """All known jobs, newest first (Усі відомі завдання, новіші першими)."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id: str) -> Optional[SimulationJob]:
+        """
+        Request cancellation; a running job stops after the current day (Запросити скасування; виконуване завдання зупиняється після поточного дня).
+
+        Args:
+            job_id: Job ID (ID завдання)
+
+        Returns:
+            The job, or None if it is unknown (Завдання або None, якщо воно невідоме)
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # Never started (Так і не розпочалося)
+            self._finish(job, SimulationJobStatus.CANCELLED)
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel all jobs and stop the workers (Скасувати всі завдання та зупинити виконавців)."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            executor, self._executor = self._executor, None
+        for job in jobs:
+            job.cancel_event.set()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide job manager (Менеджер завдань на процес)
+simulation_jobs = SimulationJobManager()
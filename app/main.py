@@ -3,33 +3,40 @@ FastAPI backend for dt4research cybernetic control system (Бекенд FastAPI
 Implements the control loop: Manager Goal → Agent Analysis → State Update → Feedback (Реалізує цикл: Ціль менеджера → Аналіз агента → Оновлення стану → Зворотний зв'язок).
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi import Request, Form
+from fastapi import Request, Form, Query
 from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
 import queue
-import threading
 import logging
 import os
 import json
 import re  # For URL masking (Для маскування URL)
+import threading
 import uvicorn
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from app.models import SystemState, KeyComponent, Resource, MechanismInput, ComponentType, ResourceType, MechanismResponse, SimulationMetrics, SimulationRunRequest
-from app.agent_logic import run_mock_analysis
+from app.models import SystemState, KeyComponent, Resource, MechanismInput, ComponentType, ResourceType, MechanismResponse, MechanismBatchInput, MechanismBatchItem, MechanismBatchResponse, AgentRuleConfigUpdate, AgentRuleConfigInfo, SimulationMetrics, SimulationRunRequest, SimulationEnsembleRequest, SimulationEnsembleResponse, SimulationPairedRequest, SimulationPairedResponse, SimulationSweepRequest, SimulationExtendRequest, SimulationJobInfo, SimulationJobStatus
+from app.agent_logic import run_mock_analysis, analyze_goal, apply_resource_deltas, rule_index, rule_config, RuleConfig
 from app.db import create_db_and_tables
-from app.repository import read_system_state, write_system_state, seed_initial_state, add_agent_run, clear_state_and_runs
+from app.repository import read_system_state, write_system_state, seed_initial_state, add_agent_run, apply_agent_runs, clear_state_and_runs
 from app.initial_state import INITIAL_STATE
 from app.presentations_store import read_presentations, write_presentations
-from app.simulation import run_simulation, get_simulation_history, get_simulation_summary, get_agent_logs_history
+from app.simulation import get_simulation_history, get_simulation_summary, get_agent_logs_history, get_simulation_timings, set_simulation_history
+from app.result_cache import CachedSimulationResult, simulation_cache_key, simulation_result_cache
+from app.ensemble import run_ensemble, run_paired_ensemble, shutdown_ensemble_executor
+from app.jobs import simulation_jobs, JobQueueFullError, SimulationJob
+from app.run_registry import run_registry
+from app.rule_config import UnknownCoefficientError, publish_rule_coefficients, reset_rule_coefficients, rule_config_watcher
+from app.sweep import iter_sweep
+from app.simulation_events import SimulationEventChannel, SimulationEventType, text_log_sink
 from app.analytics import calculate_metrics_from_state
-from app.repository import get_simulation_metrics_by_run_id, get_latest_simulation_run_id, get_all_simulation_metrics
+from app.repository import get_simulation_metrics_by_run_id, get_latest_simulation_run_id, get_all_simulation_metrics, get_simulation_run, list_sweep_cells
 from fastapi.responses import Response
 import csv
 import io
@@ -123,12 +130,65 @@ if _local_prez_path.exists():
 # Initial state used for seeding the database (Початковий стан для заповнення БД)
 _initial_state = INITIAL_STATE
 
+# Day records buffered for a slow NDJSON reader before the job waits (Записи днів, що буферизуються для повільного читача NDJSON, перш ніж завдання чекає)
+NDJSON_BUFFER_DAYS = max(1, int(os.getenv("SIMULATION_NDJSON_BUFFER_DAYS", "64")))
+
 
 @app.on_event("startup")
 def _startup_seed() -> None:
     """Create tables and seed initial data if needed (Створити таблиці та початкові дані)."""
     create_db_and_tables()
     seed_initial_state(_initial_state)
+    rule_config_watcher.start()
+
+
+@app.on_event("shutdown")
+def _shutdown_workers() -> None:
+    """Stop ensemble worker processes and simulation jobs (Зупинити робочі процеси ансамблю та завдання симуляції)."""
+    shutdown_ensemble_executor()
+    simulation_jobs.shutdown()
+    rule_config_watcher.stop()
+
+
+def _submit_simulation_job(request: SimulationRunRequest, **kwargs) -> SimulationJob:
+    """Submit a job, mapping a full queue to 429 (Подати завдання, перетворюючи заповнену чергу на 429)."""
+    try:
+        return simulation_jobs.submit(request, **kwargs)
+    except JobQueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "5"})
+
+
+async def _await_simulation_job(job: SimulationJob) -> List[SimulationMetrics]:
+    """
+    Wait for a job and return its metrics only if it completed (Дочекатися завдання та повернути його метрики, лише якщо воно завершилося успішно).
+
+    Raises:
+        HTTPException: 409 if the job was cancelled, 500 if it failed (409, якщо завдання скасовано, 500, якщо воно завершилося помилкою)
+        LookupError: Passed through for the caller to map to 404 (Передається далі, щоб викликач перетворив на 404)
+    """
+    try:
+        result = await asyncio.wrap_future(job.future)
+    except asyncio.CancelledError:
+        if not job.future.cancelled():
+            # The request itself was cancelled, so stop the job too (Скасовано сам запит, тож зупинити й завдання)
+            simulation_jobs.cancel(job.job_id)
+            raise
+        result = None
+    except LookupError:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Simulation job failed: {exc} (Завдання симуляції завершилося помилкою)")
+    if result is None or job.status != SimulationJobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail="Simulation job was cancelled (Завдання симуляції скасовано)")
+    return result
+
+
+def _get_simulation_job(job_id: str) -> SimulationJob:
+    """Find a job or raise 404 (Знайти завдання або повернути 404)."""
+    job = simulation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Simulation job not found (Завдання симуляції не знайдено)")
+    return job
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -249,6 +309,13 @@ async def health_rabbit():
         return {"ok": False, "status": "failed", "error": error_msg, "url": masked_url}
 
 
+def _explain_deltas(deltas: Dict[str, int]) -> str:
+    """Build explanation string from applied deltas (Сформувати текст пояснення із застосованих дельт)."""
+    if deltas:
+        return "; ".join(f"{resource} +{delta}" for resource, delta in deltas.items())
+    return "Без змін"
+
+
 @app.post("/api/v1/apply-mechanism")
 async def apply_mechanism(input_data: MechanismInput) -> MechanismResponse:
     """
@@ -265,12 +332,7 @@ async def apply_mechanism(input_data: MechanismInput) -> MechanismResponse:
     # Step 3: Persist new state and the run history
     write_system_state(new_state)
 
-    # Build explanation string (Сформувати текст пояснення)
-    if deltas:
-        parts = [f"{resource} +{delta}" for resource, delta in deltas.items()]
-        explanation = "; ".join(parts)
-    else:
-        explanation = "Без змін"
+    explanation = _explain_deltas(deltas)
 
     # Store agent run (Зберегти запуск агента)
     try:
@@ -281,6 +343,28 @@ async def apply_mechanism(input_data: MechanismInput) -> MechanismResponse:
     return MechanismResponse(newState=new_state, explanation=explanation, explanation_details=deltas)
 
 
+@app.post("/api/v1/apply-mechanism/batch")
+async def apply_mechanism_batch(input_data: MechanismBatchInput) -> MechanismBatchResponse:
+    """
+    Apply an ordered list of goals to the system state in one transaction (Застосувати упорядкований список цілей до стану системи в одній транзакції).
+    The state is read once, every goal is applied in memory on top of the previous one, then the final state and all agent
+    runs are written together (Стан читається один раз, кожна ціль застосовується в пам'яті поверх попередньої, потім
+    кінцевий стан і всі запуски агента записуються разом).
+    """
+    state = read_system_state()
+    results: List[MechanismBatchItem] = []
+    runs: List[Tuple[str, Dict[str, int], str]] = []
+    for goal in input_data.target_goals:
+        deltas_by_type, _ = analyze_goal(goal, capture_logs=True)
+        apply_resource_deltas(state, deltas_by_type)
+        deltas = {r_type.value: delta for r_type, delta in deltas_by_type.items()}
+        runs.append((goal, deltas, state.model_dump_json()))
+        results.append(MechanismBatchItem(goal=goal, explanation=_explain_deltas(deltas), explanation_details=deltas))
+
+    apply_agent_runs(state, runs)
+    return MechanismBatchResponse(newState=state, results=results)
+
+
 @app.get("/api/v1/agent-runs")
 async def get_agent_runs(limit: int = 20, offset: int = 0):
     """Return paginated agent run history (Повернути історію запусків із пагінацією)."""
@@ -299,11 +383,55 @@ async def get_agent_runs(limit: int = 20, offset: int = 0):
     return {"total": total, "items": items, "limit": limit, "offset": offset}
 
 
+@app.get("/api/v1/agent/cache/stats")
+async def get_agent_cache_stats():
+    """
+    Get goal classification cache counters (Отримати лічильники кешу класифікації цілей).
+
+    Returns:
+        Active rule table version, hits, misses, hit ratio and cache size (Версія активної таблиці правил, влучання, промахи, частка влучань і розмір кешу)
+    """
+    return rule_index().cache_stats()
+
+
+def _rule_config_info(config: RuleConfig) -> AgentRuleConfigInfo:
+    """Describe a rule config for the API (Описати конфігурацію правил для API)."""
+    return AgentRuleConfigInfo(version=config.version, rule_table_version=config.index.version, coefficients=config.coefficients, overrides=config.overrides)
+
+
+@app.get("/api/v1/agent/rules", response_model=AgentRuleConfigInfo)
+async def get_agent_rules():
+    """Get the rule config active in this process (Отримати конфігурацію правил, активну в цьому процесі)."""
+    return _rule_config_info(rule_config())
+
+
+@app.post("/api/v1/agent/rules", response_model=AgentRuleConfigInfo)
+async def publish_agent_rules(update: AgentRuleConfigUpdate):
+    """
+    Publish coefficient changes as a new rule config version (Опублікувати зміни коефіцієнтів як нову версію конфігурації правил).
+    This process switches immediately, other processes within the watcher poll interval (Цей процес перемикається одразу, інші - протягом інтервалу опитування).
+    """
+    try:
+        config = publish_rule_coefficients(update.coefficients)
+    except UnknownCoefficientError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return _rule_config_info(config)
+
+
+@app.delete("/api/v1/agent/rules", response_model=AgentRuleConfigInfo)
+async def reset_agent_rules():
+    """
+    Publish an empty override set, returning every process to its RULE_* environment (Опублікувати порожній набір перевизначень, повертаючи кожен процес до його оточення RULE_*).
+    """
+    return _rule_config_info(reset_rule_coefficients())
+
+
 @app.post("/api/v1/system-reset")
 async def system_reset() -> SystemState:
     """Reset simulation to initial state (Скинути симуляцію до початкового стану)."""
     # Clear all tables (Очистити всі таблиці)
     clear_state_and_runs()
+    simulation_result_cache.clear()
     # Seed initial state (Заповнити початковим станом)
     seed_initial_state(_initial_state)
     # Return initial state (Повернути початковий стан)
@@ -311,32 +439,226 @@ async def system_reset() -> SystemState:
 
 
 @app.post("/api/v1/simulation/run", response_model=List[SimulationMetrics])
-async def run_simulation_endpoint(request: SimulationRunRequest) -> List[SimulationMetrics]:
+async def run_simulation_endpoint(request: SimulationRunRequest, response: Response) -> List[SimulationMetrics]:
     """
     Run automated simulation and return time series of metrics (Запустити автоматичну симуляцію та повернути часовий ряд метрик).
     
+    The run ID and seed are returned in X-Simulation-Run-Id and X-Simulation-Seed headers (ID запуску та зерно повертаються в заголовках X-Simulation-Run-Id та X-Simulation-Seed).
+    Requests with an explicit seed are served from the result cache when possible; X-Simulation-Cache tells hit or miss and
+    a hit returns the run ID of the run that produced the result (Запити з явним зерном по можливості обслуговуються з кешу
+    результатів; X-Simulation-Cache вказує hit або miss, а влучання повертає ID запуску, що створив результат).
+    
     Args:
         request: Simulation parameters (Параметри симуляції)
     
     Returns:
         List of SimulationMetrics for each simulation step (Список SimulationMetrics для кожного кроку)
     """
-    metrics_history = run_simulation(
-        days=request.days,
-        intensity=request.intensity,
-        t_market=request.t_market,
-        use_agent=request.use_agent
-    )
+    cache_key = simulation_cache_key(request, request.seed) if request.seed is not None else None
+    # A timed request has to run to be measured (Запит із вимірюванням часу має виконатися, щоб його виміряти)
+    if cache_key is not None and not request.collect_timings:
+        cached = simulation_result_cache.get(cache_key)
+        if cached is not None:
+            set_simulation_history(cached.simulation_run_id, cached.metrics, cached.agent_logs)
+            return Response(content=cached.payload, media_type="application/json", headers={
+                "X-Simulation-Run-Id": cached.simulation_run_id,
+                "X-Simulation-Seed": str(cached.seed),
+                "X-Simulation-Cache": "hit",
+            })
+
+    # Run on the bounded job pool without blocking the event loop (Виконати в обмеженому пулі завдань, не блокуючи цикл подій)
+    job = _submit_simulation_job(request)
+    metrics_history = await _await_simulation_job(job)
+    simulation_run_id, seed = job.simulation_run_id, job.seed
+    response.headers["X-Simulation-Run-Id"] = simulation_run_id
+    response.headers["X-Simulation-Seed"] = str(seed)
+    if cache_key is not None:
+        simulation_result_cache.put(cache_key, CachedSimulationResult.build(simulation_run_id, seed, metrics_history, get_agent_logs_history(simulation_run_id)))
+        response.headers["X-Simulation-Cache"] = "miss"
     return metrics_history
 
 
+@app.post("/api/v1/simulation/jobs", response_model=SimulationJobInfo, status_code=202)
+async def submit_simulation_job(request: SimulationRunRequest) -> SimulationJobInfo:
+    """
+    Submit a simulation job and return at once (Подати завдання симуляції та одразу повернутися).
+    
+    Args:
+        request: Simulation parameters (Параметри симуляції)
+    
+    Returns:
+        Job status with the job ID to poll (Статус завдання з ID для опитування)
+    """
+    return _submit_simulation_job(request).info()
+
+
+@app.get("/api/v1/simulation/jobs", response_model=List[SimulationJobInfo])
+async def list_simulation_jobs() -> List[SimulationJobInfo]:
+    """List active and recently finished simulation jobs, newest first (Список активних і нещодавно завершених завдань, новіші першими)."""
+    return [job.info() for job in simulation_jobs.list_jobs()]
+
+
+@app.get("/api/v1/simulation/jobs/{job_id}", response_model=SimulationJobInfo)
+async def get_simulation_job(job_id: str) -> SimulationJobInfo:
+    """Get status and progress of a simulation job (Отримати статус і прогрес завдання симуляції)."""
+    return _get_simulation_job(job_id).info()
+
+
+@app.get("/api/v1/simulation/jobs/{job_id}/result", response_model=List[SimulationMetrics])
+async def get_simulation_job_result(job_id: str) -> List[SimulationMetrics]:
+    """
+    Get metrics of a completed simulation job (Отримати метрики завершеного завдання симуляції).
+    
+    Returns 409 while the job is queued or running and for failed or cancelled jobs (Повертає 409, поки завдання в черзі
+    чи виконується, а також для невдалих чи скасованих завдань).
+    """
+    job = _get_simulation_job(job_id)
+    if job.status != SimulationJobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Simulation job is {job.status.value} (Завдання симуляції має статус {job.status.value})")
+    return job.result
+
+
+@app.post("/api/v1/simulation/jobs/{job_id}/cancel", response_model=SimulationJobInfo)
+async def cancel_simulation_job(job_id: str) -> SimulationJobInfo:
+    """Cancel a simulation job; a running job stops after the current day (Скасувати завдання; виконуване зупиняється після поточного дня)."""
+    _get_simulation_job(job_id)
+    return simulation_jobs.cancel(job_id).info()
+
+
+@app.get("/api/v1/simulation/cache/stats")
+async def get_simulation_cache_stats():
+    """
+    Get result cache counters and sizes (Отримати лічильники та розміри кешу результатів).
+    
+    Returns:
+        Hits per tier, misses, evictions and tier sizes (Влучання по рівнях, промахи, витіснення та розміри рівнів)
+    """
+    return simulation_result_cache.stats()
+
+
+@app.get("/api/v1/simulation/runs/{run_id}")
+async def get_simulation_run_endpoint(run_id: str):
+    """
+    Get stored parameters and seed of a simulation run (Отримати збережені параметри та зерно запуску симуляції).
+    
+    Args:
+        run_id: Simulation run ID (ID запуску симуляції)
+    
+    Returns:
+        Run parameters including the seed needed to replay it (Параметри запуску, включно із зерном для відтворення)
+    """
+    run = get_simulation_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Simulation run not found (Запуск симуляції не знайдено)")
+    return run
+
+
+@app.post("/api/v1/simulation/runs/{run_id}/extend", response_model=List[SimulationMetrics])
+async def extend_simulation_endpoint(run_id: str, request: SimulationExtendRequest) -> List[SimulationMetrics]:
+    """
+    Continue a stored simulation run for more days from its latest checkpoint (Продовжити збережений запуск симуляції ще на кілька днів з останньої контрольної точки).
+    
+    Args:
+        run_id: Simulation run ID (ID запуску симуляції)
+        request: Number of additional days (Кількість додаткових днів)
+    
+    Returns:
+        Metrics of the appended days (Метрики доданих днів)
+    """
+    try:
+        job = simulation_jobs.submit_extend(run_id, request)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Simulation run not found (Запуск симуляції не знайдено)")
+    except JobQueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "5"})
+    try:
+        return await _await_simulation_job(job)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Simulation run checkpoint not found (Контрольну точку запуску не знайдено)")
+
+
+@app.post("/api/v1/simulation/ensemble", response_model=SimulationEnsembleResponse)
+async def run_simulation_ensemble_endpoint(request: SimulationEnsembleRequest) -> SimulationEnsembleResponse:
+    """
+    Run many replications across worker processes and return confidence bands (Запустити багато реплікацій на робочих процесах і повернути смуги довіри).
+    
+    Args:
+        request: Simulation parameters with replications and workers (Параметри симуляції з кількістю реплікацій та процесів)
+    
+    Returns:
+        Mean and p5/p50/p95 bands per day for S, C, A (Середнє та смуги p5/p50/p95 по днях для S, C, A)
+    """
+    return await run_ensemble(request)
+
+
+@app.post("/api/v1/simulation/paired", response_model=SimulationPairedResponse)
+async def run_simulation_paired_endpoint(request: SimulationPairedRequest) -> SimulationPairedResponse:
+    """
+    Run agent and control arms on the same random draws and return their differences (Запустити гілки агента і контролю на однакових випадкових вибірках і повернути їхні різниці).
+    
+    Args:
+        request: Paired simulation parameters (Параметри парної симуляції)
+    
+    Returns:
+        Per-day agent minus control bands and effect estimates for S, C, A (Щоденні смуги різниці агент мінус контроль та оцінки ефекту для S, C, A)
+    """
+    return await run_paired_ensemble(request)
+
+
+@app.post("/api/v1/simulation/sweep")
+async def run_simulation_sweep_endpoint(request: SimulationSweepRequest):
+    """
+    Run a parameter sweep and stream per-cell results via Server-Sent Events (Виконати перебір параметрів і потоково передавати результати клітинок через SSE).
+    
+    Args:
+        request: Parameter grid, replications, seed and worker limit (Сітка параметрів, реплікації, зерно та ліміт процесів)
+    
+    Returns:
+        StreamingResponse with "cell" events and a final "complete" event (StreamingResponse з подіями "cell" та фінальною подією "complete")
+    """
+    async def generate():
+        """Generate SSE events (Генерувати SSE події)."""
+        async for event in iter_sweep(request):
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@app.get("/api/v1/simulation/sweep/results")
+async def get_simulation_sweep_results(limit: int = 1000, offset: int = 0):
+    """
+    Return the compact table of computed sweep cells (Повернути компактну таблицю обчислених клітинок перебору).
+    
+    Returns:
+        List of cell rows, newest first (Список рядків клітинок, новіші першими)
+    """
+    return {"items": list_sweep_cells(limit=limit, offset=offset), "limit": limit, "offset": offset}
+
+
 @app.post("/api/v1/simulation/run-stream")
-async def run_simulation_stream_endpoint(request: SimulationRunRequest):
+async def run_simulation_stream_endpoint(
+    request: SimulationRunRequest,
+    events: Optional[List[SimulationEventType]] = Query(default=None)
+):
     """
     Run simulation with real-time log streaming via Server-Sent Events (Запустити симуляцію з потоковою передачею логів через Server-Sent Events).
     
+    Emits "log" events with text lines, a "day" event with the record of every simulated day and a final "complete" event;
+    "day" events are sent only when the filter is omitted or includes "day" (Надсилає події "log" з рядками тексту, подію "day"
+    із записом кожного симульованого дня та фінальну подію "complete"; події "day" надсилаються, лише якщо фільтр не вказано
+    або він містить "day").
+    
     Args:
         request: Simulation parameters (Параметри симуляції)
+        events: Event types to stream, all if omitted (Типи подій для передачі, усі якщо не вказано)
     
     Returns:
         StreamingResponse with SSE events (StreamingResponse з SSE подіями)
@@ -348,47 +670,49 @@ async def run_simulation_stream_endpoint(request: SimulationRunRequest):
     
     def log_callback(log_line: str):
         """Callback to send logs to queue (Callback для відправки логів у чергу)."""
-        log_queue.put(log_line)
+        log_queue.put({"type": "log", "message": log_line})
+    
+    # Format only the requested event types (Форматувати лише запитані типи подій)
+    channel = SimulationEventChannel()
+    channel.subscribe(text_log_sink(log_callback), events)
+    stream_days = events is None or SimulationEventType.DAY in events
+    
+    def on_record(record):
+        """Forward a day record to the stream if requested (Передати запис дня в потік, якщо його запитано)."""
+        metrics_result.append(record)
+        if stream_days:
+            log_queue.put({"type": "day", **record.model_dump(mode="json")})
+    
+    def on_done(future):
+        """Signal completion or failure of the job (Сигналізувати про завершення або помилку завдання)."""
+        if not future.cancelled() and future.exception() is not None:
+            log_queue.put({"type": "log", "message": f"ERROR: {str(future.exception())}"})
+        log_queue.put(None)  # Signal completion (Сигнал завершення)
+    
+    # Run on the bounded job pool; a full queue is rejected before streaming starts (Виконати в обмеженому пулі завдань; заповнена черга відхиляється до початку передачі)
+    job = _submit_simulation_job(request, events=channel, on_record=on_record)
+    job.future.add_done_callback(on_done)
     
     async def generate():
         """Generate SSE events (Генерувати SSE події)."""
-        # Start simulation in background thread (Запустити симуляцію у фоновому потоці)
-        def run_sim():
-            try:
-                result = run_simulation(
-                    days=request.days,
-                    intensity=request.intensity,
-                    t_market=request.t_market,
-                    use_agent=request.use_agent,
-                    log_callback=log_callback
-                )
-                metrics_result.extend(result)
-                log_queue.put(None)  # Signal completion (Сигнал завершення)
-            except Exception as e:
-                log_queue.put(f"ERROR: {str(e)}")
-                log_queue.put(None)
-        
-        sim_thread = threading.Thread(target=run_sim)
-        sim_thread.start()
-        
-        # Stream logs as they arrive (Потоково передавати логи, коли вони надходять)
-        while True:
-            try:
-                log_line = log_queue.get(timeout=0.1)
-                if log_line is None:
+        try:
+            # Stream logs as they arrive (Потоково передавати логи, коли вони надходять)
+            while True:
+                try:
+                    payload = log_queue.get_nowait()
+                except queue.Empty:
+                    await asyncio.sleep(0.05)
+                    continue
+                if payload is None:
                     # Simulation completed (Симуляція завершена)
-                    yield f"data: {json.dumps({'type': 'complete', 'metrics_count': len(metrics_result)})}\n\n"
-                    break
-                else:
-                    # Send log line (Відправити рядок логу)
-                    yield f"data: {json.dumps({'type': 'log', 'message': log_line})}\n\n"
-            except queue.Empty:
-                # Check if thread is still alive (Перевірити, чи потік ще живий)
-                if not sim_thread.is_alive():
+                    yield f"data: {json.dumps({'type': 'complete', 'metrics_count': len(metrics_result), 'job_id': job.job_id, 'status': job.status.value})}\n\n"
                     break
-                await asyncio.sleep(0.05)
-        
-        sim_thread.join()
+                # Send log line or day record (Відправити рядок логу або запис дня)
+                yield f"data: {json.dumps(payload)}\n\n"
+        finally:
+            # Client went away: stop the job after the current day (Клієнт від'єднався: зупинити завдання після поточного дня)
+            if not job.finished:
+                simulation_jobs.cancel(job.job_id)
     
     return StreamingResponse(
         generate(),
@@ -396,7 +720,86 @@ async def run_simulation_stream_endpoint(request: SimulationRunRequest):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
+            "X-Accel-Buffering": "no",
+            "X-Simulation-Job-Id": job.job_id,
+            "X-Simulation-Run-Id": job.simulation_run_id,
+            "X-Simulation-Seed": str(job.seed)
+        }
+    )
+
+
+@app.post("/api/v1/simulation/run-ndjson")
+async def run_simulation_ndjson_endpoint(request: SimulationRunRequest, include_state_delta: bool = False):
+    """
+    Run simulation and stream one JSON line per simulated day as it is computed (Запустити симуляцію та передавати по рядку JSON на кожен день одразу після обчислення).
+    
+    The first record is sent before later days are simulated and memory does not grow with days; the in-memory history
+    of the last run is not updated, use the stored metrics of the run instead (Перший запис надсилається до симуляції
+    наступних днів, а пам'ять не зростає з кількістю днів; історія останнього запуску в пам'яті не оновлюється,
+    використовуйте збережені метрики запуску).
+    
+    The run is a job on the bounded pool: a full queue is rejected with 429 and a disconnected client cancels the job
+    after the current day (Запуск є завданням в обмеженому пулі: заповнена черга відхиляється з 429, а від'єднання
+    клієнта скасовує завдання після поточного дня).
+    
+    Args:
+        request: Simulation parameters (Параметри симуляції)
+        include_state_delta: Add per-resource changes to each record (Додати зміни ресурсів до кожного запису)
+    
+    Returns:
+        StreamingResponse with application/x-ndjson records (StreamingResponse із записами application/x-ndjson)
+    """
+    # Bounded, so a slow reader holds the job back instead of buffering days (Обмежена, тож повільний читач стримує завдання замість буферизації днів)
+    line_queue = queue.Queue(maxsize=NDJSON_BUFFER_DAYS)
+    closed = threading.Event()
+    
+    def on_record(record):
+        """Hand a day record to the stream, waiting while the buffer is full (Передати запис дня в потік, чекаючи, поки буфер заповнений)."""
+        line = record.model_dump_json() + "\n"
+        while not closed.is_set():
+            try:
+                line_queue.put(line, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def on_done(future):
+        """Signal the end of the job (Сигналізувати про завершення завдання)."""
+        while not closed.is_set():
+            try:
+                line_queue.put(None, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    job = _submit_simulation_job(request, on_record=on_record, include_state_delta=include_state_delta, keep_result=False)
+    job.future.add_done_callback(on_done)
+    
+    async def generate():
+        """Generate NDJSON lines (Генерувати рядки NDJSON)."""
+        try:
+            while True:
+                try:
+                    line = line_queue.get_nowait()
+                except queue.Empty:
+                    await asyncio.sleep(0.01)
+                    continue
+                if line is None:
+                    break
+                yield line
+        finally:
+            # Client went away: stop the job after the current day (Клієнт від'єднався: зупинити завдання після поточного дня)
+            closed.set()
+            if not job.finished:
+                simulation_jobs.cancel(job.job_id)
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Simulation-Job-Id": job.job_id,
+            "X-Simulation-Run-Id": job.simulation_run_id,
+            "X-Simulation-Seed": str(job.seed)
         }
     )
 
@@ -438,38 +841,77 @@ async def get_current_metrics():
     }
 
 
+def _check_registered_run(run_id: Optional[str]) -> None:
+    """Raise 404 for an explicit run ID that is not in the run registry (Повернути 404 для явного ID запуску, якого немає в реєстрі)."""
+    if run_id is not None and run_registry.get(run_id) is None:
+        raise HTTPException(status_code=404, detail="Simulation run not found in registry (Запуск симуляції не знайдено в реєстрі)")
+
+
 @app.get("/api/v1/simulation/metrics/history", response_model=List[SimulationMetrics])
-async def get_metrics_history():
+async def get_metrics_history(run_id: Optional[str] = None):
     """
     Get simulation metrics history (Отримати історію метрик симуляції).
     
+    Args:
+        run_id: Optional simulation run ID, latest completed run if omitted (Опціональний ID запуску, якщо не вказано - останній завершений)
+    
     Returns:
-        List of SimulationMetrics from last simulation run (Список SimulationMetrics з останнього запуску симуляції)
+        List of SimulationMetrics from the simulation run (Список SimulationMetrics із запуску симуляції)
     """
-    return get_simulation_history()
+    _check_registered_run(run_id)
+    return get_simulation_history(run_id)
 
 
 @app.get("/api/v1/simulation/summary")
-async def get_simulation_summary_endpoint():
+async def get_simulation_summary_endpoint(run_id: Optional[str] = None):
     """
     Get summary statistics from last simulation (Отримати зведену статистику з останньої симуляції).
     
+    Args:
+        run_id: Optional simulation run ID, latest completed run if omitted (Опціональний ID запуску, якщо не вказано - останній завершений)
+    
     Returns:
         Dictionary with before/after comparison (Словник з порівнянням до/після)
     """
-    history = get_simulation_history()
-    return get_simulation_summary(history)
+    _check_registered_run(run_id)
+    history = get_simulation_history(run_id)
+    return get_simulation_summary(history, get_simulation_timings(run_id))
+
+
+@app.get("/api/v1/simulation/timings")
+async def get_simulation_timings_endpoint(run_id: Optional[str] = None):
+    """
+    Get per-phase engine timings of a run (Отримати час фаз рушія для запуску).
+    
+    Timings are collected when SIMULATION_TIMINGS is on and kept by the worker process that ran the simulation
+    (Час збирається, коли SIMULATION_TIMINGS увімкнено, і зберігається робочим процесом, що виконав симуляцію).
+    
+    Args:
+        run_id: Optional simulation run ID, latest completed run if omitted (Опціональний ID запуску, якщо не вказано - останній завершений)
+    
+    Returns:
+        Run ID and mapping phase → count, total and percentiles (ID запуску та мапа фаза → кількість, сума та перцентилі)
+    """
+    _check_registered_run(run_id)
+    timings = get_simulation_timings(run_id)
+    if timings is None:
+        raise HTTPException(status_code=404, detail="No timings recorded for this run (Для цього запуску час не записано)")
+    return {"run_id": run_id or run_registry.latest_run_id, "timings": timings}
 
 
 @app.get("/api/v1/simulation/agent-logs")
-async def get_agent_logs():
+async def get_agent_logs(run_id: Optional[str] = None):
     """
     Get agent logs from last simulation (Отримати логи агента з останньої симуляції).
     
+    Args:
+        run_id: Optional simulation run ID, latest completed run if omitted (Опціональний ID запуску, якщо не вказано - останній завершений)
+    
     Returns:
         List of log messages (Список повідомлень логів)
     """
-    return {"logs": get_agent_logs_history()}
+    _check_registered_run(run_id)
+    return {"logs": get_agent_logs_history(run_id), "run_id": run_id or run_registry.latest_run_id}
 
 
 @app.get("/api/v1/simulation/export/csv")
@@ -486,8 +928,8 @@ async def export_simulation_csv(run_id: Optional[str] = None):
     if run_id:
         metrics = get_simulation_metrics_by_run_id(run_id)
     else:
-        # Get latest run ID (Отримати ID останнього запуску)
-        latest_run_id = get_latest_simulation_run_id()
+        # Get latest run ID, shared by all workers through the run registry (Отримати ID останнього запуску, спільний для всіх процесів через реєстр запусків)
+        latest_run_id = run_registry.latest_run_id or get_latest_simulation_run_id()
         if latest_run_id:
             metrics = get_simulation_metrics_by_run_id(latest_run_id)
         else:
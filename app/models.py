@@ -3,10 +3,11 @@ Pydantic models for dt4research system state (Моделі Pydantic для ст
 Defines the data structure for the cybernetic control cycle (Визначає структуру даних для кібернетичного циклу керування).
 """
 
+import weakref
 from datetime import datetime
 from enum import Enum
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Dict, Optional
+from pydantic import BaseModel, Field, model_validator
 
 
 class ResourceType(str, Enum):
@@ -46,8 +47,37 @@ class KeyComponent(BaseModel):
     status: str
 
 
+class _ResourceIndex:
+    """Lookup tables derived from SystemState.resources (Таблиці пошуку, похідні від SystemState.resources)."""
+
+    __slots__ = ("members", "by_type", "by_id")
+
+    def __init__(self, resources: List[Resource], members: List[int]) -> None:
+        # Identities of the indexed resources; the tables hold them, so the ids cannot be reused while the index lives
+        # (Ідентичності проіндексованих ресурсів; таблиці їх утримують, тож id не можуть бути повторно використані, поки індекс живий)
+        self.members = members
+        self.by_type: Dict[ResourceType, List[Resource]] = {}
+        self.by_id: Dict[str, Resource] = {}
+        for resource in resources:
+            self.by_type.setdefault(resource.type, []).append(resource)
+            self.by_id.setdefault(resource.id, resource)
+
+
+# Indexes by id() of their state, kept outside the model so they take no part in equality, copies or serialization
+# (Індекси за id() їхнього стану, що зберігаються поза моделлю, тож не беруть участі в порівнянні, копіях і серіалізації)
+_RESOURCE_INDEXES: Dict[int, _ResourceIndex] = {}
+
+
 class SystemState(BaseModel):
-    """Represents the complete state of the system (Представляє повний стан системи)."""
+    """
+    Represents the complete state of the system (Представляє повний стан системи).
+
+    Lookups by type or id go through an index built on first use and rebuilt whenever a resource is added, removed or
+    replaced; values are read live, so sums and means always reflect plain assignments. A resource's type is treated as
+    fixed (Пошук за типом або id іде через індекс, що будується при першому використанні та перебудовується, щойно ресурс
+    додано, видалено або замінено; значення читаються наживо, тож суми й середні завжди відображають звичайні присвоєння.
+    Тип ресурсу вважається незмінним).
+    """
     components: List[KeyComponent]
     resources: List[Resource]
     # Scientific metrics indices (Наукові індекси метрик)
@@ -55,6 +85,38 @@ class SystemState(BaseModel):
     c_index: Optional[float] = Field(default=None, ge=0, le=1, description="Cybernetic Control index (Індекс керованості)")
     a_index: Optional[float] = Field(default=None, ge=0, description="Adaptability index (Індекс адаптивності)")
 
+    def _resource_index(self) -> _ResourceIndex:
+        """Current index, rebuilt if the resources changed (Поточний індекс, перебудований, якщо ресурси змінилися)."""
+        key = id(self)
+        members = list(map(id, self.resources))
+        index = _RESOURCE_INDEXES.get(key)
+        if index is None or index.members != members:
+            if index is None:
+                weakref.finalize(self, _RESOURCE_INDEXES.pop, key, None)
+            index = _RESOURCE_INDEXES[key] = _ResourceIndex(self.resources, members)
+        return index
+
+    def resources_of_type(self, r_type: ResourceType) -> List[Resource]:
+        """Resources of one type in list order (Ресурси одного типу в порядку списку)."""
+        return self._resource_index().by_type.get(r_type, [])
+
+    def get_resource(self, resource_id: str) -> Optional[Resource]:
+        """Resource by id, None if absent (Ресурс за id, None якщо відсутній)."""
+        return self._resource_index().by_id.get(resource_id)
+
+    def type_sum(self, r_type: ResourceType) -> float:
+        """Sum of values of one type (Сума значень одного типу)."""
+        # Left to right without compensation, like the engine (Зліва направо без компенсації, як у рушії)
+        total = 0.0
+        for resource in self.resources_of_type(r_type):
+            total += resource.value
+        return total
+
+    def type_mean(self, r_type: ResourceType) -> Optional[float]:
+        """Mean value of one type, None if the type has no resources (Середнє значення типу, None якщо ресурсів цього типу немає)."""
+        members = self.resources_of_type(r_type)
+        return self.type_sum(r_type) / len(members) if members else None
+
 
 class MechanismInput(BaseModel):
     """Input from manager for the cybernetic control mechanism (Ввід менеджера для кібернетичного механізму)."""
@@ -69,6 +131,44 @@ class MechanismResponse(BaseModel):
     explanation_details: Optional[Dict[str, int]] = None
 
 
+class AgentRuleConfigUpdate(BaseModel):
+    """Coefficient changes to publish as a new rule config version (Зміни коефіцієнтів для публікації як нової версії конфігурації правил)."""
+    coefficients: Dict[str, int] = Field(..., min_length=1, description="Coefficient values by name, e.g. ECO_TECH (Значення коефіцієнтів за назвою, напр. ECO_TECH)")
+
+    @model_validator(mode="after")
+    def _check_values(self) -> "AgentRuleConfigUpdate":
+        """Keep deltas within the resource scale (Тримати дельти в межах шкали ресурсів)."""
+        if any(value < 0 or value > 100 for value in self.coefficients.values()):
+            raise ValueError("coefficients must be between 0 and 100")
+        return self
+
+
+class AgentRuleConfigInfo(BaseModel):
+    """Active agent rule config of a process (Активна конфігурація правил агента процесу)."""
+    version: int = Field(description="Published config version, 0 means environment defaults (Опублікована версія конфігурації, 0 - типові значення з оточення)")
+    rule_table_version: str = Field(description="Content hash of the compiled rule table (Хеш вмісту скомпільованої таблиці правил)")
+    coefficients: Dict[str, int]
+    overrides: Dict[str, int] = Field(default_factory=dict, description="Published values, the rest come from the RULE_* environment (Опубліковані значення, решта - з оточення RULE_*)")
+
+
+class MechanismBatchInput(BaseModel):
+    """Ordered list of manager goals applied in one transaction (Упорядкований список цілей менеджера, що застосовуються в одній транзакції)."""
+    target_goals: List[Annotated[str, Field(min_length=3)]] = Field(..., min_length=1, max_length=1000, description="Goals applied in order, each like MechanismInput.target_goal (Цілі, що застосовуються по черзі, кожна як MechanismInput.target_goal)")
+
+
+class MechanismBatchItem(BaseModel):
+    """Outcome of one goal of a batch (Результат однієї цілі пакета)."""
+    goal: str
+    explanation: str
+    explanation_details: Dict[str, int]
+
+
+class MechanismBatchResponse(BaseModel):
+    """Response for the batch apply-mechanism endpoint (Відповідь пакетного ендпоінта застосування механізму)."""
+    newState: SystemState
+    results: List[MechanismBatchItem]
+
+
 class SimulationMetrics(BaseModel):
     """Metrics snapshot for scientific analysis (Знімок метрик для наукового аналізу)."""
     s_index: float = Field(ge=0, le=1, description="Sustainability index (Індекс сталості)")
@@ -77,10 +177,187 @@ class SimulationMetrics(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Timestamp of metrics (Часова мітка метрик)")
 
 
+class SimulationDayRecord(BaseModel):
+    """Per-day output of a simulation run (Щоденний результат запуску симуляції)."""
+    day: int = Field(ge=0, description="Simulation day, 0 is the initial state (День симуляції, 0 - початковий стан)")
+    s_index: float = Field(ge=0, le=1, description="Sustainability index (Індекс сталості)")
+    c_index: float = Field(ge=0, le=1, description="Cybernetic Control index (Індекс керованості)")
+    a_index: float = Field(ge=0, description="Adaptability index (Індекс адаптивності)")
+    ops: int = Field(default=0, ge=0, description="Operations of the day (Операції за день)")
+    alerts: int = Field(default=0, ge=0, description="Alerts of the day (Алерти за день)")
+    peak_tick_alerts: Optional[int] = Field(default=None, ge=0, description="Most alerts within one tick of the day, set for sub-day runs (Найбільше алертів за один такт дня, задається для запусків із тактами)")
+    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Timestamp of metrics (Часова мітка метрик)")
+    state_delta: Optional[Dict[str, float]] = Field(default=None, description="Resource value changes by resource id, if requested (Зміни значень ресурсів за ID ресурсу, якщо запитано)")
+
+    def to_metrics(self) -> SimulationMetrics:
+        """Metrics snapshot of this day (Знімок метрик цього дня)."""
+        return SimulationMetrics(s_index=self.s_index, c_index=self.c_index, a_index=self.a_index, timestamp=self.timestamp)
+
+
+class ScenarioEvent(BaseModel):
+    """Scripted goal on a fixed day (Запланована ціль у визначений день)."""
+    day: int = Field(ge=1, description="Simulation day (День симуляції)")
+    goal: str = Field(min_length=1, description="Goal text for the agent (Текст цілі для агента)")
+
+
+class ScenarioGenerator(BaseModel):
+    """Rate-based event source that fires on every `every`-th day with a probability (Джерело подій за частотою, що спрацьовує кожного `every`-го дня з імовірністю)."""
+    goals: List[str] = Field(min_length=1, description="Goals to pick from uniformly (Цілі для рівномірного вибору)")
+    every: int = Field(default=1, ge=1, description="Period in days (Період у днях)")
+    probability: float = Field(default=1.0, ge=0.0, le=1.0, description="Chance to fire on a period day (Імовірність спрацювання в день періоду)")
+    start_day: int = Field(default=1, ge=1, description="First active day (Перший активний день)")
+    end_day: Optional[int] = Field(default=None, ge=1, description="Last active day, open-ended if omitted (Останній активний день, без обмеження якщо не задано)")
+
+
+class ScenarioPhase(BaseModel):
+    """Intensity in effect from `start_day` until the next phase (Інтенсивність, що діє з `start_day` до наступної фази)."""
+    start_day: int = Field(ge=1, description="First day of the phase (Перший день фази)")
+    intensity: str = Field(description="Event intensity level (Рівень інтенсивності подій)")
+
+
+class SimulationScenario(BaseModel):
+    """Scripted scenario compiled once into a per-day schedule (Сценарій, що один раз компілюється в щоденний розклад)."""
+    name: str = Field(default="scenario", description="Scenario name (Назва сценарію)")
+    events: List[ScenarioEvent] = Field(default_factory=list, description="Scripted goals by day (Заплановані цілі за днями)")
+    generators: List[ScenarioGenerator] = Field(default_factory=list, description="Rate-based event generators (Генератори подій за частотою)")
+    phases: List[ScenarioPhase] = Field(default_factory=list, description="Intensity phases, the run intensity applies before the first one (Фази інтенсивності, до першої діє інтенсивність запуску)")
+    intensity_events: bool = Field(default=True, description="Also draw the built-in events of the current intensity (Також генерувати вбудовані події поточної інтенсивності)")
+    seed: Optional[int] = Field(default=None, ge=0, description="Seed for generator draws, the run seed is used if omitted (Зерно для генераторів, якщо не задано - використовується зерно запуску)")
+
+
 class SimulationRunRequest(BaseModel):
     """Request parameters for simulation run (Параметри запиту для запуску симуляції)."""
     days: int = Field(default=30, ge=1, le=365, description="Number of simulation days (Кількість днів симуляції)")
     intensity: str = Field(default="high", description="Event intensity level (Рівень інтенсивності подій)")
     t_market: float = Field(default=30.0, gt=0, description="Market change time in days (Час змін на ринку в днях)")
     use_agent: bool = Field(default=True, description="If True, agent responds to events; if False, entropy degrades resources (Якщо True, агент реагує на події; якщо False, ентропія деградує ресурси)")
+    in_memory: bool = Field(default=False, description="If True, simulate in memory only and persist just the metrics, leaving the live system state untouched (Якщо True, симулювати лише в пам'яті та зберігати тільки метрики, не змінюючи живий стан системи)")
+    seed: Optional[int] = Field(default=None, ge=0, description="Random seed for a reproducible run, generated if omitted (Зерно для відтворюваного запуску, генерується якщо не задано)")
+    scenario: Optional[SimulationScenario] = Field(default=None, description="Scripted scenario replacing the default event rules (Сценарій, що замінює типові правила подій)")
+    ticks_per_day: int = Field(default=1, ge=1, le=96, description="Operations and alerts resolution, e.g. 24 for hours or 96 for 15 minutes (Роздільність операцій та алертів, напр. 24 для годин або 96 для 15 хвилин)")
+    collect_timings: Optional[bool] = Field(default=None, description="Time engine phases for /simulation/timings, server default (SIMULATION_TIMINGS) if omitted (Вимірювати час фаз рушія для /simulation/timings, типове значення сервера (SIMULATION_TIMINGS), якщо не вказано)")
+
+
+class SimulationExtendRequest(BaseModel):
+    """Request parameters to continue an existing simulation run (Параметри запиту для продовження наявного запуску симуляції)."""
+    days: int = Field(default=30, ge=1, le=365, description="Number of additional days (Кількість додаткових днів)")
+    ticks_per_day: Optional[int] = Field(default=None, ge=1, le=96, description="Operations and alerts resolution of the new days, the run's own if omitted (Роздільність операцій та алертів нових днів, власна роздільність запуску, якщо не вказано)")
+    in_memory: bool = Field(default=False, description="If True, leave the live system state untouched (Якщо True, не змінювати живий стан системи)")
+
+
+class SimulationEnsembleRequest(BaseModel):
+    """Request parameters for an ensemble of simulation replications (Параметри запиту для ансамблю реплікацій симуляції)."""
+    days: int = Field(default=30, ge=1, le=365, description="Number of simulation days (Кількість днів симуляції)")
+    intensity: str = Field(default="high", description="Event intensity level (Рівень інтенсивності подій)")
+    t_market: float = Field(default=30.0, gt=0, description="Market change time in days (Час змін на ринку в днях)")
+    use_agent: bool = Field(default=True, description="If True, agent responds to events; if False, entropy degrades resources (Якщо True, агент реагує на події; якщо False, ентропія деградує ресурси)")
+    seed: Optional[int] = Field(default=None, ge=0, description="Random seed for reproducible bands, generated if omitted (Зерно для відтворюваних смуг, генерується якщо не задано)")
+    replications: int = Field(default=1000, ge=1, le=100000, description="Number of independent replications (Кількість незалежних реплікацій)")
+    workers: Optional[int] = Field(default=None, ge=1, le=64, description="Number of worker processes, defaults to all available cores (Кількість робочих процесів, за замовчуванням усі доступні ядра)")
+
+    @model_validator(mode="before")
+    @classmethod
+    def _reject_single_run_options(cls, data: object) -> object:
+        """Refuse single-run options that ensembles cannot honour instead of ignoring them (Відхилити параметри одиночного запуску, які ансамблі не можуть виконати, замість їх ігнорування)."""
+        if isinstance(data, dict):
+            if data.get("scenario") is not None:
+                raise ValueError("scenarios are not supported by ensemble runs")
+            if data.get("ticks_per_day", 1) != 1:
+                raise ValueError("sub-day ticks are not supported by ensemble runs")
+            if data.get("in_memory") is True:
+                raise ValueError("ensemble runs never touch the live state, in_memory cannot be set")
+        return data
+
+
+class IndexBands(BaseModel):
+    """Per-day mean and percentile bands of one index (Щоденні середнє та смуги перцентилів одного індексу)."""
+    mean: List[float]
+    p5: List[float]
+    p50: List[float]
+    p95: List[float]
+
+
+class SimulationEnsembleResponse(BaseModel):
+    """Ensemble result with confidence bands per index (Результат ансамблю зі смугами довіри для кожного індексу)."""
+    replications: int
+    days: int
+    workers: int
+    s_index: IndexBands
+    c_index: IndexBands
+    a_index: IndexBands
+
+
+class SimulationPairedRequest(BaseModel):
+    """Request for paired agent-vs-control replications on common random numbers (Запит на парні реплікації агент проти контролю на спільних випадкових числах)."""
+    days: int = Field(default=30, ge=1, le=365, description="Number of simulation days (Кількість днів симуляції)")
+    intensity: str = Field(default="high", description="Event intensity level (Рівень інтенсивності подій)")
+    t_market: float = Field(default=30.0, gt=0, description="Market change time in days (Час змін на ринку в днях)")
+    replications: int = Field(default=1000, ge=1, le=100000, description="Number of replication pairs (Кількість пар реплікацій)")
+    workers: Optional[int] = Field(default=None, ge=1, le=64, description="Number of worker processes per arm, defaults to all available cores (Кількість робочих процесів на гілку, за замовчуванням усі доступні ядра)")
+    seed: Optional[int] = Field(default=None, ge=0, description="Seed shared by both arms (Зерно, спільне для обох гілок)")
+
+
+class PairedEffect(BaseModel):
+    """Agent effect on one index, averaged over days 1..N of each pair (Ефект агента на один індекс, усереднений за дні 1..N кожної пари)."""
+    mean: float
+    std_error: Optional[float] = Field(default=None, description="Standard error of the paired estimate, None for a single pair (Стандартна похибка парної оцінки, None для однієї пари)")
+    ci95_low: Optional[float] = None
+    ci95_high: Optional[float] = None
+    unpaired_std_error: Optional[float] = Field(default=None, description="Standard error the same replications would give as independent runs (Стандартна похибка тих самих реплікацій як незалежних запусків)")
+
+
+class SimulationPairedResponse(BaseModel):
+    """Per-day agent minus control differences and effect estimates (Щоденні різниці агент мінус контроль та оцінки ефекту)."""
+    replications: int
+    days: int
+    workers: int
+    s_index: IndexBands
+    c_index: IndexBands
+    a_index: IndexBands
+    effect: Dict[str, PairedEffect]
+
+
+class SimulationSweepRequest(BaseModel):
+    """Parameter grid for a simulation sweep (Сітка параметрів для перебору симуляцій)."""
+    intensities: List[str] = Field(default_factory=lambda: ["high"], min_length=1, description="Intensity levels to try (Рівні інтенсивності для перебору)")
+    t_markets: List[float] = Field(default_factory=lambda: [30.0], min_length=1, description="Market change times in days (Часи змін на ринку в днях)")
+    days: List[int] = Field(default_factory=lambda: [30], min_length=1, description="Simulation lengths in days (Тривалості симуляції в днях)")
+    use_agent: List[bool] = Field(default_factory=lambda: [True, False], min_length=1, description="Agent on/off arms (Варіанти з агентом і без)")
+    replications: int = Field(default=1, ge=1, le=10000, description="Replications per cell (Реплікацій на клітинку)")
+    seed: Optional[int] = Field(default=None, ge=0, description="Seed shared by all cells, generated if omitted (Зерно для всіх клітинок, генерується якщо не задано)")
+    workers: Optional[int] = Field(default=None, ge=1, le=64, description="Maximum cells computed in parallel (Максимум клітинок, що обчислюються паралельно)")
+
+    @model_validator(mode="after")
+    def _check_grid(self) -> "SimulationSweepRequest":
+        """Validate grid values and size (Перевірити значення та розмір сітки)."""
+        if any(d < 1 or d > 365 for d in self.days):
+            raise ValueError("days must be between 1 and 365")
+        if any(t <= 0 for t in self.t_markets):
+            raise ValueError("t_markets must be positive")
+        size = len(self.intensities) * len(self.t_markets) * len(self.days) * len(self.use_agent)
+        if size > 1000:
+            raise ValueError("sweep grid is limited to 1000 cells")
+        return self
+
+
+class SimulationJobStatus(str, Enum):
+    """Lifecycle states of a simulation job (Стани життєвого циклу завдання симуляції)."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
 
+class SimulationJobInfo(BaseModel):
+    """Status of a simulation job (Статус завдання симуляції)."""
+    job_id: str
+    status: SimulationJobStatus
+    days: int = Field(description="Requested days (Запитана кількість днів)")
+    days_done: int = Field(default=0, description="Simulated days so far (Уже симульовані дні)")
+    simulation_run_id: str
+    seed: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
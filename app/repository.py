@@ -3,12 +3,16 @@ Repository layer for persistence operations (Репозиторій для оп
 """
 
 import json
-from typing import List, Tuple, Optional
+import os
+from datetime import datetime
+from typing import Dict, List, Tuple, Optional
 
-from sqlmodel import select, delete
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, delete, func
 
 from app.db import get_session, create_db_and_tables
-from app.db_models import ComponentRow, ResourceRow, AgentRunRow, SimulationMetricRow
+from app.db_models import ComponentRow, ResourceRow, AgentRunRow, SimulationMetricRow, SimulationRunRow, SimulationRunOptionsRow, SimulationSweepCellRow, SimulationCheckpointRow, SimulationResultCacheRow, SimulationRunLogRow, AgentRuleConfigRow
 from app.models import SystemState, KeyComponent, Resource, SimulationMetrics
 from app.initial_state import INITIAL_STATE
 
@@ -36,30 +40,59 @@ def read_system_state() -> SystemState:
 
 
 def write_system_state(new_state: SystemState) -> None:
-    """Overwrite system state in the database (Перезаписати стан системи у БД)."""
-    with get_session() as session:
-        # Update or insert components
-        for comp in new_state.components:
-            existing = session.get(ComponentRow, comp.id)
-            if existing is None:
-                session.add(ComponentRow(id=comp.id, name=comp.name, status=comp.status))
-            else:
-                existing.name = comp.name
-                existing.status = comp.status
-        # Update or insert resources
-        for res in new_state.resources:
-            existing = session.get(ResourceRow, res.id)
-            if existing is None:
-                session.add(
-                    ResourceRow(id=res.id, name=res.name, type=res.type, value=res.value)
-                )
-            else:
-                existing.name = res.name
-                existing.type = res.type
-                existing.value = res.value
+    """
+    Overwrite system state in the database (Перезаписати стан системи у БД).
+
+    Existing rows are read once per table and only changed or new rows are written, in bulk, so the cost grows linearly
+    with the number of resources (Наявні рядки читаються один раз на таблицю, а записуються масово лише змінені або нові,
+    тож вартість зростає лінійно з кількістю ресурсів).
+    """
+    with get_session() as session:
+        _stage_system_state(session, new_state)
         session.commit()
 
 
+def _stage_system_state(session: Session, new_state: SystemState) -> None:
+    """Stage a state overwrite in an open session without committing (Підготувати перезапис стану у відкритій сесії без фіксації)."""
+    # Update or insert components
+    stored_components = {
+        row[0]: tuple(row[1:]) for row in session.exec(select(ComponentRow.id, ComponentRow.name, ComponentRow.status)).all()
+    }
+    component_updates: List[Dict] = []
+    component_inserts: List[Dict] = []
+    for comp in new_state.components:
+        fields = {"id": comp.id, "name": comp.name, "status": comp.status}
+        stored = stored_components.get(comp.id)
+        if stored is None:
+            component_inserts.append(fields)
+        elif stored != (comp.name, comp.status):
+            component_updates.append(fields)
+
+    # Update or insert resources
+    stored_resources = {
+        row[0]: tuple(row[1:])
+        for row in session.exec(select(ResourceRow.id, ResourceRow.name, ResourceRow.type, ResourceRow.value)).all()
+    }
+    resource_updates: List[Dict] = []
+    resource_inserts: List[Dict] = []
+    for res in new_state.resources:
+        fields = {"id": res.id, "name": res.name, "type": res.type, "value": res.value}
+        stored = stored_resources.get(res.id)
+        if stored is None:
+            resource_inserts.append(fields)
+        elif stored != (res.name, res.type, res.value):
+            resource_updates.append(fields)
+
+    for table, updates, inserts in (
+        (ComponentRow, component_updates, component_inserts),
+        (ResourceRow, resource_updates, resource_inserts),
+    ):
+        if updates:
+            session.execute(update(table), updates)
+        if inserts:
+            session.execute(insert(table), inserts)
+
+
 def seed_initial_state(initial_state: SystemState) -> None:
     """Insert initial state if tables are empty (Додати початковий стан, якщо таблиці порожні)."""
     with get_session() as session:
@@ -84,6 +117,34 @@ def add_agent_run(goal: str, deltas: dict, snapshot: SystemState) -> int:
         return int(row.id)  # type: ignore
 
 
+def apply_agent_runs(final_state: SystemState, runs: List[Tuple[str, Dict[str, int], str]]) -> int:
+    """
+    Write the final state and a batch of agent runs in one transaction (Записати кінцевий стан і пакет запусків агента в одній транзакції).
+
+    Args:
+        final_state: State after the last goal (Стан після останньої цілі)
+        runs: (goal, deltas, snapshot_json) per goal in order (Ціль, дельти та JSON-знімок стану для кожної цілі по черзі)
+
+    Returns:
+        Number of stored agent runs (Кількість збережених запусків агента)
+    """
+    rows = [
+        {
+            "timestamp": datetime.utcnow(),
+            "input_goal": goal,
+            "applied_rules_explanation": json.dumps(deltas, ensure_ascii=False),
+            "snapshot_state": snapshot,
+        }
+        for goal, deltas, snapshot in runs
+    ]
+    with get_session() as session:
+        _stage_system_state(session, final_state)
+        if rows:
+            session.execute(insert(AgentRunRow), rows)
+        session.commit()
+    return len(rows)
+
+
 def list_agent_runs(limit: int = 20, offset: int = 0) -> Tuple[int, List[AgentRunRow]]:
     """List agent runs with pagination (Список запусків агента з пагінацією)."""
     with get_session() as session:
@@ -101,12 +162,86 @@ def clear_state_and_runs() -> None:
     with get_session() as session:
         # Delete in dependency-safe order (Видалення у безпечному порядку залежностей)
         session.exec(delete(SimulationMetricRow))
+        session.exec(delete(SimulationRunRow))
+        session.exec(delete(SimulationRunOptionsRow))
+        session.exec(delete(SimulationSweepCellRow))
+        session.exec(delete(SimulationCheckpointRow))
+        session.exec(delete(SimulationResultCacheRow))
+        session.exec(delete(SimulationRunLogRow))
         session.exec(delete(AgentRunRow))
         session.exec(delete(ResourceRow))
         session.exec(delete(ComponentRow))
         session.commit()
 
 
+def save_simulation_run(
+    simulation_run_id: str,
+    days: int,
+    intensity: str,
+    t_market: float,
+    use_agent: bool,
+    seed: int,
+    ticks_per_day: int = 1,
+    scenario: Optional[str] = None
+) -> None:
+    """Save simulation run parameters, seed, resolution and scenario (Зберегти параметри запуску симуляції, зерно, роздільність і сценарій)."""
+    with get_session() as session:
+        session.add(SimulationRunRow(
+            id=simulation_run_id,
+            days=days,
+            intensity=intensity,
+            t_market=t_market,
+            use_agent=use_agent,
+            seed=seed
+        ))
+        session.add(SimulationRunOptionsRow(
+            simulation_run_id=simulation_run_id,
+            ticks_per_day=ticks_per_day,
+            scenario=scenario
+        ))
+        session.commit()
+
+
+def get_simulation_run(simulation_run_id: str) -> Optional[SimulationRunRow]:
+    """Get stored parameters of a simulation run (Отримати збережені параметри запуску симуляції)."""
+    with get_session() as session:
+        return session.get(SimulationRunRow, simulation_run_id)
+
+
+def get_simulation_run_options(simulation_run_id: str) -> Optional[SimulationRunOptionsRow]:
+    """Get the stored scenario and resolution of a run, None for runs saved before they were recorded (Отримати збережені сценарій і роздільність запуску, None для запусків, збережених до їх запису)."""
+    with get_session() as session:
+        return session.get(SimulationRunOptionsRow, simulation_run_id)
+
+
+def update_simulation_run_days(simulation_run_id: str, days: int) -> None:
+    """Update the total number of simulated days of a run (Оновити загальну кількість симульованих днів запуску)."""
+    with get_session() as session:
+        row = session.get(SimulationRunRow, simulation_run_id)
+        if row is not None:
+            row.days = days
+            session.add(row)
+            session.commit()
+
+
+def save_simulation_checkpoint(checkpoint: SimulationCheckpointRow) -> None:
+    """Save engine state of a run at a checkpoint day (Зберегти стан рушія запуску на день контрольної точки)."""
+    with get_session() as session:
+        session.add(checkpoint)
+        session.commit()
+
+
+def get_latest_simulation_checkpoint(simulation_run_id: str) -> Optional[SimulationCheckpointRow]:
+    """Get the most recent checkpoint of a run (Отримати останню контрольну точку запуску)."""
+    with get_session() as session:
+        return session.exec(
+            select(SimulationCheckpointRow)
+            .where(SimulationCheckpointRow.simulation_run_id == simulation_run_id)
+            .order_by(SimulationCheckpointRow.day.desc())
+            .limit(1)
+        ).first()
+
+
 def save_simulation_metric(
     metric: SimulationMetrics,
     simulation_run_id: str,
@@ -130,6 +265,64 @@ def save_simulation_metric(
         return int(row.id)  # type: ignore
 
 
+def save_simulation_metrics_bulk(rows: List[Dict]) -> int:
+    """Insert many simulation metric rows in one transaction (Вставити багато рядків метрик симуляції однією транзакцією)."""
+    if not rows:
+        return 0
+    with get_session() as session:
+        session.execute(insert(SimulationMetricRow), rows)
+        session.commit()
+    return len(rows)
+
+
+# Rows buffered before an intermediate flush, 0 means flush only at the end of a run
+# (Кількість рядків у буфері до проміжного скидання, 0 - скидати лише в кінці запуску)
+METRICS_FLUSH_EVERY = max(0, int(os.getenv("SIMULATION_METRICS_FLUSH_EVERY", "0")))
+
+
+class SimulationMetricsWriter:
+    """
+    Buffered writer for one run's simulation metrics (Буферизований записувач метрик симуляції одного запуску).
+
+    Collects rows in memory and writes them with a single bulk insert on flush, or every `flush_every` rows
+    (Збирає рядки в пам'яті й записує їх однією масовою вставкою при скиданні або кожні `flush_every` рядків).
+    """
+
+    def __init__(self, simulation_run_id: str, use_agent: bool, flush_every: Optional[int] = None) -> None:
+        self.simulation_run_id = simulation_run_id
+        self.use_agent = use_agent
+        self.flush_every = METRICS_FLUSH_EVERY if flush_every is None else flush_every
+        self.written = 0
+        self._buffer: List[Dict] = []
+
+    def add(self, metric: SimulationMetrics, day: int) -> None:
+        """Buffer one metric row (Додати один рядок метрики до буфера)."""
+        self._buffer.append({
+            "timestamp": metric.timestamp,
+            "s_index": metric.s_index,
+            "c_index": metric.c_index,
+            "a_index": metric.a_index,
+            "simulation_run_id": self.simulation_run_id,
+            "use_agent": self.use_agent,
+            "day": day,
+        })
+        if self.flush_every and len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered rows in one transaction (Записати рядки з буфера однією транзакцією)."""
+        rows, self._buffer = self._buffer, []
+        written = save_simulation_metrics_bulk(rows)
+        self.written += written
+        return written
+
+    def __enter__(self) -> "SimulationMetricsWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
+
+
 def get_simulation_metrics_by_run_id(simulation_run_id: str) -> List[SimulationMetrics]:
     """Get all metrics for a specific simulation run (Отримати всі метрики для конкретного запуску симуляції)."""
     with get_session() as session:
@@ -161,6 +354,47 @@ def get_latest_simulation_run_id() -> Optional[str]:
         return latest.simulation_run_id if latest else None
 
 
+def save_simulation_run_log(simulation_run_id: str, agent_logs: List[str]) -> datetime:
+    """
+    Mark a run as completed now and store its agent logs (Позначити запуск як завершений зараз і зберегти логи агента).
+
+    Returns:
+        Completion time, which also orders runs for the "latest run" pointer (Час завершення, що також впорядковує запуски для вказівника "останній запуск")
+    """
+    row = SimulationRunLogRow(
+        simulation_run_id=simulation_run_id,
+        completed_at=datetime.utcnow(),
+        agent_logs=json.dumps(agent_logs, ensure_ascii=False),
+    )
+    with get_session() as session:
+        session.merge(row)
+        session.commit()
+    return row.completed_at
+
+
+def get_simulation_run_log(simulation_run_id: str) -> Optional[SimulationRunLogRow]:
+    """Get the completion record of a run (Отримати запис про завершення запуску)."""
+    with get_session() as session:
+        return session.get(SimulationRunLogRow, simulation_run_id)
+
+
+def get_latest_completed_simulation_run_id() -> Optional[str]:
+    """Get the ID of the most recently completed run (Отримати ID останнього завершеного запуску)."""
+    with get_session() as session:
+        return session.exec(
+            select(SimulationRunLogRow.simulation_run_id)
+            .order_by(SimulationRunLogRow.completed_at.desc())
+            .limit(1)
+        ).first()
+
+
+def clear_simulation_run_logs() -> None:
+    """Delete all run completion records (Видалити всі записи про завершення запусків)."""
+    with get_session() as session:
+        session.exec(delete(SimulationRunLogRow))
+        session.commit()
+
+
 def get_all_simulation_metrics(limit: int = 1000) -> List[SimulationMetricRow]:
     """Get all simulation metrics (Отримати всі метрики симуляції)."""
     with get_session() as session:
@@ -170,3 +404,122 @@ def get_all_simulation_metrics(limit: int = 1000) -> List[SimulationMetricRow]:
             .limit(limit)
         ).all()
 
+
+def get_sweep_cells(cell_keys: List[str]) -> Dict[str, SimulationSweepCellRow]:
+    """Get already computed sweep cells by key (Отримати вже обчислені клітинки перебору за ключем)."""
+    if not cell_keys:
+        return {}
+    with get_session() as session:
+        rows = session.exec(
+            select(SimulationSweepCellRow).where(SimulationSweepCellRow.cell_key.in_(cell_keys))
+        ).all()
+        return {row.cell_key: row for row in rows}
+
+
+def save_sweep_cell(row: SimulationSweepCellRow) -> None:
+    """Save one computed sweep cell (Зберегти одну обчислену клітинку перебору)."""
+    with get_session() as session:
+        session.merge(row)
+        session.commit()
+
+
+def list_sweep_cells(limit: int = 1000, offset: int = 0) -> List[SimulationSweepCellRow]:
+    """List stored sweep cells, newest first (Список збережених клітинок перебору, новіші першими)."""
+    with get_session() as session:
+        return session.exec(
+            select(SimulationSweepCellRow)
+            .order_by(SimulationSweepCellRow.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+        ).all()
+
+
+def get_cached_simulation_result(cache_key: str) -> Optional[SimulationResultCacheRow]:
+    """Get a cached simulation result by key (Отримати кешований результат симуляції за ключем)."""
+    with get_session() as session:
+        return session.get(SimulationResultCacheRow, cache_key)
+
+
+def save_cached_simulation_result(row: SimulationResultCacheRow, max_bytes: int) -> int:
+    """
+    Save a cached simulation result and evict the oldest rows beyond a total size (Зберегти кешований результат і витіснити найстаріші рядки понад загальний розмір).
+
+    Args:
+        row: Cached result (Кешований результат)
+        max_bytes: Upper bound for the total payload size of the table (Верхня межа загального розміру таблиці)
+
+    Returns:
+        Number of evicted rows (Кількість витіснених рядків)
+    """
+    with get_session() as session:
+        session.merge(row)
+        session.commit()
+        total = session.exec(select(func.coalesce(func.sum(SimulationResultCacheRow.size_bytes), 0))).one()
+        if total <= max_bytes:
+            return 0
+        evicted = []
+        for key, size in session.exec(
+            select(SimulationResultCacheRow.cache_key, SimulationResultCacheRow.size_bytes)
+            .where(SimulationResultCacheRow.cache_key != row.cache_key)
+            .order_by(SimulationResultCacheRow.created_at)
+        ).all():
+            if total <= max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+        if evicted:
+            session.exec(delete(SimulationResultCacheRow).where(SimulationResultCacheRow.cache_key.in_(evicted)))
+            session.commit()
+        return len(evicted)
+
+
+def count_cached_simulation_results() -> Tuple[int, int]:
+    """Count cached simulation results and their total size in bytes (Порахувати кешовані результати та їхній загальний розмір у байтах)."""
+    with get_session() as session:
+        count, size = session.exec(
+            select(func.count(), func.coalesce(func.sum(SimulationResultCacheRow.size_bytes), 0))
+            .select_from(SimulationResultCacheRow)
+        ).one()
+        return int(count), int(size)
+
+
+def get_latest_rule_config() -> Optional[AgentRuleConfigRow]:
+    """Get the highest published rule config version (Отримати найвищу опубліковану версію конфігурації правил)."""
+    with get_session() as session:
+        return session.exec(select(AgentRuleConfigRow).order_by(AgentRuleConfigRow.version.desc()).limit(1)).first()
+
+
+def save_rule_config(overrides: Dict[str, int], replace: bool = False, attempts: int = 10) -> AgentRuleConfigRow:
+    """
+    Publish coefficient overrides as the next rule config version (Опублікувати перевизначення коефіцієнтів як наступну версію конфігурації правил).
+
+    Concurrent publishers may pick the same next version; the loser's insert hits the primary key and is retried on top of
+    the winner's row (Паралельні публікатори можуть обрати ту саму наступну версію; вставка того, хто програв, порушує
+    первинний ключ і повторюється поверх рядка переможця).
+
+    Args:
+        overrides: Coefficient values by name (Значення коефіцієнтів за назвою)
+        replace: Store exactly these overrides instead of merging them onto the latest stored ones (Зберегти саме ці перевизначення замість накладання на останні збережені)
+        attempts: Tries before a version conflict is raised (Спроби до того, як конфлікт версій буде піднято)
+
+    Returns:
+        The stored row (Збережений рядок)
+
+    Raises:
+        IntegrityError: If every attempt lost the race for the next version (Якщо кожна спроба програла змагання за наступну версію)
+    """
+    for attempt in range(attempts):
+        with get_session() as session:
+            latest = session.exec(select(AgentRuleConfigRow).order_by(AgentRuleConfigRow.version.desc()).limit(1)).first()
+            merged = overrides if latest is None or replace else {**json.loads(latest.coefficients), **overrides}
+            row = AgentRuleConfigRow(version=(latest.version if latest is not None else 0) + 1, coefficients=json.dumps(merged, sort_keys=True))
+            session.add(row)
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                if attempt == attempts - 1:
+                    raise
+                continue
+            session.refresh(row)
+            return row
@@ -0,0 +1,181 @@
+"""
+Result cache for deterministic simulation requests (Кеш результатів детермінованих запитів симуляції).
+A seeded run is a pure function of its parameters, seed and the agent rule coefficients, so its response is stored under a
+content hash of those inputs in an in-memory LRU tier backed by a database tier
+(Запуск із зерном є чистою функцією параметрів, зерна та коефіцієнтів правил агента, тож відповідь зберігається за хешем
+цих входів у LRU-кеші в пам'яті з резервним рівнем у базі даних).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from pydantic import TypeAdapter
+
+from app.agent_logic import rule_coefficients
+from app.db_models import SimulationResultCacheRow
+from app.models import SimulationMetrics, SimulationRunRequest
+from app.repository import get_cached_simulation_result, save_cached_simulation_result, count_cached_simulation_results
+
+
+# Bump when engine changes alter results for the same inputs (Збільшити, коли зміни рушія змінюють результат для тих самих входів)
+CACHE_FORMAT_VERSION = 1
+
+# Size limits of both tiers in bytes of encoded responses (Ліміти розміру обох рівнів у байтах закодованих відповідей)
+MEMORY_MAX_BYTES = max(0, int(os.getenv("SIMULATION_CACHE_MEMORY_MAX_BYTES", str(32 * 1024 * 1024))))
+DB_MAX_BYTES = max(0, int(os.getenv("SIMULATION_CACHE_DB_MAX_BYTES", str(256 * 1024 * 1024))))
+
+_metrics_adapter = TypeAdapter(List[SimulationMetrics])
+
+
+def simulation_cache_key(request: SimulationRunRequest, seed: int) -> str:
+    """
+    Canonical content hash of a simulation request (Канонічний хеш вмісту запиту симуляції).
+
+    in_memory only decides whether the live state is touched and collect_timings only whether phases are timed, so neither
+    changes the result and both are left out (in_memory лише визначає, чи змінюється живий стан, а collect_timings - чи
+    вимірюється час фаз, тож жоден не впливає на результат і обидва не входять до ключа).
+
+    Args:
+        request: Simulation parameters (Параметри симуляції)
+        seed: Seed of the run (Зерно запуску)
+
+    Returns:
+        Hex digest (Шістнадцятковий хеш)
+    """
+    payload = json.dumps(
+        {
+            "version": CACHE_FORMAT_VERSION,
+            "request": request.model_dump(exclude={"in_memory", "seed", "collect_timings"}),
+            "seed": seed,
+            "rules": rule_coefficients(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedSimulationResult:
+    """One cached run: encoded response plus what is needed to restore it as the latest run (Один кешований запуск: закодована відповідь і дані для відновлення його як останнього)."""
+    simulation_run_id: str
+    seed: int
+    payload: bytes
+    metrics: List[SimulationMetrics]
+    agent_logs: List[str]
+
+    @classmethod
+    def build(cls, simulation_run_id: str, seed: int, metrics: List[SimulationMetrics], agent_logs: List[str]) -> "CachedSimulationResult":
+        """Encode the response once so hits skip serialization (Закодувати відповідь один раз, щоб влучання не серіалізували її повторно)."""
+        return cls(simulation_run_id, seed, _metrics_adapter.dump_json(metrics), list(metrics), list(agent_logs))
+
+    @property
+    def size(self) -> int:
+        """Size used for eviction (Розмір для витіснення)."""
+        return len(self.payload)
+
+    def to_row(self, cache_key: str) -> SimulationResultCacheRow:
+        """Serialize for the database tier (Серіалізувати для рівня бази даних)."""
+        return SimulationResultCacheRow(
+            cache_key=cache_key,
+            simulation_run_id=self.simulation_run_id,
+            seed=self.seed,
+            payload=self.payload.decode("utf-8"),
+            agent_logs=json.dumps(self.agent_logs, ensure_ascii=False),
+            size_bytes=self.size,
+        )
+
+    @classmethod
+    def from_row(cls, row: SimulationResultCacheRow) -> "CachedSimulationResult":
+        """Restore from the database tier (Відновити з рівня бази даних)."""
+        payload = row.payload.encode("utf-8")
+        return cls(row.simulation_run_id, row.seed, payload, _metrics_adapter.validate_json(payload), json.loads(row.agent_logs))
+
+
+class SimulationResultCache:
+    """
+    Two-tier result cache with size-based LRU eviction in memory and oldest-first eviction in the database
+    (Дворівневий кеш результатів із LRU-витісненням за розміром у пам'яті та витісненням найстаріших у базі даних).
+    """
+
+    def __init__(self, memory_max_bytes: int = MEMORY_MAX_BYTES, db_max_bytes: int = DB_MAX_BYTES) -> None:
+        self.memory_max_bytes = memory_max_bytes
+        self.db_max_bytes = db_max_bytes
+        self._entries: "OrderedDict[str, CachedSimulationResult]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "db_hits": 0, "misses": 0, "memory_evictions": 0, "db_evictions": 0}
+
+    def get(self, cache_key: str) -> Optional[CachedSimulationResult]:
+        """Look up a result, promoting database hits into memory (Знайти результат, переносячи влучання з бази даних у пам'ять)."""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self._counters["memory_hits"] += 1
+                return entry
+
+        row = get_cached_simulation_result(cache_key)
+        if row is None:
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+        entry = CachedSimulationResult.from_row(row)
+        with self._lock:
+            self._counters["db_hits"] += 1
+            self._remember(cache_key, entry)
+        return entry
+
+    def put(self, cache_key: str, entry: CachedSimulationResult) -> None:
+        """Store a result in both tiers (Зберегти результат в обох рівнях)."""
+        with self._lock:
+            self._remember(cache_key, entry)
+        if entry.size <= self.db_max_bytes:
+            evicted = save_cached_simulation_result(entry.to_row(cache_key), self.db_max_bytes)
+            with self._lock:
+                self._counters["db_evictions"] += evicted
+
+    def _remember(self, cache_key: str, entry: CachedSimulationResult) -> None:
+        """Insert into the memory tier and evict least recently used entries; caller holds the lock (Додати в пам'ять і витіснити найдавніше використані; викликач тримає блокування)."""
+        if entry.size > self.memory_max_bytes:
+            return
+        previous = self._entries.pop(cache_key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+        self._entries[cache_key] = entry
+        self._memory_bytes += entry.size
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self._counters["memory_evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop the memory tier and reset counters (Очистити рівень пам'яті та скинути лічильники)."""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and tier sizes (Лічильники влучань/промахів та розміри рівнів)."""
+        db_entries, db_bytes = count_cached_simulation_results()
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+            lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+            stats.update(
+                hit_ratio=(stats["memory_hits"] + stats["db_hits"]) / lookups if lookups else 0.0,
+                memory_entries=len(self._entries),
+                memory_bytes=self._memory_bytes,
+                memory_max_bytes=self.memory_max_bytes,
+            )
+        stats.update(db_entries=db_entries, db_bytes=db_bytes, db_max_bytes=self.db_max_bytes)
+        return stats
+
+
+# Process-wide cache instance (Екземпляр кешу на процес)
+simulation_result_cache = SimulationResultCache()
@@ -0,0 +1,117 @@
+"""
+Versioned agent rule config store with hot reload (Версіоноване сховище конфігурації правил агента з гарячим перезавантаженням).
+Coefficient overrides are published as numbered rows in the database; every API process polls the highest version and
+swaps in a newly compiled rule table, so tuning needs no restart and in-flight runs finish on the table they started with.
+Stored overrides win only for the coefficients they name, the rest follow the RULE_* environment, and a reset stores an
+empty set (Перевизначення коефіцієнтів публікуються як пронумеровані рядки в базі даних; кожен процес API опитує найвищу
+версію та підміняє новоскомпільовану таблицю правил, тож налаштування не потребує перезапуску, а поточні запуски
+завершуються з таблицею, з якою почали. Збережені перевизначення мають перевагу лише для названих коефіцієнтів, решта
+відповідає оточенню RULE_*, а скидання зберігає порожній набір).
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from app.agent_logic import DEFAULT_COEFFICIENTS, RuleConfig, install_rule_config, rule_config
+from app.repository import get_latest_rule_config, save_rule_config
+
+
+# Seconds between checks for a newer config, 0 disables the watcher (Секунди між перевірками нової конфігурації, 0 вимикає спостерігача)
+RULES_POLL_SECONDS = max(0.0, float(os.getenv("AGENT_RULES_POLL_SECONDS", "5")))
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownCoefficientError(ValueError):
+    """Raised when a published config names a coefficient the rules do not use (Виникає, коли опублікована конфігурація містить невідомий коефіцієнт)."""
+
+
+def refresh_rule_config() -> RuleConfig:
+    """
+    Install the latest stored config if it is newer than the active one (Встановити останню збережену конфігурацію, якщо вона новіша за активну).
+
+    Returns:
+        The rule config active after the check (Конфігурація правил, активна після перевірки)
+    """
+    row = get_latest_rule_config()
+    if row is None or row.version <= rule_config().version:
+        return rule_config()
+    return install_rule_config(row.version, json.loads(row.coefficients))
+
+
+def publish_rule_coefficients(coefficients: Dict[str, int]) -> RuleConfig:
+    """
+    Store coefficients as the next config version and activate it in this process (Зберегти коефіцієнти як наступну версію конфігурації та активувати її в цьому процесі).
+
+    Given values are merged onto the previously published overrides; coefficients never published keep following the
+    RULE_* environment (Задані значення накладаються на раніше опубліковані перевизначення; коефіцієнти, які ніколи не
+    публікувалися, і далі відповідають оточенню RULE_*).
+
+    Args:
+        coefficients: Coefficient values by name (Значення коефіцієнтів за назвою)
+
+    Returns:
+        The newly active rule config (Нова активна конфігурація правил)
+
+    Raises:
+        UnknownCoefficientError: If a name is not a known coefficient (Якщо назва не є відомим коефіцієнтом)
+    """
+    unknown = sorted(set(coefficients) - set(DEFAULT_COEFFICIENTS))
+    if unknown:
+        raise UnknownCoefficientError(f"Unknown rule coefficients: {', '.join(unknown)}")
+    row = save_rule_config(coefficients)
+    return install_rule_config(row.version, json.loads(row.coefficients))
+
+
+def reset_rule_coefficients() -> RuleConfig:
+    """
+    Drop all published overrides so every process uses its RULE_* environment again (Скинути всі опубліковані перевизначення, щоб кожен процес знову використовував своє оточення RULE_*).
+
+    Returns:
+        The newly active rule config (Нова активна конфігурація правил)
+    """
+    row = save_rule_config({}, replace=True)
+    return install_rule_config(row.version, json.loads(row.coefficients))
+
+
+class RuleConfigWatcher:
+    """Background thread that polls the store and installs newer configs (Фоновий потік, що опитує сховище та встановлює новіші конфігурації)."""
+
+    def __init__(self, interval: float = RULES_POLL_SECONDS) -> None:
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Load the stored config once, then start polling if enabled (Завантажити збережену конфігурацію один раз, потім почати опитування, якщо ввімкнено)."""
+        refresh_rule_config()
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rule-config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread (Зупинити опитування та дочекатися потоку)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Poll until stopped; store errors keep the active rules (Опитувати до зупинки; помилки сховища залишають активні правила)."""
+        while not self._stop.wait(self.interval):
+            try:
+                previous = rule_config().version
+                active = refresh_rule_config()
+                if active.version != previous:
+                    logger.info("Installed agent rule config version %s", active.version)
+            except Exception as exc:  # pragma: no cover
+                logger.warning("Agent rule config refresh failed: %s", exc)
+
+
+# Process-wide watcher instance (Екземпляр спостерігача на процес)
+rule_config_watcher = RuleConfigWatcher()
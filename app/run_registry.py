@@ -0,0 +1,184 @@
+"""
+Registry of recent simulation runs (Реєстр останніх запусків симуляції).
+Keeps metrics and agent logs per run ID so overlapping runs never overwrite each other. Completed runs and the "latest run"
+pointer live in the database, so every API worker process sees the same runs; each process keeps a bounded LRU copy of
+recently used runs in front of it (Зберігає метрики та логи агента окремо для кожного ID запуску, тож паралельні запуски
+не перезаписують один одного. Завершені запуски та вказівник "останній запуск" зберігаються в базі даних, тож усі робочі
+процеси API бачать ті самі запуски; кожен процес тримає перед нею обмежену LRU-копію нещодавно використаних запусків).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.models import SimulationMetrics
+from app.repository import (
+    save_simulation_run_log,
+    get_simulation_run_log,
+    get_latest_completed_simulation_run_id,
+    clear_simulation_run_logs,
+    get_simulation_metrics_by_run_id,
+)
+
+
+# Runs kept in memory per process (Запуски, що зберігаються в пам'яті кожного процесу)
+REGISTRY_MAX_RUNS = max(1, int(os.getenv("SIMULATION_REGISTRY_MAX_RUNS", "32")))
+# Seconds an unfinished run may stay idle before it is dropped, e.g. cancelled jobs or abandoned streams
+# 0 disables the age limit (Секунди, які незавершений запуск може простоювати до видалення, напр. скасовані завдання
+# або покинуті потоки; 0 вимикає обмеження за віком)
+REGISTRY_STALE_SECONDS = max(0.0, float(os.getenv("SIMULATION_REGISTRY_STALE_SECONDS", "3600")))
+
+
+@dataclass
+class RegisteredRun:
+    """Metrics and agent logs of one run (Метрики та логи агента одного запуску)."""
+    run_id: str
+    metrics: List[SimulationMetrics] = field(default_factory=list)
+    agent_logs: List[str] = field(default_factory=list)
+    completed: bool = False
+    completed_at: Optional[datetime] = None
+    timings: Optional[Dict[str, Dict[str, float]]] = None
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SimulationRunRegistry:
+    """
+    Thread-safe registry of runs backed by the database (Потокобезпечний реєстр запусків на основі бази даних).
+
+    Runs in progress are local to the process that executes them; once completed they are published to the database and
+    the local copy is served only while it matches the stored completion time (Запуски, що виконуються, локальні для
+    процесу, який їх виконує; після завершення вони публікуються в базі даних, а локальна копія використовується, лише
+    поки збігається зі збереженим часом завершення).
+    """
+
+    def __init__(self, max_runs: int = REGISTRY_MAX_RUNS, stale_seconds: float = REGISTRY_STALE_SECONDS) -> None:
+        self.max_runs = max_runs
+        self.stale_seconds = stale_seconds
+        self._runs: "OrderedDict[str, RegisteredRun]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, run_id: str) -> None:
+        """Register a run that is about to produce data; an existing entry is kept (Зареєструвати запуск, що починає видавати дані; наявний запис зберігається)."""
+        with self._lock:
+            if run_id not in self._runs:
+                self._runs[run_id] = RegisteredRun(run_id)
+            self._runs[run_id].last_used = time.monotonic()
+            self._runs.move_to_end(run_id)
+            self._evict()
+
+    def append_agent_logs(self, run_id: str, lines: List[str]) -> None:
+        """Add agent log lines to a run (Додати рядки логів агента до запуску)."""
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                run = self._runs[run_id] = RegisteredRun(run_id)
+            run.agent_logs.extend(lines)
+            run.last_used = time.monotonic()
+
+    def set_timings(self, run_id: str, timings: Dict[str, Dict[str, float]]) -> None:
+        """Attach phase timings to a run; they stay in this process only (Прикріпити час фаз до запуску; він зберігається лише в цьому процесі)."""
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                run = self._runs[run_id] = RegisteredRun(run_id)
+            run.timings = timings
+            run.last_used = time.monotonic()
+            self._evict()
+
+    def complete(self, run_id: str, metrics: List[SimulationMetrics], agent_logs: Optional[List[str]] = None) -> None:
+        """
+        Publish the final metrics of a run and make it the latest one (Опублікувати фінальні метрики запуску і зробити його останнім).
+
+        Metrics are already persisted by the engine, so only the completion record and agent logs are written
+        (Метрики вже збережені рушієм, тож записуються лише позначка завершення та логи агента).
+
+        Args:
+            run_id: Simulation run ID (ID запуску симуляції)
+            metrics: Full metrics series of the run (Повний ряд метрик запуску)
+            agent_logs: Replaces the collected agent logs if given (Замінює зібрані логи агента, якщо задано)
+        """
+        with self._lock:
+            run = self._runs.get(run_id)
+            if agent_logs is None:
+                agent_logs = list(run.agent_logs) if run is not None else []
+            timings = run.timings if run is not None else None
+        completed_at = save_simulation_run_log(run_id, agent_logs)
+        with self._lock:
+            self._runs[run_id] = RegisteredRun(run_id, list(metrics), list(agent_logs), True, completed_at, timings)
+            self._runs.move_to_end(run_id)
+            self._evict()
+
+    def get(self, run_id: Optional[str] = None) -> Optional[RegisteredRun]:
+        """Find a run by ID, or the latest completed run if ID is None (Знайти запуск за ID або останній завершений, якщо ID не задано)."""
+        if run_id is None:
+            run_id = get_latest_completed_simulation_run_id()
+            if run_id is None:
+                return None
+        stored = get_simulation_run_log(run_id)
+        with self._lock:
+            local = self._runs.get(run_id)
+            if local is not None and (stored is None or local.completed_at == stored.completed_at):
+                # Run in progress here, or an up-to-date copy (Запуск виконується тут або копія актуальна)
+                local.last_used = time.monotonic()
+                self._runs.move_to_end(run_id)
+                return local
+        if stored is None:
+            return None
+
+        # Completed elsewhere or changed since: reload from the database (Завершений в іншому процесі або змінений: перечитати з бази даних)
+        run = RegisteredRun(
+            run_id,
+            metrics=get_simulation_metrics_by_run_id(run_id),
+            agent_logs=json.loads(stored.agent_logs),
+            completed=True,
+            completed_at=stored.completed_at,
+        )
+        with self._lock:
+            self._runs[run_id] = run
+            self._runs.move_to_end(run_id)
+            self._evict()
+        return run
+
+    @property
+    def latest_run_id(self) -> Optional[str]:
+        """ID of the latest completed run (ID останнього завершеного запуску)."""
+        return get_latest_completed_simulation_run_id()
+
+    def clear(self) -> None:
+        """Forget all runs in this process and in the database (Забути всі запуски в цьому процесі та в базі даних)."""
+        with self._lock:
+            self._runs.clear()
+        clear_simulation_run_logs()
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def _evict(self) -> None:
+        """
+        Bound the local copy; caller holds the lock (Обмежити локальну копію; викликач тримає блокування).
+
+        Least recently used completed runs go first beyond the limit, since they can be reloaded. Unfinished runs never
+        complete when cancelled, failed or streamed, so they are dropped once idle for `stale_seconds` and the oldest ones
+        also go when more than `max_runs` of them are kept (Найдавніше використані завершені запуски видаляються першими
+        понад ліміт, бо їх можна перечитати. Незавершені запуски ніколи не завершуються при скасуванні, помилці або
+        потоковій передачі, тож вони видаляються після простою `stale_seconds`, а найстаріші - також, коли їх більше за `max_runs`).
+        """
+        for run_id in list(self._runs):
+            if len(self._runs) <= self.max_runs:
+                break
+            if self._runs[run_id].completed:
+                del self._runs[run_id]
+        idle_since = time.monotonic() - self.stale_seconds
+        unfinished = [run_id for run_id, run in self._runs.items() if not run.completed]
+        for position, run_id in enumerate(unfinished):
+            if position < len(unfinished) - self.max_runs or (self.stale_seconds > 0 and self._runs[run_id].last_used < idle_since):
+                del self._runs[run_id]
+
+
+# Process-wide registry (Реєстр на процес)
+run_registry = SimulationRunRegistry()
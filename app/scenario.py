@@ -0,0 +1,136 @@
+"""
+Scenario compilation for scripted simulation runs (Компіляція сценаріїв для скриптових запусків симуляції).
+A scenario of scripted events, rate-based generators and intensity phases is compiled once into a schedule indexed by day,
+with every distinct goal classified by the agent a single time, so the simulation loop does no string matching
+(Сценарій із запланованих подій, генераторів за частотою та фаз інтенсивності один раз компілюється в розклад з індексом
+за днем, а кожна окрема ціль класифікується агентом лише раз, тож цикл симуляції не зіставляє рядків).
+"""
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.agent_logic import analyze_goal, rule_index
+from app.agent_rules import RuleIndex
+from app.models import ResourceType, SimulationRunRequest, SimulationScenario
+from app.simulation import generate_event_goal
+
+
+@dataclass(frozen=True)
+class ScheduledGoal:
+    """Goal with its cached agent classification (Ціль із кешованою класифікацією агента)."""
+    goal: str
+    deltas: Dict[ResourceType, int]
+    logs: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ScenarioSchedule:
+    """Compiled scenario: per-day intensities and goals, position 0 is day 1 (Скомпільований сценарій: щоденні інтенсивності та цілі, позиція 0 - це день 1)."""
+    name: str
+    goals: Tuple[ScheduledGoal, ...]
+    day_goals: Tuple[Tuple[int, ...], ...]
+    day_intensities: Tuple[str, ...]
+    # Serialized scenario the schedule was compiled from, stored with the run (Серіалізований сценарій, з якого скомпільовано розклад, зберігається із запуском)
+    payload: str
+
+    @property
+    def days(self) -> int:
+        """Number of compiled days (Кількість скомпільованих днів)."""
+        return len(self.day_intensities)
+
+    def intensity_for(self, day: int) -> str:
+        """Intensity in effect on a day (Інтенсивність, що діє в певний день)."""
+        return self.day_intensities[day - 1]
+
+    def goals_for(self, day: int) -> Tuple[ScheduledGoal, ...]:
+        """Goals of a day in firing order (Цілі дня в порядку спрацювання)."""
+        goals = self.goals
+        return tuple(goals[index] for index in self.day_goals[day - 1])
+
+
+def _day_intensities(scenario: SimulationScenario, days: int, intensity: str) -> List[str]:
+    """Expand phases into one intensity per day (Розгорнути фази в інтенсивність для кожного дня)."""
+    intensities = [intensity] * days
+    for phase in sorted(scenario.phases, key=lambda p: p.start_day):
+        for day in range(phase.start_day, days + 1):
+            intensities[day - 1] = phase.intensity
+    return intensities
+
+
+@lru_cache(maxsize=32)
+def _compile(payload: str, days: int, intensity: str, seed: int, rules: RuleIndex) -> ScenarioSchedule:
+    """
+    Compile a serialized scenario; cached so repeated runs share one schedule (Скомпілювати серіалізований сценарій; кешується, тож повторні запуски ділять один розклад).
+    The rule table is part of the cache key, so a newly installed table recompiles (Таблиця правил входить у ключ кешу, тож нова встановлена таблиця перекомпілюється).
+    """
+    scenario = SimulationScenario.model_validate_json(payload)
+    rng = random.Random(seed)
+    intensities = _day_intensities(scenario, days, intensity)
+    scripted: Dict[int, List[str]] = {}
+    for event in scenario.events:
+        if event.day <= days:
+            scripted.setdefault(event.day, []).append(event.goal)
+
+    goal_index: Dict[str, int] = {}
+    goals: List[ScheduledGoal] = []
+
+    def index_of(goal: str) -> int:
+        """Register a goal once, classifying it on first sight (Зареєструвати ціль один раз, класифікувавши її при першій появі)."""
+        if goal not in goal_index:
+            deltas, logs = analyze_goal(goal, capture_logs=True, rules=rules)
+            goal_index[goal] = len(goals)
+            goals.append(ScheduledGoal(goal=goal, deltas=deltas, logs=tuple(logs)))
+        return goal_index[goal]
+
+    day_goals: List[Tuple[int, ...]] = []
+    for day in range(1, days + 1):
+        fired: List[str] = []
+        if scenario.intensity_events:
+            built_in = generate_event_goal(intensities[day - 1], day, rng)
+            if built_in:
+                fired.append(built_in)
+        fired.extend(scripted.get(day, ()))
+        for generator in scenario.generators:
+            active = generator.start_day <= day and (generator.end_day is None or day <= generator.end_day)
+            if active and (day - generator.start_day) % generator.every == 0 and rng.random() < generator.probability:
+                fired.append(rng.choice(generator.goals))
+        day_goals.append(tuple(index_of(goal) for goal in fired))
+
+    return ScenarioSchedule(
+        name=scenario.name,
+        goals=tuple(goals),
+        day_goals=tuple(day_goals),
+        day_intensities=tuple(intensities),
+        payload=payload,
+    )
+
+
+def compile_scenario(scenario: SimulationScenario, days: int, intensity: str, seed: int) -> ScenarioSchedule:
+    """
+    Compile a scenario into a day-indexed schedule (Скомпілювати сценарій у розклад з індексом за днем).
+
+    Random choices (built-in intensity events and generators) are drawn here from the scenario seed, or the run seed if the
+    scenario has none, so the same scenario yields the same schedule in every run
+    (Випадкові вибори (вбудовані події інтенсивності та генератори) робляться тут із зерна сценарію або зерна запуску,
+    якщо сценарій його не має, тож той самий сценарій дає однаковий розклад у кожному запуску).
+
+    Args:
+        scenario: Scenario definition (Опис сценарію)
+        days: Number of days to compile (Кількість днів для компіляції)
+        intensity: Intensity before the first phase (Інтенсивність до першої фази)
+        seed: Run seed, used when the scenario has no own seed (Зерно запуску, використовується якщо сценарій не має власного)
+
+    Returns:
+        ScenarioSchedule covering days 1..days (ScenarioSchedule для днів 1..days)
+    """
+    scenario_seed = scenario.seed if scenario.seed is not None else seed
+    return _compile(scenario.model_dump_json(), days, intensity, scenario_seed, rule_index())
+
+
+def schedule_for_request(request: SimulationRunRequest, seed: int) -> Optional[ScenarioSchedule]:
+    """Compile the scenario of a run request, if any (Скомпілювати сценарій запиту на запуск, якщо він є)."""
+    if request.scenario is None:
+        return None
+    return compile_scenario(request.scenario, request.days, request.intensity, seed)
@@ -5,91 +5,237 @@ Implements automated scenario generation and agent response simulation (Реал
 
 import random
 import copy
+import json
+import os
+import secrets
+import threading
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional, Callable
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional, Callable, Iterator
 
-from app.models import SystemState, SimulationMetrics, SimulationRunRequest
-from app.agent_logic import run_mock_analysis
-from app.analytics import calculate_metrics_from_state
+import numpy as np
+
+from app.models import SystemState, SimulationMetrics, SimulationRunRequest, SimulationDayRecord, SimulationScenario
+from app.agent_logic import analyze_goal, rule_index
+from app.engine_state import EngineState, s_index_series, c_index_series
+from app.run_registry import run_registry
+from app.timing import TIMINGS_ENABLED, RunTimings
 from app.initial_state import INITIAL_STATE
-from app.repository import read_system_state, write_system_state, save_simulation_metric
+from app.db_models import SimulationCheckpointRow
+from app.repository import (
+    read_system_state,
+    write_system_state,
+    save_simulation_run,
+    get_simulation_run,
+    get_simulation_run_options,
+    update_simulation_run_days,
+    save_simulation_checkpoint,
+    get_latest_simulation_checkpoint,
+    get_simulation_metrics_by_run_id,
+    SimulationMetricsWriter,
+)
+from app.simulation_events import (
+    SimulationEventChannel,
+    SimulationEventType,
+    RunStartEvent,
+    DayStartEvent,
+    OpsEvent,
+    AgentActionEvent,
+    NoEventEvent,
+    DegradationEvent,
+    MetricsEvent,
+    RunEndEvent,
+    format_degradation_details,
+    text_log_sink,
+)
+
+if TYPE_CHECKING:
+    from app.scenario import ScenarioSchedule
+
+
+# Event categories based on intensity (Категорії подій на основі інтенсивності)
+INTENSITY_EVENTS: Dict[str, List[str]] = {
+    "low": [
+        "Покращити ефективність процесів",
+        "Оптимізувати використання ресурсів",
+        "Підвищити якість сервісу",
+    ],
+    "medium": [
+        "Інновації в технологіях",
+        "Партнерство з клієнтами",
+        "Управління ризиками",
+        "Освіта та навчання персоналу",
+        "Екологічна ефективність",
+    ],
+    "high": [
+        "Цифрова трансформація",
+        "Екологічна переробка",
+        "Клієнтський сервіс",
+        "Інновації та автоматизація",
+        "Партнерство та екосистема",
+        "Ризики та безпека",
+        "Освіта та тренінги",
+    ],
+}
+
+# Event period in days: low - every 3rd day, medium - every 2nd, high - every day (Період подій у днях: low - кожен 3-й день, medium - кожен 2-й, high - щодня)
+EVENT_PERIODS: Dict[str, int] = {"low": 3, "medium": 2, "high": 1}
+
+# Intensity multipliers for (operations, alerts) (Множники інтенсивності для (операцій, алертів))
+INTENSITY_MULTIPLIERS: Dict[str, Tuple[float, float]] = {
+    "low": (0.5, 0.3),
+    "medium": (1.0, 0.7),
+    "high": (2.0, 1.5),
+}
+
+# Entropy degradation rate in points per day (Швидкість деградації ентропії в пунктах на день)
+DEGRADATION_RATES: Dict[str, float] = {
+    "low": 0.5,    # 0.5% per day (0.5% на день)
+    "medium": 1.0,  # 1.0% per day (1.0% на день)
+    "high": 2.0,    # 2.0% per day (2.0% на день)
+}
+
+
+# Save a checkpoint every N days in addition to the final one, 0 disables intermediate checkpoints
+# (Зберігати контрольну точку кожні N днів на додачу до фінальної, 0 вимикає проміжні точки)
+CHECKPOINT_EVERY = max(0, int(os.getenv("SIMULATION_CHECKPOINT_EVERY", "0")))
+
+# Live-state runs share one snapshot: the first to start saves the live state and the last to finish restores it; the
+# lock is held only around these steps, never while a consumer reads records (Запуски з живим станом ділять один знімок:
+# перший запуск зберігає живий стан, а останній відновлює його; блокування утримується лише на цих кроках, а не поки
+# споживач читає записи)
+_live_state_lock = threading.Lock()
+_live_state_runs = 0
+_live_state_snapshot: Optional[SystemState] = None
+
+
+def _enter_live_state(initial_state: Optional[SystemState]) -> None:
+    """
+    Register a live-state run, saving the state to restore if no other one is active (Зареєструвати запуск із живим станом, зберігши стан для відновлення, якщо інших активних немає).
+
+    Args:
+        initial_state: State to restore instead of the stored one, used only by the first run (Стан для відновлення замість збереженого, враховується лише для першого запуску)
+    """
+    global _live_state_runs, _live_state_snapshot
+    with _live_state_lock:
+        if _live_state_runs == 0:
+            _live_state_snapshot = read_system_state() if initial_state is None else copy.deepcopy(initial_state)
+        _live_state_runs += 1
+
+
+def _leave_live_state() -> None:
+    """Unregister a live-state run; the last one restores the saved state (Зняти з обліку запуск із живим станом; останній відновлює збережений стан)."""
+    global _live_state_runs, _live_state_snapshot
+    with _live_state_lock:
+        _live_state_runs -= 1
+        if _live_state_runs == 0 and _live_state_snapshot is not None:
+            write_system_state(_live_state_snapshot)
+            _live_state_snapshot = None
+
 
+@dataclass
+class SimulationCheckpoint:
+    """Engine state needed to continue a run after `day` (Стан рушія, потрібний для продовження запуску після дня `day`)."""
+    day: int
+    state: SystemState
+    total_ops: int
+    total_alerts: int
+    adaptation_start_day: Optional[int]
+    agent_actions: int
+    rng_state: tuple
 
-# In-memory storage for simulation metrics history (In-memory сховище для історії метрик симуляції)
-_simulation_history: List[SimulationMetrics] = []
-_agent_logs_history: List[str] = []
+    def to_row(self, simulation_run_id: str) -> SimulationCheckpointRow:
+        """Serialize for storage (Серіалізувати для збереження)."""
+        version, internal, gauss_next = self.rng_state
+        return SimulationCheckpointRow(
+            simulation_run_id=simulation_run_id,
+            day=self.day,
+            state_json=self.state.model_dump_json(),
+            total_ops=self.total_ops,
+            total_alerts=self.total_alerts,
+            adaptation_start_day=self.adaptation_start_day,
+            agent_actions=self.agent_actions,
+            rng_state=json.dumps([version, list(internal), gauss_next]),
+        )
+
+    @classmethod
+    def from_row(cls, row: SimulationCheckpointRow) -> "SimulationCheckpoint":
+        """Restore from storage (Відновити зі сховища)."""
+        version, internal, gauss_next = json.loads(row.rng_state)
+        return cls(
+            day=row.day,
+            state=SystemState.model_validate_json(row.state_json),
+            total_ops=row.total_ops,
+            total_alerts=row.total_alerts,
+            adaptation_start_day=row.adaptation_start_day,
+            agent_actions=row.agent_actions,
+            rng_state=(version, tuple(internal), gauss_next),
+        )
 
 
 def clear_simulation_history() -> None:
-    """Clear simulation metrics history (Очистити історію метрик симуляції)."""
-    global _simulation_history, _agent_logs_history
-    _simulation_history = []
-    _agent_logs_history = []
+    """Clear simulation metrics history of all runs (Очистити історію метрик симуляції всіх запусків)."""
+    run_registry.clear()
+
+
+def get_simulation_history(simulation_run_id: Optional[str] = None) -> List[SimulationMetrics]:
+    """Get metrics of a run, or of the latest completed run (Отримати метрики запуску або останнього завершеного запуску)."""
+    run = run_registry.get(simulation_run_id)
+    return list(run.metrics) if run is not None else []
 
 
-def get_simulation_history() -> List[SimulationMetrics]:
-    """Get current simulation metrics history (Отримати поточну історію метрик симуляції)."""
-    return _simulation_history.copy()
+def set_simulation_history(simulation_run_id: str, metrics: List[SimulationMetrics], agent_logs: Optional[List[str]] = None) -> None:
+    """Record a finished run and make it the latest one (Записати завершений запуск і зробити його останнім)."""
+    run_registry.complete(simulation_run_id, metrics, agent_logs)
 
 
-def get_agent_logs_history() -> List[str]:
-    """Get agent logs from last simulation (Отримати логи агента з останньої симуляції)."""
-    return _agent_logs_history.copy()
+def get_agent_logs_history(simulation_run_id: Optional[str] = None) -> List[str]:
+    """Get agent logs of a run, or of the latest completed run (Отримати логи агента запуску або останнього завершеного запуску)."""
+    run = run_registry.get(simulation_run_id)
+    return list(run.agent_logs) if run is not None else []
 
 
-def generate_event_goal(intensity: str, day: int) -> str:
+def get_simulation_timings(simulation_run_id: Optional[str] = None) -> Optional[Dict[str, Dict[str, float]]]:
+    """Get phase timings of a run timed in this process, or of the latest completed run (Отримати час фаз запуску, виміряного в цьому процесі, або останнього завершеного запуску)."""
+    run = run_registry.get(simulation_run_id)
+    return run.timings if run is not None else None
+
+
+def new_simulation_seed() -> int:
+    """Draw a fresh 32-bit seed for a run that did not specify one (Згенерувати нове 32-бітне зерно для запуску без заданого зерна)."""
+    return secrets.randbits(32)
+
+
+def generate_event_goal(intensity: str, day: int, rng: Optional[random.Random] = None) -> str:
     """
     Generate a simulated event/goal based on intensity and day (Згенерувати симульовану подію/ціль на основі інтенсивності та дня).
     
     Args:
         intensity: Event intensity level ("low", "medium", "high") (Рівень інтенсивності подій)
         day: Current simulation day (Поточний день симуляції)
+        rng: Per-run random generator, falls back to the global random module (Генератор випадкових чисел запуску, за замовчуванням глобальний модуль random)
     
     Returns:
         Goal string for agent processing (Рядок цілі для обробки агентом)
     """
-    # Event categories based on intensity (Категорії подій на основі інтенсивності)
-    if intensity == "low":
-        events = [
-            "Покращити ефективність процесів",
-            "Оптимізувати використання ресурсів",
-            "Підвищити якість сервісу",
-        ]
-        # Lower frequency (Нижча частота)
-        if day % 3 != 0:
-            return None  # No event this day (Немає події цього дня)
-    elif intensity == "medium":
-        events = [
-            "Інновації в технологіях",
-            "Партнерство з клієнтами",
-            "Управління ризиками",
-            "Освіта та навчання персоналу",
-            "Екологічна ефективність",
-        ]
-        # Medium frequency (Середня частота)
-        if day % 2 != 0:
-            return None
-    else:  # high
-        events = [
-            "Цифрова трансформація",
-            "Екологічна переробка",
-            "Клієнтський сервіс",
-            "Інновації та автоматизація",
-            "Партнерство та екосистема",
-            "Ризики та безпека",
-            "Освіта та тренінги",
-        ]
-        # High frequency - event every day (Висока частота - подія кожного дня)
-    
-    return random.choice(events)
+    # Unknown intensities behave like "high" (Невідомі інтенсивності поводяться як "high")
+    if intensity not in INTENSITY_EVENTS:
+        intensity = "high"
+    
+    # Skip days outside the event period (Пропустити дні поза періодом подій)
+    if day % EVENT_PERIODS[intensity] != 0:
+        return None  # No event this day (Немає події цього дня)
+    
+    return (rng or random).choice(INTENSITY_EVENTS[intensity])
 
 
 def simulate_operations_and_alerts(
     intensity: str,
     day: int,
     base_ops: int = 100,
-    base_alerts: int = 5
+    base_alerts: int = 5,
+    rng: Optional[random.Random] = None
 ) -> Tuple[int, int]:
     """
     Simulate operations and alerts count for a day (Симулювати кількість операцій та алертів за день).
@@ -99,22 +245,17 @@ def simulate_operations_and_alerts(
         day: Current simulation day (Поточний день симуляції)
         base_ops: Base number of operations per day (Базова кількість операцій на день)
         base_alerts: Base number of alerts per day (Базова кількість алертів на день)
+        rng: Per-run random generator, falls back to the global random module (Генератор випадкових чисел запуску, за замовчуванням глобальний модуль random)
     
     Returns:
         Tuple of (operations_count, alerts_count) (Кортеж (кількість_операцій, кількість_алертів))
     """
-    # Intensity multipliers (Множники інтенсивності)
-    intensity_multipliers = {
-        "low": (0.5, 0.3),
-        "medium": (1.0, 0.7),
-        "high": (2.0, 1.5),
-    }
-    
-    ops_mult, alerts_mult = intensity_multipliers.get(intensity, (1.0, 1.0))
+    rng = rng or random
+    ops_mult, alerts_mult = INTENSITY_MULTIPLIERS.get(intensity, (1.0, 1.0))
     
     # Add some randomness (Додати випадковість)
-    ops_variation = random.uniform(0.8, 1.2)
-    alerts_variation = random.uniform(0.5, 1.5)
+    ops_variation = rng.uniform(0.8, 1.2)
+    alerts_variation = rng.uniform(0.5, 1.5)
     
     # Calculate operations (Обчислити операції)
     ops = int(base_ops * ops_mult * ops_variation)
@@ -125,12 +266,65 @@ def simulate_operations_and_alerts(
     alerts = int(base_alerts * alerts_mult * alerts_variation)
     
     # Occasional spike (Випадковий сплеск)
-    if random.random() < 0.1:  # 10% chance (10% ймовірність)
-        alerts = int(alerts * random.uniform(2.0, 4.0))
+    if rng.random() < 0.1:  # 10% chance (10% ймовірність)
+        alerts = int(alerts * rng.uniform(2.0, 4.0))
     
     return max(0, ops), max(0, alerts)
 
 
+def simulate_tick_operations_and_alerts(
+    intensity: str,
+    ticks_per_day: int,
+    base_ops: int = 100,
+    base_alerts: int = 5,
+    rng: Optional[random.Random] = None
+) -> Tuple[int, int, int]:
+    """
+    Simulate one day of operations and alerts tick by tick (Симулювати день операцій та алертів по тактах).
+    
+    Each tick draws its share of the daily volume into running counters; a burst packs a day-scale surge of alerts into a
+    single tick with the same expected frequency as the daily spike. Only the day totals leave the function
+    (Кожен такт додає свою частку денного обсягу до накопичувальних лічильників; сплеск зосереджує денний обсяг алертів
+    в одному такті з тією ж очікуваною частотою, що й денний сплеск. Назовні повертаються лише підсумки дня).
+    
+    Args:
+        intensity: Event intensity level (Рівень інтенсивності подій)
+        ticks_per_day: Number of ticks in a day (Кількість тактів на день)
+        base_ops: Base number of operations per day (Базова кількість операцій на день)
+        base_alerts: Base number of alerts per day (Базова кількість алертів на день)
+        rng: Per-run random generator, falls back to the global random module (Генератор випадкових чисел запуску, за замовчуванням глобальний модуль random)
+    
+    Returns:
+        Tuple of (operations_count, alerts_count, peak_tick_alerts) (Кортеж (кількість_операцій, кількість_алертів, пік_алертів_за_такт))
+    """
+    draw = (rng or random).random
+    ops_mult, alerts_mult = INTENSITY_MULTIPLIERS.get(intensity, (1.0, 1.0))
+    ops_rate = base_ops * ops_mult / ticks_per_day
+    alerts_rate = base_alerts * alerts_mult / ticks_per_day
+    burst_size = base_alerts * alerts_mult
+    burst_chance = 0.1 / ticks_per_day
+    
+    ops = 0.0
+    alerts = 0.0
+    peak = 0.0
+    for _ in range(ticks_per_day):
+        ops += ops_rate * (0.8 + 0.4 * draw())
+        tick_alerts = alerts_rate * (0.5 + draw())
+        if draw() < burst_chance:
+            tick_alerts += burst_size * (1.0 + 2.0 * draw())
+        alerts += tick_alerts
+        if tick_alerts > peak:
+            peak = tick_alerts
+    return int(ops), int(alerts), int(peak)
+
+
+def _simulate_day_volume(intensity: str, day: int, ticks_per_day: int, rng: random.Random) -> Tuple[int, int, Optional[int]]:
+    """Operations, alerts and tick peak of a day at the run's resolution (Операції, алерти та пік такту дня з роздільністю запуску)."""
+    if ticks_per_day == 1:
+        return (*simulate_operations_and_alerts(intensity, day, rng=rng), None)
+    return simulate_tick_operations_and_alerts(intensity, ticks_per_day, rng=rng)
+
+
 def apply_entropy_degradation(state: SystemState, intensity: str, log_callback: Optional[Callable[[str], None]] = None) -> SystemState:
     """
     Apply entropy degradation to resources when agent is not active (Застосувати деградацію ентропії до ресурсів, коли агент неактивний).
@@ -148,13 +342,7 @@ def apply_entropy_degradation(state: SystemState, intensity: str, log_callback:
     new_state = copy.deepcopy(state)
     
     # Degradation rate based on intensity (Швидкість деградації на основі інтенсивності)
-    degradation_rates = {
-        "low": 0.5,    # 0.5% per day (0.5% на день)
-        "medium": 1.0,  # 1.0% per day (1.0% на день)
-        "high": 2.0,    # 2.0% per day (2.0% на день)
-    }
-    
-    degradation = degradation_rates.get(intensity, 1.0)
+    degradation = DEGRADATION_RATES.get(intensity, 1.0)
     
     degraded_resources = []
     
@@ -163,44 +351,126 @@ def apply_entropy_degradation(state: SystemState, intensity: str, log_callback:
         old_value = resource.value
         # Degrade resource value (Деградувати значення ресурсу)
         resource.value = max(0.0, resource.value - degradation)
-        if old_value != resource.value:
+        if log_callback and old_value != resource.value:
             degraded_resources.append((resource.type.value, old_value, resource.value))
     
     # Log degradation details if callback provided (Залогувати деталі деградації, якщо надано callback)
     if log_callback:
-        if degraded_resources:
-            log_callback(f"⚠️ Entropy degradation applied: -{degradation}% to all resources")
-            log_callback(f"📉 Resources degraded ({len(degraded_resources)} total):")
-            # Show all resources with changes (Показати всі ресурси зі змінами)
-            for res_type, old_val, new_val in degraded_resources:
-                change = new_val - old_val
-                percentage = (new_val / old_val * 100) if old_val > 0 else 0
-                log_callback(f"   • {res_type}: {old_val:.1f} → {new_val:.1f} ({change:+.1f}, {percentage:.1f}% of original)")
-            
-            # Show most affected resources (Показати найбільш постраждалі ресурси)
-            if len(degraded_resources) > 3:
-                sorted_by_impact = sorted(degraded_resources, key=lambda x: x[1] - x[2], reverse=True)
-                log_callback(f"🔴 Most affected resources:")
-                for res_type, old_val, new_val in sorted_by_impact[:3]:
-                    impact = old_val - new_val
-                    log_callback(f"   • {res_type}: lost {impact:.1f} points (from {old_val:.1f} to {new_val:.1f})")
-        else:
-            log_callback(f"⚠️ Entropy degradation: -{degradation}% (all resources already at minimum 0.0)")
-            log_callback(f"   System has reached minimum resource levels - no further degradation possible")
+        for line in format_degradation_details(degradation, degraded_resources):
+            log_callback(line)
     
     return new_state
 
 
-def run_simulation(
+@dataclass
+class ControlForecast:
+    """Day-by-day outcome of a control-group stretch, arrays are indexed by day offset (Результат відрізку контрольної групи по днях, масиви індексуються зсувом дня)."""
+    values: np.ndarray
+    ops: List[int]
+    alerts: List[int]
+    peak_tick_alerts: List[Optional[int]]
+    s_index: np.ndarray
+    c_index: np.ndarray
+    a_index: float
+    total_ops: int
+    total_alerts: int
+
+
+def forecast_control_days(
+    engine: EngineState,
+    intensity: str,
+    t_market: float,
+    start_day: int,
+    end_day: int,
+    rng: random.Random,
+    total_ops: int = 0,
+    total_alerts: int = 0,
+    ticks_per_day: int = 1
+) -> ControlForecast:
+    """
+    Fast-forward the no-agent simulation over days start_day + 1 .. end_day without stepping the engine (Прокрутити симуляцію без агента на дні start_day + 1 .. end_day без покрокового рушія).
+    
+    Without the agent resources only degrade, so day d holds max(0, v0 - rate * d); the values are built with a running
+    sum, which rounds exactly like repeated subtraction, and S/C are evaluated for all days at once. The random stream is
+    replayed draw by draw, goals included, so results and the generator state match the looped engine exactly
+    (Без агента ресурси лише деградують, тож у день d значення дорівнює max(0, v0 - rate * d); значення будуються накопиченою
+    сумою, яка округлюється так само, як повторне віднімання, а S/C обчислюються для всіх днів одразу. Випадковий потік
+    відтворюється крок за кроком разом із цілями, тож результати і стан генератора точно збігаються з покроковим рушієм).
+    
+    Args:
+        engine: State after start_day, left untouched (Стан після дня start_day, не змінюється)
+        intensity: Event intensity level (Рівень інтенсивності подій)
+        t_market: Market change time in days (Час змін на ринку в днях)
+        start_day: Last day already simulated (Останній уже симульований день)
+        end_day: Last day to forecast (Останній день прогнозу)
+        rng: Run's random generator, advanced as the loop would advance it (Генератор запуску, просувається так само, як у циклі)
+        total_ops: Operations accumulated up to start_day (Операції, накопичені до дня start_day)
+        total_alerts: Alerts accumulated up to start_day (Алерти, накопичені до дня start_day)
+        ticks_per_day: Operations and alerts resolution (Роздільність операцій та алертів)
+    
+    Returns:
+        ControlForecast with values of shape (days, resources) and per-day indices (ControlForecast зі значеннями розміром (дні, ресурси) та щоденними індексами)
+    """
+    days = end_day - start_day
+    degradation = DEGRADATION_RATES.get(intensity, 1.0)
+    
+    # Same draw order as the loop: the goal on event days, then operations and alerts (Той самий порядок вибірок, що й у циклі: ціль у дні подій, потім операції та алерти)
+    ops: List[int] = []
+    alerts: List[int] = []
+    peaks: List[Optional[int]] = []
+    for day in range(start_day + 1, end_day + 1):
+        generate_event_goal(intensity, day, rng)
+        daily_ops, daily_alerts, peak = _simulate_day_volume(intensity, day, ticks_per_day, rng)
+        ops.append(daily_ops)
+        alerts.append(daily_alerts)
+        peaks.append(peak)
+    
+    steps = np.empty((days + 1, len(engine.values)))
+    steps[0] = engine.values
+    steps[1:] = -degradation
+    values = np.maximum(np.cumsum(steps, axis=0)[1:], 0.0)
+    
+    cumulative_ops = total_ops + np.cumsum(np.array(ops, dtype=np.int64))
+    cumulative_alerts = total_alerts + np.cumsum(np.array(alerts, dtype=np.int64))
+    return ControlForecast(
+        values=values,
+        ops=ops,
+        alerts=alerts,
+        peak_tick_alerts=peaks,
+        s_index=s_index_series(engine.layout, values, engine.culture_value()),
+        c_index=c_index_series(cumulative_ops, cumulative_alerts),
+        # Adaptation never starts without the agent (Без агента адаптація не починається)
+        a_index=engine.metrics(t_adapt=1.0, t_market=t_market)[2],
+        total_ops=int(cumulative_ops[-1]) if days else total_ops,
+        total_alerts=int(cumulative_alerts[-1]) if days else total_alerts,
+    )
+
+
+def iter_simulation(
     days: int = 30,
     intensity: str = "high",
     t_market: float = 30.0,
     initial_state: Optional[SystemState] = None,
     use_agent: bool = True,
-    log_callback: Optional[Callable[[str], None]] = None
-) -> List[SimulationMetrics]:
+    log_callback: Optional[Callable[[str], None]] = None,
+    in_memory: bool = False,
+    seed: Optional[int] = None,
+    simulation_run_id: Optional[str] = None,
+    events: Optional[SimulationEventChannel] = None,
+    resume_from: Optional[SimulationCheckpoint] = None,
+    include_state_delta: bool = False,
+    schedule: Optional["ScenarioSchedule"] = None,
+    ticks_per_day: int = 1,
+    collect_timings: Optional[bool] = None,
+    start_state: Optional[SystemState] = None
+) -> Iterator[SimulationDayRecord]:
     """
-    Run automated simulation and generate time series of metrics (Запустити автоматичну симуляцію та згенерувати часовий ряд метрик).
+    Run automated simulation lazily, yielding one record per simulated day (Ліниво виконати автоматичну симуляцію, повертаючи по запису на кожен симульований день).
+    
+    Nothing is accumulated per day, so memory stays flat for any number of days; the in-memory metrics history is left to
+    run_simulation. If the consumer stops early, metrics produced so far are still saved and the live state is restored
+    (Нічого не накопичується по днях, тож пам'ять не зростає з кількістю днів; історію метрик у пам'яті веде run_simulation.
+    Якщо споживач зупиняється раніше, уже отримані метрики все одно зберігаються, а живий стан відновлюється).
     
     Args:
         days: Number of simulation days (Кількість днів симуляції)
@@ -208,191 +478,495 @@ def run_simulation(
         t_market: Market change time in days (Час змін на ринку в днях)
         initial_state: Starting system state, if None uses current DB state (Початковий стан системи, якщо None - використовує поточний стан БД)
         use_agent: If True, agent responds to events; if False, entropy degrades resources (Якщо True, агент реагує на події; якщо False, ентропія деградує ресурси)
-        log_callback: Optional callback function to send logs in real-time (Опціональна функція зворотного виклику для відправки логів в реальному часі)
-    
-    Returns:
-        List of SimulationMetrics for each simulation step (Список SimulationMetrics для кожного кроку симуляції)
+        log_callback: Optional callback function to send logs in real-time; subscribed as a text sink to all events (Опціональна функція зворотного виклику для відправки логів в реальному часі; підписується як текстовий обробник на всі події)
+        in_memory: If True, keep the simulated state in memory only and persist nothing but the metrics; the live system state is never read or overwritten (Якщо True, тримати симульований стан лише в пам'яті та зберігати тільки метрики; живий стан системи не читається і не перезаписується)
+        seed: Seed for the run's own random generator; a fresh one is drawn and stored if None (Зерно для власного генератора запуску; якщо None - генерується нове і зберігається)
+        simulation_run_id: Identifier to store the run under, generated if None (Ідентифікатор для збереження запуску, генерується якщо None)
+        events: Channel that receives structured events; only subscribed event types are built (Канал для структурованих подій; створюються лише події з підписниками)
+        resume_from: Checkpoint to continue from for `days` more days; the run row must already exist (Контрольна точка, з якої продовжити ще на `days` днів; запис запуску має вже існувати)
+        include_state_delta: If True, records carry per-resource value changes of the day (Якщо True, записи містять зміни значень ресурсів за день)
+        schedule: Compiled scenario providing each day's intensity and goals instead of the built-in event rules; it must cover days 1..days (Скомпільований сценарій, що задає інтенсивність і цілі кожного дня замість вбудованих правил; має охоплювати дні 1..days)
+        ticks_per_day: Draw operations and alerts in this many ticks per day; only daily rollups are recorded (Генерувати операції та алерти за стільки тактів на день; записуються лише денні підсумки)
+        collect_timings: Time engine phases and store the summary in the run registry; None follows SIMULATION_TIMINGS; time spent by the consumer between records is not counted (Вимірювати час фаз рушія та зберегти зведення в реєстрі запусків; None - за SIMULATION_TIMINGS; час споживача між записами не враховується)
+        start_state: State to simulate from instead of INITIAL_STATE, e.g. a large organization model (Стан, з якого симулювати замість INITIAL_STATE, напр. велика модель організації)
+    
+    Yields:
+        SimulationDayRecord for day 0 (unless resuming) and every simulated day (SimulationDayRecord для дня 0 (якщо це не продовження) та кожного симульованого дня)
     """
-    global _simulation_history
-    
-    # Clear previous history (Очистити попередню історію)
-    clear_simulation_history()
-    global _agent_logs_history
-    _agent_logs_history = []
-    
-    # Initialize starting state (Ініціалізувати початковий стан)
-    if initial_state is None:
-        current_state = read_system_state()
-    else:
-        current_state = copy.deepcopy(initial_state)
-    
-    # Reset to initial state for clean simulation (Скинути до початкового стану для чистої симуляції)
-    simulation_state = copy.deepcopy(INITIAL_STATE)
-    write_system_state(simulation_state)
+    # Start from the initial state for clean simulation, or continue from a checkpoint (Почати з початкового стану для чистої симуляції або продовжити з контрольної точки)
+    # The loop works on a flat engine state; SystemState is built only when persisted (Цикл працює з плоским станом рушія; SystemState будується лише для збереження)
+    if resume_from is not None:
+        start_state = resume_from.state
+    engine = EngineState.from_state(start_state if start_state is not None else INITIAL_STATE)
+    # In-memory mode never touches the live state, so there is nothing to restore (Режим у пам'яті не торкається живого стану, тож нічого відновлювати)
+    live_state = False
     
     # Generate unique simulation run ID (Згенерувати унікальний ID запуску симуляції)
-    simulation_run_id = str(uuid.uuid4())
+    if simulation_run_id is None:
+        simulation_run_id = str(uuid.uuid4())
+    # Logs and history are kept per run so overlapping runs stay apart (Логи та історія зберігаються окремо для кожного запуску, тож паралельні запуски не змішуються)
+    run_registry.start(simulation_run_id)
+    
+    # Dedicated random stream so concurrent runs never interleave and every run can be replayed
+    # (Окремий випадковий потік, щоб паралельні запуски не перемішувались і кожен запуск можна було відтворити)
+    if seed is None:
+        seed = new_simulation_seed()
+    rng = random.Random(seed)
     
     # Track cumulative statistics (Відстежувати накопичувальну статистику)
     total_ops = 0
     total_alerts = 0
     adaptation_start_day: Optional[int] = None
     agent_actions_count = 0
+    start_day = 0
     
-    metrics_history: List[SimulationMetrics] = []
+    if resume_from is None:
+        save_simulation_run(
+            simulation_run_id, days=days, intensity=intensity, t_market=t_market, use_agent=use_agent, seed=seed,
+            ticks_per_day=ticks_per_day, scenario=schedule.payload if schedule is not None else None
+        )
+    else:
+        # Continue the random stream and counters exactly where the checkpoint left them (Продовжити випадковий потік і лічильники точно з контрольної точки)
+        rng.setstate(resume_from.rng_state)
+        total_ops = resume_from.total_ops
+        total_alerts = resume_from.total_alerts
+        adaptation_start_day = resume_from.adaptation_start_day
+        agent_actions_count = resume_from.agent_actions
+        start_day = resume_from.day
+    end_day = start_day + days
+    degradation = DEGRADATION_RATES.get(intensity, 1.0)
+    
+    def save_checkpoint(day: int) -> None:
+        """Persist engine state after `day` (Зберегти стан рушія після дня `day`)."""
+        checkpoint = SimulationCheckpoint(
+            day=day,
+            state=engine.to_state(),
+            total_ops=total_ops,
+            total_alerts=total_alerts,
+            adaptation_start_day=adaptation_start_day,
+            agent_actions=agent_actions_count,
+            rng_state=rng.getstate(),
+        )
+        save_simulation_checkpoint(checkpoint.to_row(simulation_run_id))
     
-    # Send initial message if callback provided (Відправити початкове повідомлення, якщо надано callback)
+    # Structured events; text is formatted only if someone subscribed (Структуровані події; текст форматується лише за наявності підписника)
+    if events is None:
+        events = SimulationEventChannel()
     if log_callback:
-        log_callback(f"Starting simulation: {days} days, intensity: {intensity}, use_agent: {use_agent}")
-        log_callback(f"Market change time (T_market): {t_market} days")
-        log_callback("=" * 60)
-    
-    # Record initial metrics (Записати початкові метрики)
-    initial_metrics = calculate_metrics_from_state(
-        simulation_state,
-        total_ops=0,
-        alerts_count=0,
-        t_adapt=1.0,
-        t_market=t_market
-    )
-    initial_metric = SimulationMetrics(
-        s_index=initial_metrics[0],
-        c_index=initial_metrics[1],
-        a_index=initial_metrics[2],
-        timestamp=datetime.utcnow()
-    )
-    metrics_history.append(initial_metric)
-    # Save to database (Зберегти в базу даних)
-    save_simulation_metric(initial_metric, simulation_run_id, use_agent, day=0)
-    
-    # Run simulation for each day (Запустити симуляцію для кожного дня)
-    for day in range(1, days + 1):
-        # Send day info if callback provided (Відправити інформацію про день, якщо надано callback)
-        if log_callback:
-            log_callback(f"\n{'='*60}")
-            log_callback(f"Day {day}/{days}")
-            log_callback(f"{'='*60}")
-        
-        # Generate event/goal for this day (Згенерувати подію/ціль для цього дня)
-        event_goal = generate_event_goal(intensity, day)
+        events.subscribe(text_log_sink(log_callback))
+    
+    # Send initial event (Відправити початкову подію)
+    if events.wants(SimulationEventType.RUN_START):
+        events.emit(RunStartEvent(days=days, intensity=intensity, t_market=t_market, use_agent=use_agent, seed=seed))
+    
+    # Buffer for a bulk database write (Буферизувати для масового запису в базу даних)
+    metrics_writer = SimulationMetricsWriter(simulation_run_id, use_agent)
+    
+    # None when disabled, so every phase boundary costs a single check (None, якщо вимкнено, тож кожна межа фази коштує одну перевірку)
+    timings = RunTimings() if (TIMINGS_ENABLED if collect_timings is None else collect_timings) else None
+    # The run keeps the rule table it started with even if a new one is installed meanwhile (Запуск зберігає таблицю правил, з якою почав, навіть якщо тим часом встановлено нову)
+    rules = rule_index()
+    
+    try:
+        if not in_memory:
+            # Save the live state for the end of the run, then reset it (Зберегти живий стан для кінця запуску, потім скинути його)
+            _enter_live_state(initial_state)
+            live_state = True
+            write_system_state(engine.to_state())
         
-        # Simulate operations and alerts (Симулювати операції та алерти)
-        daily_ops, daily_alerts = simulate_operations_and_alerts(intensity, day)
-        total_ops += daily_ops
-        total_alerts += daily_alerts
+        # Record initial metrics unless continuing a run (Записати початкові метрики, якщо це не продовження запуску)
+        if resume_from is None:
+            initial_metrics = engine.metrics(
+                total_ops=0,
+                alerts_count=0,
+                t_adapt=1.0,
+                t_market=t_market
+            )
+            initial_record = SimulationDayRecord(
+                day=0,
+                s_index=initial_metrics[0],
+                c_index=initial_metrics[1],
+                a_index=initial_metrics[2],
+                timestamp=datetime.utcnow()
+            )
+            metrics_writer.add(initial_record.to_metrics(), day=0)
+            yield initial_record
+        data_points = 0 if resume_from is not None else 1
+        remaining_days = range(start_day + 1, end_day + 1)
         
-        if log_callback:
-            log_callback(f"📊 Operations: {daily_ops}, Alerts: {daily_alerts}")
+        # Nobody watches single control-group days: fast-forward them in closed form (Окремі дні контрольної групи ніхто не спостерігає: прокрутити їх за замкненою формулою)
+        if schedule is None and _can_fast_forward(use_agent, adaptation_start_day, events, include_state_delta):
+            if timings is not None:
+                mark = timings.mark()
+            forecast = forecast_control_days(engine, intensity, t_market, start_day, end_day, rng, total_ops, total_alerts, ticks_per_day)
+            s_values = forecast.s_index.tolist()
+            c_values = forecast.c_index.tolist()
+            if timings is not None:
+                timings.lap("fast_forward", mark)
+            for offset, day in enumerate(remaining_days):
+                if timings is not None:
+                    mark = timings.mark()
+                record = SimulationDayRecord(
+                    day=day,
+                    s_index=s_values[offset],
+                    c_index=c_values[offset],
+                    a_index=forecast.a_index,
+                    ops=forecast.ops[offset],
+                    alerts=forecast.alerts[offset],
+                    peak_tick_alerts=forecast.peak_tick_alerts[offset],
+                    timestamp=datetime.utcnow() + timedelta(days=day)
+                )
+                metrics_writer.add(record.to_metrics(), day=day)
+                data_points += 1
+                if timings is not None:
+                    timings.lap("record", mark)
+                yield record
+            if days:
+                engine.values[:] = forecast.values[-1].tolist()
+                engine.s_index, engine.c_index, engine.a_index = s_values[-1], c_values[-1], forecast.a_index
+                if not in_memory:
+                    write_system_state(engine.to_state())
+            total_ops, total_alerts = forecast.total_ops, forecast.total_alerts
+            remaining_days = range(0)
         
-        # Apply agent response or entropy degradation (Застосувати реакцію агента або деградацію ентропії)
-        if use_agent:
-            # With agent: respond to events (З агентом: реагувати на події)
-            if event_goal:
-                # Mark adaptation start if not already started (Позначити початок адаптації, якщо ще не почалася)
-                if adaptation_start_day is None:
-                    adaptation_start_day = day
-                
-                # Run agent analysis (Запустити аналіз агента)
-                new_state, deltas, agent_logs = run_mock_analysis(event_goal, simulation_state, capture_logs=True)
-                simulation_state = new_state
-                write_system_state(simulation_state)
-                agent_actions_count += 1
-                # Store agent logs (Зберегти логи агента)
-                if agent_logs:
-                    _agent_logs_history.extend(agent_logs)
-                    # Send logs in real-time if callback provided (Відправити логи в реальному часі, якщо надано callback)
-                    if log_callback:
-                        for log_line in agent_logs:
-                            log_callback(log_line)
+        # Run simulation for each day (Запустити симуляцію для кожного дня)
+        for day in remaining_days:
+            if timings is not None:
+                mark = timings.mark()
+            
+            # Send day info if subscribed (Відправити інформацію про день, якщо є підписник)
+            if events.wants(SimulationEventType.DAY_START):
+                events.emit(DayStartEvent(day=day, days=end_day))
+            
+            before_day = engine.values[:] if include_state_delta else None
+            
+            # Generate event/goal for this day, a scenario has them precompiled (Згенерувати подію/ціль для цього дня, у сценарії вони вже скомпільовані)
+            if schedule is not None:
+                day_intensity = schedule.intensity_for(day)
+                event_goal = None
             else:
-                if log_callback:
-                    log_callback("ℹ️ No event this day")
-        else:
-            # Without agent: entropy degrades resources (Без агента: ентропія деградують ресурси)
-            if log_callback:
-                log_callback("⚠️ Control Group: No agent intervention - entropy degradation active")
-                # Show summary of current resource levels before degradation (Показати зведення поточних рівнів ресурсів до деградації)
-                total_resources = len(simulation_state.resources)
-                avg_value = sum(r.value for r in simulation_state.resources) / total_resources if total_resources > 0 else 0
-                min_value = min((r.value for r in simulation_state.resources), default=0)
-                max_value = max((r.value for r in simulation_state.resources), default=0)
-                log_callback(f"📊 Resource state before degradation:")
-                log_callback(f"   • Total resources: {total_resources}")
-                log_callback(f"   • Average value: {avg_value:.1f}")
-                log_callback(f"   • Range: {min_value:.1f} - {max_value:.1f}")
-            simulation_state = apply_entropy_degradation(simulation_state, intensity, log_callback)
-            write_system_state(simulation_state)
-            if log_callback:
-                # Show summary after degradation (Показати зведення після деградації)
-                total_resources_after = len(simulation_state.resources)
-                avg_value_after = sum(r.value for r in simulation_state.resources) / total_resources_after if total_resources_after > 0 else 0
-                min_value_after = min((r.value for r in simulation_state.resources), default=0)
-                max_value_after = max((r.value for r in simulation_state.resources), default=0)
-                log_callback(f"📊 Resource state after degradation:")
-                log_callback(f"   • Average value: {avg_value_after:.1f} (change: {avg_value_after - avg_value:+.1f})")
-                log_callback(f"   • Range: {min_value_after:.1f} - {max_value_after:.1f}")
-        
-        # Calculate adaptation time (Обчислити час адаптації)
-        if adaptation_start_day is not None:
-            t_adapt = float(day - adaptation_start_day + 1)
-        else:
-            t_adapt = 1.0  # No adaptation yet (Адаптації ще немає)
-        
-        # Calculate current metrics (Обчислити поточні метрики)
-        s_index, c_index, a_index = calculate_metrics_from_state(
-            simulation_state,
-            total_ops=total_ops,
-            alerts_count=total_alerts,
-            t_adapt=t_adapt,
-            t_market=t_market
-        )
-        
-        # Update state with calculated indices (Оновити стан з обчисленими індексами)
-        simulation_state.s_index = s_index
-        simulation_state.c_index = c_index
-        simulation_state.a_index = a_index
+                day_intensity = intensity
+                event_goal = generate_event_goal(intensity, day, rng)
+            if timings is not None:
+                mark = timings.lap("event_generation", mark)
+            
+            # Simulate operations and alerts (Симулювати операції та алерти)
+            daily_ops, daily_alerts, peak_tick_alerts = _simulate_day_volume(day_intensity, day, ticks_per_day, rng)
+            total_ops += daily_ops
+            total_alerts += daily_alerts
+            
+            if events.wants(SimulationEventType.OPS):
+                events.emit(OpsEvent(day=day, ops=daily_ops, alerts=daily_alerts))
+            if timings is not None:
+                mark = timings.lap("ops_generation", mark)
+            
+            # Apply agent response or entropy degradation (Застосувати реакцію агента або деградацію ентропії)
+            if use_agent:
+                # With agent: respond to events; scenario goals come already classified (З агентом: реагувати на події; цілі сценарію вже класифіковані)
+                if schedule is not None:
+                    actions = [(g.goal, g.deltas, list(g.logs)) for g in schedule.goals_for(day)]
+                elif event_goal:
+                    actions = [(event_goal, *analyze_goal(event_goal, capture_logs=True, rules=rules))]
+                else:
+                    actions = []
+                if actions:
+                    # Mark adaptation start if not already started (Позначити початок адаптації, якщо ще не почалася)
+                    if adaptation_start_day is None:
+                        adaptation_start_day = day
+                    
+                    # Apply agent deltas in place (Застосувати дельти агента на місці)
+                    for goal, deltas_by_type, agent_logs in actions:
+                        engine.apply_deltas(deltas_by_type)
+                        agent_actions_count += 1
+                        # Store agent logs (Зберегти логи агента)
+                        if agent_logs:
+                            run_registry.append_agent_logs(simulation_run_id, agent_logs)
+                        if events.wants(SimulationEventType.AGENT_ACTION):
+                            deltas = {r_type.value: delta for r_type, delta in deltas_by_type.items()}
+                            events.emit(AgentActionEvent(day=day, goal=goal, deltas=deltas, logs=agent_logs))
+                    if timings is not None:
+                        mark = timings.lap("agent", mark)
+                    if not in_memory:
+                        write_system_state(engine.to_state())
+                        if timings is not None:
+                            mark = timings.lap("state_write", mark)
+                else:
+                    if events.wants(SimulationEventType.NO_EVENT):
+                        events.emit(NoEventEvent(day=day))
+                    if timings is not None:
+                        mark = timings.lap("agent", mark)
+            else:
+                # Without agent: entropy degrades resources (Без агента: ентропія деградують ресурси)
+                # Capture values before degradation only if someone listens (Зберегти значення до деградації лише за наявності слухача)
+                before = engine.values[:] if events.wants(SimulationEventType.DEGRADATION) else None
+                if schedule is not None:
+                    degradation = DEGRADATION_RATES.get(day_intensity, 1.0)
+                engine.degrade(degradation)
+                if timings is not None:
+                    mark = timings.lap("degradation", mark)
+                if not in_memory:
+                    write_system_state(engine.to_state())
+                    if timings is not None:
+                        mark = timings.lap("state_write", mark)
+                if before is not None:
+                    events.emit(DegradationEvent(
+                        day=day,
+                        rate=degradation,
+                        resources=[
+                            (r_type.value, old, new)
+                            for r_type, old, new in zip(engine.layout.resource_types, before, engine.values)
+                        ],
+                    ))
+            
+            # Calculate adaptation time (Обчислити час адаптації)
+            if adaptation_start_day is not None:
+                t_adapt = float(day - adaptation_start_day + 1)
+            else:
+                t_adapt = 1.0  # No adaptation yet (Адаптації ще немає)
+            
+            # Calculate current metrics (Обчислити поточні метрики)
+            s_index, c_index, a_index = engine.metrics(
+                total_ops=total_ops,
+                alerts_count=total_alerts,
+                t_adapt=t_adapt,
+                t_market=t_market
+            )
+            
+            # Update state with calculated indices (Оновити стан з обчисленими індексами)
+            engine.s_index = s_index
+            engine.c_index = c_index
+            engine.a_index = a_index
+            
+            # Emit metrics if subscribed (Відправити метрики, якщо є підписник)
+            if events.wants(SimulationEventType.METRICS):
+                events.emit(MetricsEvent(
+                    day=day,
+                    s_index=s_index,
+                    c_index=c_index,
+                    a_index=a_index,
+                    total_ops=total_ops,
+                    total_alerts=total_alerts,
+                    t_adapt=t_adapt,
+                ))
+            if timings is not None:
+                mark = timings.lap("metrics", mark)
+            
+            # Record metrics for this day (Записати метрики для цього дня)
+            record = SimulationDayRecord(
+                day=day,
+                s_index=s_index,
+                c_index=c_index,
+                a_index=a_index,
+                ops=daily_ops,
+                alerts=daily_alerts,
+                peak_tick_alerts=peak_tick_alerts,
+                timestamp=datetime.utcnow() + timedelta(days=day),
+                state_delta=_state_delta(engine, before_day) if before_day is not None else None
+            )
+            metrics_writer.add(record.to_metrics(), day=day)
+            data_points += 1
+            if timings is not None:
+                mark = timings.lap("record", mark)
+            
+            if CHECKPOINT_EVERY and day % CHECKPOINT_EVERY == 0 and day != end_day:
+                metrics_writer.flush()
+                save_checkpoint(day)
+                if timings is not None:
+                    timings.lap("persist", mark)
+            
+            yield record
         
-        # Log metrics if callback provided (Залогувати метрики, якщо надано callback)
-        if log_callback:
-            log_callback(f"📈 Calculated Metrics:")
-            log_callback(f"   • S Index (Sustainability): {s_index:.3f}")
-            log_callback(f"   • C Index (Control): {c_index:.3f}")
-            log_callback(f"   • A Index (Adaptability): {a_index:.3f}")
-            log_callback(f"📊 Cumulative Stats: Total Ops={total_ops}, Total Alerts={total_alerts}, T_adapt={t_adapt:.1f} days")
+        # Save to database in one transaction, then checkpoint the final state (Зберегти в базу даних однією транзакцією, потім зберегти фінальний стан)
+        if timings is not None:
+            mark = timings.mark()
+        metrics_writer.flush()
+        save_checkpoint(end_day)
+        if timings is not None:
+            timings.lap("persist", mark)
+        # Agent logs are already stored in the run registry during simulation (Логи агента вже збережені в реєстрі запусків під час симуляції)
         
-        # Record metrics for this day (Записати метрики для цього дня)
-        metrics = SimulationMetrics(
-            s_index=s_index,
-            c_index=c_index,
-            a_index=a_index,
-            timestamp=datetime.utcnow() + timedelta(days=day)
-        )
-        metrics_history.append(metrics)
-        # Save to database (Зберегти в базу даних)
-        save_simulation_metric(metrics, simulation_run_id, use_agent, day=day)
+        # Send completion event (Відправити подію завершення)
+        if events.wants(SimulationEventType.RUN_END):
+            events.emit(RunEndEvent(data_points=data_points, agent_actions=agent_actions_count))
+    finally:
+        # Keep what was produced if the consumer stopped early, and restore original state (Зберегти отримане, якщо споживач зупинився раніше, та відновити оригінальний стан)
+        metrics_writer.flush()
+        if live_state:
+            _leave_live_state()
+        if timings is not None:
+            run_registry.set_timings(simulation_run_id, timings.summary())
+
+
+def _can_fast_forward(
+    use_agent: bool,
+    adaptation_start_day: Optional[int],
+    events: SimulationEventChannel,
+    include_state_delta: bool
+) -> bool:
+    """Check whether the remaining days may be fast-forwarded instead of stepped (Перевірити, чи можна прокрутити решту днів замість покрокового виконання)."""
+    if use_agent or adaptation_start_day is not None or include_state_delta or CHECKPOINT_EVERY:
+        return False
+    per_day_events = (
+        SimulationEventType.DAY_START,
+        SimulationEventType.OPS,
+        SimulationEventType.DEGRADATION,
+        SimulationEventType.METRICS,
+    )
+    return not any(events.wants(event_type) for event_type in per_day_events)
+
+
+def _state_delta(engine: EngineState, before: List[float]) -> Dict[str, float]:
+    """Changed resource values of the day by resource id (Змінені за день значення ресурсів за ID ресурсу)."""
+    return {
+        r_id: new - old
+        for r_id, old, new in zip(engine.layout.resource_ids, before, engine.values)
+        if new != old
+    }
+
+
+def run_simulation(
+    days: int = 30,
+    intensity: str = "high",
+    t_market: float = 30.0,
+    initial_state: Optional[SystemState] = None,
+    use_agent: bool = True,
+    log_callback: Optional[Callable[[str], None]] = None,
+    in_memory: bool = False,
+    seed: Optional[int] = None,
+    simulation_run_id: Optional[str] = None,
+    events: Optional[SimulationEventChannel] = None,
+    resume_from: Optional[SimulationCheckpoint] = None,
+    ticks_per_day: int = 1,
+    collect_timings: Optional[bool] = None,
+    schedule: Optional["ScenarioSchedule"] = None
+) -> List[SimulationMetrics]:
+    """
+    Run automated simulation and generate time series of metrics (Запустити автоматичну симуляцію та згенерувати часовий ряд метрик).
     
-    # Store in global history (Зберегти в глобальній історії)
-    _simulation_history = metrics_history
-    # Agent logs are already stored in _agent_logs_history during simulation (Логи агента вже збережені в _agent_logs_history під час симуляції)
+    Collects iter_simulation into a list and records it in the run registry as the latest run (Збирає iter_simulation у список і записує його в реєстр запусків як останній запуск).
     
-    # Send completion message if callback provided (Відправити повідомлення про завершення, якщо надано callback)
-    if log_callback:
-        log_callback("=" * 60)
-        log_callback(f"Simulation completed: {len(metrics_history)} data points collected")
-        log_callback(f"Agent actions: {agent_actions_count}")
+    Args:
+        days: Number of simulation days (Кількість днів симуляції)
+        intensity: Event intensity level ("low", "medium", "high") (Рівень інтенсивності подій)
+        t_market: Market change time in days (Час змін на ринку в днях)
+        initial_state: Starting system state, if None uses current DB state (Початковий стан системи, якщо None - використовує поточний стан БД)
+        use_agent: If True, agent responds to events; if False, entropy degrades resources (Якщо True, агент реагує на події; якщо False, ентропія деградує ресурси)
+        log_callback: Optional callback function to send logs in real-time (Опціональна функція зворотного виклику для відправки логів в реальному часі)
+        in_memory: If True, the live system state is never read or overwritten (Якщо True, живий стан системи не читається і не перезаписується)
+        seed: Seed for the run's own random generator (Зерно для власного генератора запуску)
+        simulation_run_id: Identifier to store the run under, generated if None (Ідентифікатор для збереження запуску, генерується якщо None)
+        events: Channel that receives structured events (Канал для структурованих подій)
+        resume_from: Checkpoint to continue from for `days` more days (Контрольна точка, з якої продовжити ще на `days` днів)
+        ticks_per_day: Operations and alerts resolution (Роздільність операцій та алертів)
+        collect_timings: Time engine phases, None follows SIMULATION_TIMINGS (Вимірювати час фаз рушія, None - за SIMULATION_TIMINGS)
+        schedule: Compiled scenario covering all simulated days (Скомпільований сценарій, що охоплює всі симульовані дні)
     
-    # Restore original state (Відновити оригінальний стан)
-    write_system_state(current_state)
+    Returns:
+        List of SimulationMetrics for each simulation step; when resuming only the new days (Список SimulationMetrics для кожного кроку симуляції; при продовженні - лише нові дні)
+    """
+    if simulation_run_id is None:
+        simulation_run_id = str(uuid.uuid4())
+    
+    metrics_history = [
+        record.to_metrics()
+        for record in iter_simulation(
+            days=days,
+            intensity=intensity,
+            t_market=t_market,
+            initial_state=initial_state,
+            use_agent=use_agent,
+            log_callback=log_callback,
+            in_memory=in_memory,
+            seed=seed,
+            simulation_run_id=simulation_run_id,
+            events=events,
+            resume_from=resume_from,
+            ticks_per_day=ticks_per_day,
+            collect_timings=collect_timings,
+            schedule=schedule
+        )
+    ]
     
+    # Store in the run registry (Зберегти в реєстрі запусків)
+    set_simulation_history(simulation_run_id, metrics_history)
     return metrics_history
 
 
-def get_simulation_summary(metrics_history: List[SimulationMetrics]) -> Dict:
+def extend_simulation(
+    simulation_run_id: str,
+    days: int,
+    log_callback: Optional[Callable[[str], None]] = None,
+    in_memory: bool = False,
+    events: Optional[SimulationEventChannel] = None,
+    ticks_per_day: Optional[int] = None
+) -> List[SimulationMetrics]:
+    """
+    Continue an existing run for more days from its latest checkpoint (Продовжити наявний запуск ще на кілька днів з його останньої контрольної точки).
+    
+    Only the new days are simulated; their metrics are appended to the run's stored series. A run started from a scenario
+    continues with the same scenario compiled for the longer horizon, and with its stored resolution unless another is
+    given (Симулюються лише нові дні; їхні метрики додаються до збереженого ряду запуску. Запуск, розпочатий зі сценарію,
+    продовжується тим самим сценарієм, скомпільованим на довший горизонт, і зі збереженою роздільністю, якщо не задано іншу).
+    
+    Args:
+        simulation_run_id: Run to continue (Запуск для продовження)
+        days: Number of additional days (Кількість додаткових днів)
+        log_callback: Optional callback function to send logs in real-time (Опціональна функція зворотного виклику для відправки логів в реальному часі)
+        in_memory: If True, leave the live system state untouched (Якщо True, не змінювати живий стан системи)
+        events: Channel that receives structured events (Канал для структурованих подій)
+        ticks_per_day: Operations and alerts resolution of the new days, None keeps the run's own (Роздільність операцій та алертів нових днів, None зберігає власну роздільність запуску)
+    
+    Returns:
+        Metrics of the appended days (Метрики доданих днів)
+    
+    Raises:
+        LookupError: If the run or its checkpoint does not exist (Якщо запуску або його контрольної точки не існує)
+    """
+    run = get_simulation_run(simulation_run_id)
+    checkpoint_row = get_latest_simulation_checkpoint(simulation_run_id)
+    if run is None or checkpoint_row is None:
+        raise LookupError(f"No checkpoint for simulation run {simulation_run_id}")
+    checkpoint = SimulationCheckpoint.from_row(checkpoint_row)
+    options = get_simulation_run_options(simulation_run_id)
+    if ticks_per_day is None:
+        ticks_per_day = options.ticks_per_day if options is not None else 1
+    schedule = None
+    if options is not None and options.scenario is not None:
+        # Imported here: app.scenario depends on this module (Імпорт тут: app.scenario залежить від цього модуля)
+        from app.scenario import compile_scenario
+        # Draws are made day by day, so the longer schedule starts with the days already simulated
+        # (Випадкові вибори робляться день за днем, тож довший розклад починається з уже симульованих днів)
+        scenario = SimulationScenario.model_validate_json(options.scenario)
+        schedule = compile_scenario(scenario, checkpoint.day + days, run.intensity, run.seed)
+    
+    new_metrics = run_simulation(
+        days=days,
+        intensity=run.intensity,
+        t_market=run.t_market,
+        use_agent=run.use_agent,
+        log_callback=log_callback,
+        in_memory=in_memory,
+        seed=run.seed,
+        simulation_run_id=simulation_run_id,
+        events=events,
+        resume_from=checkpoint,
+        ticks_per_day=ticks_per_day,
+        schedule=schedule
+    )
+    update_simulation_run_days(simulation_run_id, checkpoint.day + days)
+    
+    # History covers the whole extended run (Історія охоплює весь продовжений запуск)
+    set_simulation_history(simulation_run_id, get_simulation_metrics_by_run_id(simulation_run_id))
+    return new_metrics
+
+
+def get_simulation_summary(metrics_history: List[SimulationMetrics], timings: Optional[Dict[str, Dict[str, float]]] = None) -> Dict:
     """
     Generate summary statistics from simulation results (Згенерувати зведену статистику з результатів симуляції).
     
     Args:
         metrics_history: List of metrics from simulation (Список метрик з симуляції)
+        timings: Phase timings of the run, added under "timings" if given (Час фаз запуску, додається під "timings", якщо задано)
     
     Returns:
         Dictionary with before/after comparison and statistics (Словник з порівнянням до/після та статистикою)
@@ -407,7 +981,7 @@ def get_simulation_summary(metrics_history: List[SimulationMetrics]) -> Dict:
     initial = metrics_history[0]
     final = metrics_history[-1]
     
-    return {
+    summary = {
         "before": {
             "s_index": initial.s_index,
             "c_index": initial.c_index,
@@ -425,4 +999,7 @@ def get_simulation_summary(metrics_history: List[SimulationMetrics]) -> Dict:
         },
         "total_steps": len(metrics_history),
     }
+    if timings is not None:
+        summary["timings"] = timings
+    return summary
 
@@ -0,0 +1,234 @@
+"""
+Structured simulation events (Структуровані події симуляції).
+The engine emits typed events with raw numbers; text is formatted only by sinks that subscribe to them
+(Рушій випускає типізовані події з сирими числами; текст форматують лише підписані обробники).
+"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, ClassVar, Dict, Iterable, List, Optional, Tuple
+
+
+class SimulationEventType(str, Enum):
+    """Kinds of simulation events (Види подій симуляції)."""
+    RUN_START = "run_start"
+    DAY_START = "day_start"
+    OPS = "ops"
+    AGENT_ACTION = "agent_action"
+    NO_EVENT = "no_event"
+    DEGRADATION = "degradation"
+    METRICS = "metrics"
+    RUN_END = "run_end"
+    # Per-day record sent by the streaming endpoint, not emitted by the engine (Запис дня, що надсилає потоковий ендпоінт, рушій його не випускає)
+    DAY = "day"
+
+
+@dataclass(frozen=True)
+class SimulationEvent:
+    """Base class for simulation events (Базовий клас подій симуляції)."""
+    type: ClassVar[SimulationEventType]
+
+
+@dataclass(frozen=True)
+class RunStartEvent(SimulationEvent):
+    """Simulation started (Симуляцію розпочато)."""
+    type: ClassVar[SimulationEventType] = SimulationEventType.RUN_START
+    days: int
+    intensity: str
+    t_market: float
+    use_agent: bool
+    seed: int
+
+
+@dataclass(frozen=True)
+class DayStartEvent(SimulationEvent):
+    """A simulated day started (Розпочато симульований день)."""
+    type: ClassVar[SimulationEventType] = SimulationEventType.DAY_START
+    day: int
+    days: int
+
+
+@dataclass(frozen=True)
+class OpsEvent(SimulationEvent):
+    """Operations and alerts drawn for a day (Операції та алерти, згенеровані за день)."""
+    type: ClassVar[SimulationEventType] = SimulationEventType.OPS
+    day: int
+    ops: int
+    alerts: int
+
+
+@dataclass(frozen=True)
+class AgentActionEvent(SimulationEvent):
+    """Agent reacted to an event goal (Агент відреагував на ціль події)."""
+    type: ClassVar[SimulationEventType] = SimulationEventType.AGENT_ACTION
+    day: int
+    goal: str
+    deltas: Dict[str, int]
+    logs: List[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class NoEventEvent(SimulationEvent):
+    """No event happened on an agent day (У день з агентом подія не відбулася)."""
+    type: ClassVar[SimulationEventType] = SimulationEventType.NO_EVENT
+    day: int
+
+
+@dataclass(frozen=True)
+class DegradationEvent(SimulationEvent):
+    """Entropy degradation applied; resources hold (type, old value, new value) (Застосовано деградацію; resources містить (тип, старе значення, нове значення))."""
+    type: ClassVar[SimulationEventType] = SimulationEventType.DEGRADATION
+    day: int
+    rate: float
+    resources: List[Tuple[str, float, float]]
+
+
+@dataclass(frozen=True)
+class MetricsEvent(SimulationEvent):
+    """Indices and cumulative statistics at the end of a day (Індекси та накопичувальна статистика наприкінці дня)."""
+    type: ClassVar[SimulationEventType] = SimulationEventType.METRICS
+    day: int
+    s_index: float
+    c_index: float
+    a_index: float
+    total_ops: int
+    total_alerts: int
+    t_adapt: float
+
+
+@dataclass(frozen=True)
+class RunEndEvent(SimulationEvent):
+    """Simulation finished (Симуляцію завершено)."""
+    type: ClassVar[SimulationEventType] = SimulationEventType.RUN_END
+    data_points: int
+    agent_actions: int
+
+
+EventSink = Callable[[SimulationEvent], None]
+
+
+class SimulationEventChannel:
+    """
+    Dispatches simulation events to subscribed sinks by event type (Розсилає події симуляції підписаним обробникам за типом події).
+
+    Producers check wants() before building an event, so unobserved event types cost nothing
+    (Виробники перевіряють wants() перед створенням події, тож події без підписників нічого не коштують).
+    """
+
+    def __init__(self) -> None:
+        self._sinks: Dict[SimulationEventType, List[EventSink]] = {event_type: [] for event_type in SimulationEventType}
+
+    def subscribe(self, sink: EventSink, types: Optional[Iterable[SimulationEventType]] = None) -> None:
+        """Subscribe a sink to the given event types, or to all of them (Підписати обробник на вказані типи подій або на всі)."""
+        for event_type in (types if types is not None else SimulationEventType):
+            self._sinks[SimulationEventType(event_type)].append(sink)
+
+    def wants(self, event_type: SimulationEventType) -> bool:
+        """Check whether any sink listens to this event type (Перевірити, чи слухає цей тип подій хоч один обробник)."""
+        return bool(self._sinks[event_type])
+
+    def emit(self, event: SimulationEvent) -> None:
+        """Deliver an event to its sinks (Доставити подію обробникам)."""
+        for sink in self._sinks[event.type]:
+            sink(event)
+
+
+def format_degradation_details(rate: float, degraded: List[Tuple[str, float, float]]) -> List[str]:
+    """Format degraded resources as log lines (Відформатувати деградовані ресурси як рядки логу)."""
+    if not degraded:
+        return [
+            f"⚠️ Entropy degradation: -{rate}% (all resources already at minimum 0.0)",
+            "   System has reached minimum resource levels - no further degradation possible",
+        ]
+
+    lines = [
+        f"⚠️ Entropy degradation applied: -{rate}% to all resources",
+        f"📉 Resources degraded ({len(degraded)} total):",
+    ]
+    # Show all resources with changes (Показати всі ресурси зі змінами)
+    for res_type, old_val, new_val in degraded:
+        change = new_val - old_val
+        percentage = (new_val / old_val * 100) if old_val > 0 else 0
+        lines.append(f"   • {res_type}: {old_val:.1f} → {new_val:.1f} ({change:+.1f}, {percentage:.1f}% of original)")
+
+    # Show most affected resources (Показати найбільш постраждалі ресурси)
+    if len(degraded) > 3:
+        sorted_by_impact = sorted(degraded, key=lambda x: x[1] - x[2], reverse=True)
+        lines.append("🔴 Most affected resources:")
+        for res_type, old_val, new_val in sorted_by_impact[:3]:
+            impact = old_val - new_val
+            lines.append(f"   • {res_type}: lost {impact:.1f} points (from {old_val:.1f} to {new_val:.1f})")
+    return lines
+
+
+def _format_degradation(event: DegradationEvent) -> List[str]:
+    """Format the control-group block with before/after summaries (Відформатувати блок контрольної групи зі зведеннями до/після)."""
+    lines = ["⚠️ Control Group: No agent intervention - entropy degradation active"]
+    before = [old for _, old, _ in event.resources]
+    after = [new for _, _, new in event.resources]
+    total = len(before)
+    avg_before = sum(before) / total if total > 0 else 0
+    avg_after = sum(after) / total if total > 0 else 0
+
+    lines.append("📊 Resource state before degradation:")
+    lines.append(f"   • Total resources: {total}")
+    lines.append(f"   • Average value: {avg_before:.1f}")
+    lines.append(f"   • Range: {min(before, default=0):.1f} - {max(before, default=0):.1f}")
+    degraded = [item for item in event.resources if item[1] != item[2]]
+    lines.extend(format_degradation_details(event.rate, degraded))
+    lines.append("📊 Resource state after degradation:")
+    lines.append(f"   • Average value: {avg_after:.1f} (change: {avg_after - avg_before:+.1f})")
+    lines.append(f"   • Range: {min(after, default=0):.1f} - {max(after, default=0):.1f}")
+    return lines
+
+
+def format_event(event: SimulationEvent) -> List[str]:
+    """
+    Render an event as human-readable log lines (Перетворити подію на зрозумілі людині рядки логу).
+
+    Args:
+        event: Simulation event (Подія симуляції)
+
+    Returns:
+        Log lines in the format of the SSE stream (Рядки логу у форматі SSE-потоку)
+    """
+    if isinstance(event, RunStartEvent):
+        return [
+            f"Starting simulation: {event.days} days, intensity: {event.intensity}, use_agent: {event.use_agent}",
+            f"Market change time (T_market): {event.t_market} days",
+            f"Random seed: {event.seed}",
+            "=" * 60,
+        ]
+    if isinstance(event, DayStartEvent):
+        return [f"\n{'=' * 60}", f"Day {event.day}/{event.days}", "=" * 60]
+    if isinstance(event, OpsEvent):
+        return [f"📊 Operations: {event.ops}, Alerts: {event.alerts}"]
+    if isinstance(event, AgentActionEvent):
+        return list(event.logs)
+    if isinstance(event, NoEventEvent):
+        return ["ℹ️ No event this day"]
+    if isinstance(event, DegradationEvent):
+        return _format_degradation(event)
+    if isinstance(event, MetricsEvent):
+        return [
+            "📈 Calculated Metrics:",
+            f"   • S Index (Sustainability): {event.s_index:.3f}",
+            f"   • C Index (Control): {event.c_index:.3f}",
+            f"   • A Index (Adaptability): {event.a_index:.3f}",
+            f"📊 Cumulative Stats: Total Ops={event.total_ops}, Total Alerts={event.total_alerts}, T_adapt={event.t_adapt:.1f} days",
+        ]
+    if isinstance(event, RunEndEvent):
+        return [
+            "=" * 60,
+            f"Simulation completed: {event.data_points} data points collected",
+            f"Agent actions: {event.agent_actions}",
+        ]
+    return []
+
+
+def text_log_sink(log_callback: Callable[[str], None]) -> EventSink:
+    """Build a sink that formats events into text lines for a log callback (Створити обробник, що форматує події в рядки для callback логування)."""
+    def sink(event: SimulationEvent) -> None:
+        for line in format_event(event):
+            log_callback(line)
+    return sink
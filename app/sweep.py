@@ -0,0 +1,158 @@
+"""
+Parameter sweep scheduler for simulation grid studies (Планувальник перебору параметрів для сіткових досліджень симуляції).
+Expands an intensity × t_market × days × use_agent grid, skips cells already computed, runs the rest on the shared
+process pool and streams per-cell completion (Розгортає сітку, пропускає вже обчислені клітинки, решту виконує на спільному
+пулі процесів і потоково повідомляє про завершення кожної клітинки).
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.batch_simulation import run_batch_simulation
+from app.db_models import SimulationSweepCellRow
+from app.agent_logic import rule_index
+from app.ensemble import MAX_WORKERS, RuleSnapshot, get_process_pool, rule_snapshot, snapshot_rule_index
+from app.models import SimulationSweepRequest
+from app.repository import get_sweep_cells, save_sweep_cell
+from app.simulation import new_simulation_seed
+
+
+@dataclass(frozen=True)
+class SweepCell:
+    """Parameters of one grid cell (Параметри однієї клітинки сітки)."""
+    days: int
+    intensity: str
+    t_market: float
+    use_agent: bool
+    seed: int
+    replications: int
+    rule_version: str
+
+    @property
+    def key(self) -> str:
+        """Canonical content hash of the cell parameters and rule table (Канонічний хеш параметрів клітинки та таблиці правил)."""
+        payload = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def expand_grid(request: SimulationSweepRequest, seed: int, rule_version: Optional[str] = None) -> List[SweepCell]:
+    """
+    Expand the request grid into unique cells in a stable order (Розгорнути сітку запиту в унікальні клітинки у стабільному порядку).
+
+    Args:
+        request: Sweep parameters (Параметри перебору)
+        seed: Seed shared by all cells (Зерно, спільне для всіх клітинок)
+        rule_version: Version of the rule table the cells run with, the active one if None (Версія таблиці правил, з якою виконуються клітинки, активна якщо None)
+
+    Returns:
+        List of unique cells (Список унікальних клітинок)
+    """
+    cells: Dict[str, SweepCell] = {}
+    if rule_version is None:
+        rule_version = rule_index().version
+    for intensity, t_market, days, use_agent in itertools.product(
+        request.intensities, request.t_markets, request.days, request.use_agent
+    ):
+        cell = SweepCell(
+            days=days,
+            intensity=intensity,
+            t_market=float(t_market),
+            use_agent=use_agent,
+            seed=seed,
+            replications=request.replications,
+            rule_version=rule_version,
+        )
+        cells.setdefault(cell.key, cell)
+    return list(cells.values())
+
+
+def _run_cell(cell: SweepCell, rules: RuleSnapshot) -> Dict:
+    """Compute one cell inside a worker process, returning plain row fields (Обчислити одну клітинку в робочому процесі, повернувши прості поля рядка)."""
+    result = run_batch_simulation(
+        days=cell.days,
+        intensity=cell.intensity,
+        t_market=cell.t_market,
+        use_agent=cell.use_agent,
+        replications=cell.replications,
+        seed=cell.seed,
+        rules=snapshot_rule_index(rules),
+    )
+    fields = asdict(cell)
+    del fields["rule_version"]  # only part of the key (лише частина ключа)
+    fields.update(
+        cell_key=cell.key,
+        final_s_index=float(result.s_index[:, -1].mean()),
+        final_c_index=float(result.c_index[:, -1].mean()),
+        final_a_index=float(result.a_index[:, -1].mean()),
+        mean_s_index=float(result.s_index.mean()),
+        mean_c_index=float(result.c_index.mean()),
+        mean_a_index=float(result.a_index.mean()),
+    )
+    return fields
+
+
+def _cell_event(row: SimulationSweepCellRow, cached: bool) -> Dict:
+    """Serialize a cell result for streaming (Серіалізувати результат клітинки для потокової передачі)."""
+    payload = row.model_dump(exclude={"created_at"})
+    payload.update({"type": "cell", "cached": cached})
+    return payload
+
+
+async def iter_sweep(request: SimulationSweepRequest) -> AsyncIterator[Dict]:
+    """
+    Run a sweep and yield one event per finished cell, then a completion event (Виконати перебір і повертати подію на кожну завершену клітинку, потім подію завершення).
+
+    Cells already present in the results table are yielded first without recomputation; the rest are scheduled on the
+    shared process pool with at most `workers` in flight (Клітинки, що вже є в таблиці результатів, повертаються одразу без
+    перерахунку; решта виконується на спільному пулі процесів, не більше `workers` одночасно).
+
+    Args:
+        request: Sweep parameters (Параметри перебору)
+
+    Yields:
+        Dictionaries with "type" equal to "cell" or "complete" (Словники з "type", що дорівнює "cell" або "complete")
+    """
+    seed = request.seed if request.seed is not None else new_simulation_seed()
+    # Cells are keyed by the same rules they are computed with (Клітинки мають ключ за тими самими правилами, з якими обчислюються)
+    rules = rule_snapshot()
+    cells = expand_grid(request, seed, snapshot_rule_index(rules).version)
+    done = get_sweep_cells([cell.key for cell in cells])
+
+    for cell in cells:
+        if cell.key in done:
+            yield _cell_event(done[cell.key], cached=True)
+
+    pending = [cell for cell in cells if cell.key not in done]
+    workers = min(request.workers or MAX_WORKERS, MAX_WORKERS)
+    limiter = asyncio.Semaphore(workers)
+    executor = get_process_pool()
+
+    async def compute(cell: SweepCell) -> SimulationSweepCellRow:
+        """Run one cell on the pool within the concurrency limit and store it (Виконати клітинку на пулі в межах ліміту паралельності та зберегти її)."""
+        async with limiter:
+            row = SimulationSweepCellRow(**(await asyncio.wrap_future(executor.submit(_run_cell, cell, rules))))
+        # Stored even if the client is gone by now, so a rerun reuses it (Зберігається, навіть якщо клієнт уже пішов, тож повторний запуск її використає)
+        await asyncio.to_thread(save_sweep_cell, row)
+        return row
+
+    tasks = [asyncio.ensure_future(compute(cell)) for cell in pending]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield _cell_event(await finished, cached=False)
+    finally:
+        # A closed stream stops cells that are still waiting or queued on the pool (Закритий потік зупиняє клітинки, що ще чекають або стоять у черзі пулу)
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    yield {
+        "type": "complete",
+        "seed": seed,
+        "cells": len(cells),
+        "computed": len(pending),
+        "cached": len(cells) - len(pending),
+    }
@@ -0,0 +1,72 @@
+"""
+Per-phase timing of the simulation hot path (Вимірювання часу фаз гарячого шляху симуляції).
+The engine holds None instead of a RunTimings when timing is off, so a disabled timer costs one identity check per phase
+(Рушій тримає None замість RunTimings, коли вимірювання вимкнене, тож вимкнений таймер коштує одну перевірку на фазу).
+"""
+
+import os
+from time import perf_counter_ns
+from typing import Dict, List
+
+
+# Default for runs that do not choose themselves; off unless SIMULATION_TIMINGS is set (Типове значення для запусків, що не обирають самі; вимкнено, якщо не задано SIMULATION_TIMINGS)
+TIMINGS_ENABLED = os.getenv("SIMULATION_TIMINGS", "0").lower() in ("1", "true", "yes")
+
+# Percentiles reported per phase (Перцентилі, що звітуються для кожної фази)
+TIMING_PERCENTILES = (50, 95, 99)
+
+
+def _percentile(ordered: List[int], q: float) -> int:
+    """Nearest-rank percentile of a sorted list (Перцентиль найближчого рангу відсортованого списку)."""
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class RunTimings:
+    """
+    Durations of engine phases of one run in nanoseconds (Тривалості фаз рушія одного запуску в наносекундах).
+
+    Phases are measured as laps: lap() closes the phase that started at `mark` and returns the mark for the next one
+    (Фази вимірюються як кола: lap() закриває фазу, що почалася в `mark`, і повертає позначку для наступної).
+    """
+
+    __slots__ = ("_samples",)
+
+    def __init__(self) -> None:
+        self._samples: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def mark() -> int:
+        """Current timestamp to start a phase from (Поточна позначка часу для початку фази)."""
+        return perf_counter_ns()
+
+    def lap(self, phase: str, mark: int) -> int:
+        """Record the time since `mark` under `phase` and return a new mark (Записати час від `mark` для фази `phase` і повернути нову позначку)."""
+        now = perf_counter_ns()
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = self._samples[phase] = []
+        samples.append(now - mark)
+        return now
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Totals, counts and percentiles per phase (Підсумки, кількість та перцентилі для кожної фази).
+
+        Returns:
+            Mapping phase → {"count", "total_ms", "mean_us", "p50_us", "p95_us", "p99_us", "max_us"} (Мапа фаза → статистика)
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        for phase, samples in self._samples.items():
+            ordered = sorted(samples)
+            total = sum(ordered)
+            stats: Dict[str, float] = {
+                "count": len(ordered),
+                "total_ms": total / 1e6,
+                "mean_us": total / len(ordered) / 1e3,
+            }
+            for q in TIMING_PERCENTILES:
+                stats[f"p{q}_us"] = _percentile(ordered, q) / 1e3
+            stats["max_us"] = ordered[-1] / 1e3
+            summary[phase] = stats
+        return summary
@@ -0,0 +1,69 @@
+"""
+Benchmark of the simulation engine on a large synthetic organization model (Бенчмарк рушія симуляції на великій синтетичній моделі організації).
+Usage: python benchmark_large_state.py [--resources 10000] [--days 365] [--max-seconds 2]
+Exits with status 1 if an arm takes longer than --max-seconds (Завершується зі статусом 1, якщо гілка триває довше за --max-seconds).
+Set DATABASE_URL to a scratch database, metrics of the runs are persisted (Задайте DATABASE_URL на тимчасову БД, метрики запусків зберігаються).
+"""
+
+import argparse
+import sys
+import time
+import uuid
+
+from app.analytics import calculate_metrics_from_state
+from app.db import create_db_and_tables
+from app.initial_state import generate_synthetic_state
+from app.simulation import iter_simulation, get_simulation_timings
+
+
+def main() -> int:
+    """Run agent and control arms on a synthetic state, print phase timings and check the time budget (Запустити гілки агента і контролю на синтетичному стані, вивести час фаз і перевірити бюджет часу)."""
+    parser = argparse.ArgumentParser(description="Large-state simulation benchmark")
+    parser.add_argument("--resources", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="Interactive budget per arm")
+    args = parser.parse_args()
+    create_db_and_tables()
+
+    started = time.perf_counter()
+    state = generate_synthetic_state(args.resources, seed=args.seed)
+    print(f"Synthetic state: {args.resources} resources in {time.perf_counter() - started:.3f} s")
+
+    started = time.perf_counter()
+    calculate_metrics_from_state(state)
+    print(f"calculate_metrics_from_state: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    slow_arms = []
+    for use_agent in (True, False):
+        run_id = f"bench-{uuid.uuid4()}"
+        started = time.perf_counter()
+        records = iter_simulation(
+            days=args.days,
+            use_agent=use_agent,
+            in_memory=True,
+            seed=args.seed,
+            simulation_run_id=run_id,
+            collect_timings=True,
+            start_state=state,
+        )
+        final = None
+        for final in records:
+            pass
+        elapsed = time.perf_counter() - started
+        arm = "agent" if use_agent else "control"
+        print(f"\n{arm}: {args.days} days in {elapsed:.3f} s, final S={final.s_index:.4f}")
+        for phase, stats in (get_simulation_timings(run_id) or {}).items():
+            print(f"  {phase:<18} total {stats['total_ms']:9.1f} ms   p95 {stats['p95_us']:9.1f} us")
+        if elapsed > args.max_seconds:
+            slow_arms.append(arm)
+
+    if slow_arms:
+        print(f"\nFAIL: {', '.join(slow_arms)} exceeded {args.max_seconds:.1f} s")
+        return 1
+    print(f"\nOK: every arm within {args.max_seconds:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
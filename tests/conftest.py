@@ -1,9 +1,12 @@
 """
-Test configuration to ensure project root is importable (Конфіг для тестів, щоб корінь проєкту підтягувався в імпорти).
+Test configuration to ensure project root is importable and tests use a scratch database (Конфіг для тестів, щоб корінь проєкту підтягувався в імпорти, а тести використовували тимчасову БД).
 """
 
 import os
 import sys
+import tempfile
+
+import pytest
 
 
 def _ensure_project_root_on_path() -> None:
@@ -14,8 +17,22 @@ def _ensure_project_root_on_path() -> None:
         sys.path.insert(0, project_root)
 
 
-_ensure_project_root_on_path()
+def _use_scratch_database() -> None:
+    """Point DATABASE_URL at a fresh SQLite file before app.db is imported, TEST_DATABASE_URL overrides it (Спрямувати DATABASE_URL на новий файл SQLite до імпорту app.db, TEST_DATABASE_URL його перевизначає)."""
+    scratch = os.path.join(tempfile.mkdtemp(prefix="dt4research-tests-"), "test.db")
+    os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{scratch}")
 
 
+_ensure_project_root_on_path()
+_use_scratch_database()
+
 
+@pytest.fixture(scope="session", autouse=True)
+def scratch_database():
+    """Create the schema and the initial state in the scratch database, as the API does on startup (Створити схему та початковий стан у тимчасовій БД, як це робить API під час запуску)."""
+    from app.db import create_db_and_tables
+    from app.initial_state import INITIAL_STATE
+    from app.repository import seed_initial_state
 
+    create_db_and_tables()
+    seed_initial_state(INITIAL_STATE)
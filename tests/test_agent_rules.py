@@ -0,0 +1,76 @@
+"""
+Tests for the compiled keyword rule index of the mock agent (Тести для скомпільованого індексу ключових правил псевдо-агента).
+"""
+
+from fastapi.testclient import TestClient
+
+from app.agent_logic import analyze_goal, rule_index
+from app.agent_rules import KeywordRule, RuleIndex
+from app.main import app
+from app.models import ResourceType
+
+
+def test_earliest_rule_wins_regardless_of_position():
+    """Test a goal with stems of several rules takes the highest-priority rule (Тест, що ціль з основами кількох правил отримує правило з найвищим пріоритетом)."""
+    deltas, logs = analyze_goal("Тренінги з безпеки для клієнтського сервісу", capture_logs=True)
+    customer = next(rule for rule in rule_index().rules if rule.name == "customer")
+    assert deltas == customer.deltas
+    assert customer.detected in logs
+
+    assert analyze_goal("Щось зовсім інше", capture_logs=True)[0] == rule_index().default.deltas
+
+
+def test_overlapping_stems_and_large_tables():
+    """Test stems overlapping at one position still resolve by priority, also with hundreds of rules (Тест, що основи, які перекриваються, вирішуються за пріоритетом і для сотень правил)."""
+    default = KeywordRule("default", (), {}, "", "")
+    filler = [KeywordRule(f"r{i}", (f"stem{i:03d}x",), {ResourceType.RISK: i}, "", "") for i in range(300)]
+    low = KeywordRule("low", ("трен",), {ResourceType.EDUCATIONAL: 1}, "", "")
+    high = KeywordRule("high", ("тренд",), {ResourceType.STRATEGIC: 2}, "", "")
+    index = RuleIndex([*filler, high, low], default)
+
+    assert index.match("ТРЕНДИ ринку") is high
+    assert index.match("тренінг") is low
+    assert index.match("stem250x і stem007x") is filler[7]
+    assert index.match("stem25") is default
+    assert RuleIndex([], default).match("будь-що") is default
+
+
+def test_scan_cost_does_not_grow_with_the_rule_table():
+    """Test an uncached scan costs about the same for 10 and 2000 rules (Тест, що сканування без кешу коштує приблизно однаково для 10 і 2000 правил)."""
+    import timeit
+
+    default = KeywordRule("default", (), {}, "", "")
+    goal = "підвищити стійкість команди та оптимізувати процеси постачання " * 4
+
+    def scan_time(rule_count: int) -> float:
+        rules = [KeywordRule(f"r{i}", (f"stem{i:04d}x", f"ст{i}ій"), {}, "", "") for i in range(rule_count)]
+        index = RuleIndex(rules, default)
+        assert index._scan(goal) is default
+        return min(timeit.repeat(lambda: index._scan(goal), number=200, repeat=5))
+
+    assert scan_time(2000) < 3 * scan_time(10)
+
+
+def test_match_cache_counts_hits_and_is_per_rule_version():
+    """Test repeated goals are served from the cache and a changed table gets a new version and an empty cache (Тест, що повторні цілі беруться з кешу, а змінена таблиця отримує нову версію та порожній кеш)."""
+    rule = KeywordRule("eco", ("екологі",), {ResourceType.RISK: 1}, "", "")
+    default = KeywordRule("default", (), {}, "", "")
+    index = RuleIndex([rule], default, cache_size=2)
+
+    assert index.match("Екологія") is rule and index.match("ЕКОЛОГІЯ") is rule and index.match("інше") is default
+    stats = index.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["max_entries"]) == (1, 2, 2, 2)
+    assert stats["hit_ratio"] == 1 / 3
+
+    changed = RuleIndex([KeywordRule("eco", ("екологі",), {ResourceType.RISK: 2}, "", "")], default)
+    assert changed.version != index.version
+    assert RuleIndex([rule], default).version == index.version
+    assert changed.cache_stats()["misses"] == 0
+
+    with TestClient(app) as client:
+        before = rule_index().cache_stats()
+        analyze_goal("Клієнтський сервіс", capture_logs=True)
+        analyze_goal("клієнтський сервіс", capture_logs=True)
+        stats = client.get("/api/v1/agent/cache/stats").json()
+    assert stats["version"] == rule_index().version
+    assert stats["hits"] >= before["hits"] + 1
@@ -3,6 +3,8 @@ Unit tests for analytics module (Юніт-тести для модуля ана
 Tests calculation of S, C, A indices (Тестування обчислення індексів S, C, A).
 """
 
+import copy
+
 import pytest
 from app.analytics import (
     calculate_s_index,
@@ -206,6 +208,39 @@ def test_extract_waste_from_processes_no_operational():
     assert result == 0.5
 
 
+def test_state_type_index_tracks_writes_and_list_changes():
+    """Test type/id lookups and per-type sums follow plain assignments, copies and resource list changes (Тест, що пошук за типом/id і суми за типом відстежують звичайні присвоєння, копії та зміни списку ресурсів)."""
+    state = SystemState(
+        components=[],
+        resources=[
+            Resource(id="oper1", name="Operational 1", type=ResourceType.OPERATIONAL, value=60.0),
+            Resource(id="tech", name="Tech", type=ResourceType.TECHNOLOGICAL, value=50.0),
+            Resource(id="oper2", name="Operational 2", type=ResourceType.OPERATIONAL, value=80.0),
+        ]
+    )
+    assert [r.id for r in state.resources_of_type(ResourceType.OPERATIONAL)] == ["oper1", "oper2"]
+    assert state.get_resource("tech").value == 50.0 and state.get_resource("missing") is None
+    assert state.type_mean(ResourceType.OPERATIONAL) == 70.0 and state.type_mean(ResourceType.RISK) is None
+
+    state.get_resource("oper2").value = 100.0
+    assert state.type_sum(ResourceType.OPERATIONAL) == 160.0
+    assert abs(extract_waste_from_processes(state) - 0.2) < 0.001
+
+    copied = copy.deepcopy(state)
+    copied.get_resource("oper1").value = 0.0
+    assert copied.type_sum(ResourceType.OPERATIONAL) == 100.0 and state.type_sum(ResourceType.OPERATIONAL) == 160.0
+    assert copied != state and copy.deepcopy(state) == state
+
+    state.resources[0] = Resource(id="oper1", name="Operational 1", type=ResourceType.OPERATIONAL, value=0.0)
+    assert state.type_sum(ResourceType.OPERATIONAL) == 100.0 and state.get_resource("oper1").value == 0.0
+    assert SystemState.model_validate(state.model_dump()) == state
+
+    state.resources.append(Resource(id="oper3", name="Operational 3", type=ResourceType.OPERATIONAL, value=20.0))
+    assert state.type_mean(ResourceType.OPERATIONAL) == 40.0
+    state.resources = [Resource(id="tech2", name="Tech 2", type=ResourceType.TECHNOLOGICAL, value=90.0)]
+    assert state.resources_of_type(ResourceType.OPERATIONAL) == [] and extract_tech_resource(state) == 0.9
+
+
 def test_calculate_metrics_from_state():
     """Test complete metrics calculation from state (Тест повного обчислення метрик зі стану)."""
     state = SystemState(
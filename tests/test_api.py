@@ -208,3 +208,28 @@ def test_mask_url_credentials_general():
     assert masked_db == "postgresql://***@db.local:5432/db"
 
 
+def test_scenario_batch_apply_matches_sequential_goals(client: TestClient):
+    """
+    СЦЕНАРІЙ: Пакетне застосування цілей.
+    Пакет цілей має дати той самий стан і історію, що й послідовні окремі запити.
+    """
+    goals = ["покращити сервіс", "екологічні інновації", "Щось зовсім інше", "покращити сервіс", "покращити сервіс"]
+    for goal in goals:
+        client.post("/api/v1/apply-mechanism", json={"target_goal": goal})
+    sequential_state = client.get("/api/v1/system-state").json()
+    sequential_runs = client.get("/api/v1/agent-runs").json()
+
+    client.post("/api/v1/system-reset")
+    response = client.post("/api/v1/apply-mechanism/batch", json={"target_goals": goals})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["newState"] == sequential_state == client.get("/api/v1/system-state").json()
+    assert [item["goal"] for item in data["results"]] == goals
+    assert data["results"][0]["explanation_details"]["Communication"] == CUST_COMM
+    batch_runs = client.get("/api/v1/agent-runs").json()
+    assert batch_runs["total"] == len(goals)
+    assert sorted(r["input_goal"] for r in batch_runs["items"]) == sorted(r["input_goal"] for r in sequential_runs["items"])
+
+    invalid = client.post("/api/v1/apply-mechanism/batch", json={"target_goals": ["інновації", "hi"]})
+    assert invalid.status_code == 422
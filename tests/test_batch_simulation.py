@@ -0,0 +1,80 @@
+"""
+Unit tests for the vectorized batch engine (Юніт-тести для векторизованого пакетного рушія).
+Checks statistical equivalence with the scalar simulation path (Перевіряє статистичну еквівалентність зі скалярним шляхом симуляції).
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.batch_simulation import run_batch_simulation, percentile_series
+from app.simulation import run_simulation, clear_simulation_history
+
+
+SCALAR_RUNS = 100
+
+
+def _scalar_series(days: int, intensity: str, use_agent: bool, runs_count: int = SCALAR_RUNS) -> np.ndarray:
+    """Run the scalar engine repeatedly and stack S/C/A series (Запустити скалярний рушій кілька разів і зібрати ряди S/C/A)."""
+    runs = [
+        run_simulation(days=days, intensity=intensity, t_market=30.0, use_agent=use_agent, in_memory=True, seed=seed)
+        for seed in range(runs_count)
+    ]
+    clear_simulation_history()
+    return np.array([[[m.s_index, m.c_index, m.a_index] for m in run] for run in runs])
+
+
+def test_batch_result_shapes_and_ranges():
+    """Test batch output shapes and index ranges (Тест форм і діапазонів пакетного результату)."""
+    result = run_batch_simulation(days=12, intensity="medium", replications=50, seed=7)
+
+    assert result.replications == 50
+    for series in (result.s_index, result.c_index, result.a_index):
+        assert series.shape == (50, 13)
+    assert np.all((result.s_index >= 0) & (result.s_index <= 1))
+    assert np.all((result.c_index >= 0) & (result.c_index <= 1))
+    assert np.all(result.a_index >= 0)
+
+
+def test_batch_is_reproducible_with_seed():
+    """Test that the same seed gives the same batch (Тест, що однакове зерно дає однаковий результат)."""
+    first = run_batch_simulation(days=8, replications=20, seed=42)
+    second = run_batch_simulation(days=8, replications=20, seed=42)
+    assert np.array_equal(first.s_index, second.s_index)
+    assert np.array_equal(first.c_index, second.c_index)
+
+
+@pytest.mark.parametrize("intensity", ["low", "medium", "high"])
+def test_batch_control_group_matches_scalar_exactly(intensity):
+    """Test deterministic S and A series of the control group match the scalar path (Тест, що детерміновані ряди S та A контрольної групи збігаються зі скалярними)."""
+    scalar = _scalar_series(days=10, intensity=intensity, use_agent=False, runs_count=1)
+    batch = run_batch_simulation(days=10, intensity=intensity, use_agent=False, replications=10, seed=1)
+
+    assert np.allclose(batch.s_index[0], scalar[0, :, 0])
+    assert np.allclose(batch.a_index[0], scalar[0, :, 2])
+
+
+@pytest.mark.parametrize("intensity", ["low", "medium", "high"])
+def test_batch_agent_runs_are_statistically_equivalent(intensity):
+    """Test mean S and C of batch and scalar runs agree within sampling error (Тест, що середні S і C збігаються в межах похибки вибірки)."""
+    scalar = _scalar_series(days=10, intensity=intensity, use_agent=True)
+    batch = run_batch_simulation(days=10, intensity=intensity, use_agent=True, replications=4000, seed=5)
+
+    for column, series in ((0, batch.s_index), (1, batch.c_index)):
+        scalar_final = scalar[:, -1, column]
+        stderr = math.sqrt(scalar_final.var(ddof=1) / SCALAR_RUNS + series[:, -1].var(ddof=1) / batch.replications)
+        assert abs(series[:, -1].mean() - scalar_final.mean()) <= 5 * stderr + 1e-9
+    assert np.allclose(batch.a_index[0], scalar[0, :, 2])
+
+
+def test_percentile_series_bands_are_ordered():
+    """Test percentile bands are ordered per day (Тест, що смуги перцентилів упорядковані для кожного дня)."""
+    result = run_batch_simulation(days=15, intensity="high", replications=200, seed=3)
+    summary = percentile_series(result)
+
+    for name in ("s_index", "c_index", "a_index"):
+        bands = summary[name]
+        assert set(bands) == {"mean", "p5", "p50", "p95"}
+        assert len(bands["mean"]) == 16
+        assert all(lo <= mid <= hi for lo, mid, hi in zip(bands["p5"], bands["p50"], bands["p95"]))
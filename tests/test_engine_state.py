@@ -0,0 +1,82 @@
+"""
+Tests for the engine-internal simulation state (Тести для внутрішнього стану рушія симуляції).
+"""
+
+import copy
+
+import numpy as np
+
+from app.agent_logic import analyze_goal, apply_resource_deltas
+from app.analytics import calculate_metrics_from_state
+from app.engine_state import EngineState, _type_mean_series
+from app.initial_state import INITIAL_STATE, generate_synthetic_state
+from app.models import ResourceType
+from app.simulation import apply_entropy_degradation, iter_simulation
+
+
+def test_round_trip_preserves_state():
+    """Test converting to the engine state and back is lossless (Тест, що перетворення туди й назад без втрат)."""
+    assert EngineState.from_state(INITIAL_STATE).to_state() == INITIAL_STATE
+
+
+def test_transitions_match_pydantic_path():
+    """Test in-place transitions give the same values and metrics as the SystemState path (Тест, що переходи на місці дають ті самі значення та метрики)."""
+    engine = EngineState.from_state(INITIAL_STATE)
+    state = copy.deepcopy(INITIAL_STATE)
+
+    for goal in ("Цифрова трансформація", "Клієнтський сервіс", "Невідома ціль", "Освіта та тренінги"):
+        deltas, _ = analyze_goal(goal, capture_logs=True)
+        engine.apply_deltas(deltas)
+        apply_resource_deltas(state, deltas)
+        engine.degrade(2.0)
+        state = apply_entropy_degradation(state, "high")
+
+        assert engine.values == [r.value for r in state.resources]
+        assert engine.metrics(total_ops=500, alerts_count=40, t_adapt=3.0, t_market=30.0) == calculate_metrics_from_state(
+            state, total_ops=500, alerts_count=40, t_adapt=3.0, t_market=30.0
+        )
+
+
+def test_copy_is_independent_and_source_untouched():
+    """Test copies do not share values and the source SystemState is never mutated (Тест, що копії не ділять значення, а вихідний SystemState не змінюється)."""
+    engine = EngineState.from_state(INITIAL_STATE)
+    clone = engine.copy()
+    clone.degrade(100.0)
+
+    assert all(value == 0.0 for value in clone.values)
+    assert engine.values == [r.value for r in INITIAL_STATE.resources]
+    assert clone.layout is engine.layout
+
+
+def test_synthetic_large_state_runs_through_engine():
+    """Test a large synthetic state covers all types and simulates like the SystemState path (Тест, що великий синтетичний стан покриває всі типи та симулюється як шлях SystemState)."""
+    state = generate_synthetic_state(2000, seed=5)
+    assert len(state.resources) == 2000 and len({r.id for r in state.resources}) == 2000
+    assert {r.type for r in state.resources} == set(ResourceType)
+    assert generate_synthetic_state(2000, seed=5) == state
+
+    engine = EngineState.from_state(state)
+    deltas, _ = analyze_goal("Цифрова трансформація", capture_logs=True)
+    engine.apply_deltas(deltas)
+    apply_resource_deltas(state, deltas)
+    assert engine.metrics(total_ops=100, alerts_count=5) == calculate_metrics_from_state(state, total_ops=100, alerts_count=5)
+
+    records = list(iter_simulation(days=5, in_memory=True, seed=3, start_state=state))
+    assert len(records) == 6
+    assert records[0].s_index == calculate_metrics_from_state(state)[0]
+
+
+def test_type_means_add_left_to_right_on_every_path():
+    """Test scalar, per-row and SystemState means round identically, also where compensated summation would differ (Тест, що скалярне, порядкове та SystemState-середнє округлюються однаково, також там, де компенсоване підсумовування відрізнялося б)."""
+    state = generate_synthetic_state(200, seed=1)
+    for resource in state.resources:
+        resource.value = 0.1
+    engine = EngineState.from_state(state)
+    rows = np.array([engine.values])
+
+    for r_type, indices in engine.layout.type_indices.items():
+        expected = 0.0
+        for _ in indices:
+            expected += 0.1
+        expected /= len(indices)
+        assert engine.type_mean(r_type) == _type_mean_series(rows, indices)[0] == state.type_mean(r_type) == expected
@@ -0,0 +1,97 @@
+"""
+Tests for the ensemble simulation endpoint (Тести для ендпоінта ансамблевої симуляції).
+"""
+
+import dataclasses
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import app.agent_logic as agent_logic
+from app.main import app
+from app.ensemble import _run_chunk, _split_replications, rule_snapshot, snapshot_rule_index
+from app.models import SimulationEnsembleRequest
+
+
+def test_split_replications_covers_all_runs():
+    """Test chunk sizes add up and differ by at most one (Тест, що розміри частин у сумі дають усі реплікації)."""
+    assert _split_replications(10, 3) == [4, 3, 3]
+    assert _split_replications(2, 8) == [1, 1]
+    assert sum(_split_replications(1001, 8)) == 1001
+
+
+def test_ensemble_endpoint_returns_bands():
+    """Test ensemble endpoint fans out to workers and returns ordered bands (Тест, що ендпоінт ансамблю повертає впорядковані смуги)."""
+    with TestClient(app) as client:
+        payload = {"days": 10, "intensity": "medium", "t_market": 30.0, "use_agent": True, "replications": 200, "workers": 2}
+        response = client.post("/api/v1/simulation/ensemble", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["replications"] == 200
+    assert data["days"] == 10
+    for name in ("s_index", "c_index", "a_index"):
+        bands = data[name]
+        assert len(bands["mean"]) == 11
+        assert all(lo <= mid <= hi for lo, mid, hi in zip(bands["p5"], bands["p50"], bands["p95"]))
+
+
+def test_ensemble_endpoint_validates_replications():
+    """Test ensemble endpoint rejects non-positive replications and single-run options it cannot honour (Тест валідації кількості реплікацій і параметрів одиночного запуску, які ансамбль не може виконати)."""
+    with TestClient(app) as client:
+        response = client.post("/api/v1/simulation/ensemble", json={"replications": 0})
+        in_memory = client.post("/api/v1/simulation/ensemble", json={"replications": 2, "in_memory": True})
+        not_in_memory = client.post("/api/v1/simulation/ensemble", json={"days": 3, "replications": 2, "in_memory": False})
+        ticks = client.post("/api/v1/simulation/ensemble", json={"replications": 2, "ticks_per_day": 24})
+    assert response.status_code == 422
+    assert in_memory.status_code == 422
+    assert not_in_memory.status_code == 200
+    assert ticks.status_code == 422
+
+
+def test_ensemble_endpoint_is_reproducible_with_seed():
+    """Test that a seeded ensemble returns identical bands (Тест, що ансамбль із зерном повертає однакові смуги)."""
+    payload = {"days": 5, "intensity": "high", "replications": 50, "workers": 1, "seed": 11}
+    with TestClient(app) as client:
+        first = client.post("/api/v1/simulation/ensemble", json=payload).json()
+        second = client.post("/api/v1/simulation/ensemble", json=payload).json()
+    assert first["c_index"] == second["c_index"]
+    assert first["s_index"] == second["s_index"]
+
+
+def test_paired_endpoint_shares_noise_between_arms():
+    """Test paired arms see identical draws, so the effect has a smaller error than unpaired runs (Тест, що парні гілки мають однакові вибірки, тож похибка ефекту менша, ніж у непарних запусків)."""
+    with TestClient(app) as client:
+        payload = {"days": 20, "intensity": "medium", "replications": 200, "workers": 2, "seed": 11}
+        response = client.post("/api/v1/simulation/paired", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["replications"] == 200
+    assert len(data["s_index"]["mean"]) == 21
+    # C depends only on the shared ops/alerts draws (C залежить лише від спільних вибірок операцій та алертів)
+    assert all(value == 0.0 for value in data["c_index"]["p95"] + data["c_index"]["p5"])
+    s_effect = data["effect"]["s_index"]
+    assert s_effect["mean"] > 0
+    assert s_effect["ci95_low"] <= s_effect["mean"] <= s_effect["ci95_high"]
+    c_effect = data["effect"]["c_index"]
+    assert c_effect["std_error"] == 0.0 < c_effect["unpaired_std_error"]
+
+
+def test_worker_tasks_use_the_snapshot_rules_not_a_newer_active_config(monkeypatch):
+    """Test a worker that already installed a newer config still computes with the caller's snapshot (Тест, що робочий процес, який уже встановив новішу конфігурацію, все одно рахує за знімком викликача)."""
+    request = SimulationEnsembleRequest(days=9, intensity="high", replications=20)
+    snapshot = rule_snapshot()
+    expected = _run_chunk(request, 20, np.random.SeedSequence(5), snapshot)
+
+    newer = {**agent_logic.DEFAULT_COEFFICIENTS, "ECO_TECH": 0, "CUST_COMM": 0, "INNOV_TECH": 0, "RISK_RISK": 0}
+    active = agent_logic.rule_config()
+    monkeypatch.setattr(agent_logic, "_active_config", dataclasses.replace(
+        active, version=active.version + 100, coefficients=newer, index=agent_logic.build_rule_index(newer)
+    ))
+    pinned = _run_chunk(request, 20, np.random.SeedSequence(5), snapshot)
+    current = _run_chunk(request, 20, np.random.SeedSequence(5), rule_snapshot())
+
+    assert np.array_equal(pinned.s_index, expected.s_index)
+    assert not np.array_equal(current.s_index, expected.s_index)
+    assert snapshot_rule_index(snapshot) is snapshot_rule_index(tuple(snapshot))  # compiled once per snapshot (компілюється раз на знімок)
@@ -0,0 +1,82 @@
+"""
+Tests for the simulation job queue (Тести для черги завдань симуляції).
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.jobs import JobQueueFullError, SimulationJobManager
+from app.main import app
+from app.models import SimulationJobStatus, SimulationRunRequest
+
+
+def _wait(job, timeout: float = 10.0):
+    """Wait until the job finishes (Дочекатися завершення завдання)."""
+    job.future.exception(timeout=timeout)
+    return job
+
+
+def test_job_is_cancelled_between_days():
+    """Test cancellation stops the run after the current day (Тест, що скасування зупиняє запуск після поточного дня)."""
+    manager = SimulationJobManager(workers=1, queue_limit=0)
+    submitted = threading.Event()
+    holder = {}
+
+    def on_record(record):
+        submitted.wait(5)
+        if record.day == 3:
+            manager.cancel(holder["job"].job_id)
+
+    job = holder["job"] = manager.submit(SimulationRunRequest(days=200, in_memory=True, seed=1), on_record=on_record)
+    submitted.set()
+    _wait(job)
+    manager.shutdown()
+
+    assert job.status == SimulationJobStatus.CANCELLED
+    assert job.days_done == 3
+    assert len(job.result) == 4
+
+
+def test_full_queue_rejects_submissions():
+    """Test submissions beyond workers plus queue limit are rejected (Тест, що подання понад ліміт відхиляються)."""
+    manager = SimulationJobManager(workers=1, queue_limit=1)
+    release = threading.Event()
+    request = SimulationRunRequest(days=5, in_memory=True, seed=2)
+
+    blocking = manager.submit(request, on_record=lambda record: release.wait(5))
+    queued = manager.submit(request)
+    with pytest.raises(JobQueueFullError):
+        manager.submit(request)
+
+    manager.cancel(queued.job_id)
+    assert queued.status == SimulationJobStatus.CANCELLED
+    release.set()
+    _wait(blocking)
+    manager.shutdown()
+    assert blocking.status == SimulationJobStatus.COMPLETED
+
+
+def test_job_endpoints_submit_poll_and_fetch_result():
+    """Test submit, status, list and result endpoints (Тест ендпоінтів подання, статусу, списку та результату)."""
+    with TestClient(app) as client:
+        submitted = client.post("/api/v1/simulation/jobs", json={"days": 7, "in_memory": True, "seed": 3})
+        assert submitted.status_code == 202
+        job_id = submitted.json()["job_id"]
+
+        deadline = time.time() + 10
+        while client.get(f"/api/v1/simulation/jobs/{job_id}").json()["status"] != "completed":
+            assert time.time() < deadline
+            time.sleep(0.02)
+
+        status = client.get(f"/api/v1/simulation/jobs/{job_id}").json()
+        result = client.get(f"/api/v1/simulation/jobs/{job_id}/result")
+        listed = client.get("/api/v1/simulation/jobs").json()
+        missing = client.get("/api/v1/simulation/jobs/unknown")
+
+    assert status["days_done"] == 7
+    assert len(result.json()) == 8
+    assert any(item["job_id"] == job_id for item in listed)
+    assert missing.status_code == 404
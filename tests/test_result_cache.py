@@ -0,0 +1,73 @@
+"""
+Tests for the simulation result cache (Тести для кешу результатів симуляції).
+"""
+
+from dataclasses import replace
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import app.agent_logic as agent_logic
+from app.main import app
+from app.models import SimulationMetrics, SimulationRunRequest
+from app.result_cache import CachedSimulationResult, SimulationResultCache, simulation_cache_key, simulation_result_cache
+from app.simulation import get_simulation_history
+
+
+def _entry(run_id: str, days: int) -> CachedSimulationResult:
+    """Build a cache entry with `days` + 1 metrics (Створити запис кешу з `days` + 1 метриками)."""
+    metrics = [SimulationMetrics(s_index=0.5, c_index=0.9, a_index=1.0, timestamp=datetime(2024, 1, 1)) for _ in range(days + 1)]
+    return CachedSimulationResult.build(run_id, 7, metrics, ["log"])
+
+
+def test_cache_key_ignores_in_memory_and_tracks_rules(monkeypatch):
+    """Test key depends on parameters, seed and rule coefficients only (Тест, що ключ залежить лише від параметрів, зерна та коефіцієнтів правил)."""
+    request = SimulationRunRequest(days=10, intensity="low", seed=5)
+    key = simulation_cache_key(request, 5)
+
+    assert simulation_cache_key(request.model_copy(update={"in_memory": True}), 5) == key
+    assert simulation_cache_key(request, 6) != key
+    assert simulation_cache_key(request.model_copy(update={"days": 11}), 5) != key
+    active = agent_logic.rule_config()
+    changed = {**active.coefficients, "ECO_TECH": active.coefficients["ECO_TECH"] + 1}
+    monkeypatch.setattr(agent_logic, "_active_config", replace(active, coefficients=changed))
+    assert simulation_cache_key(request, 5) != key
+
+
+def test_memory_tier_evicts_least_recently_used():
+    """Test memory tier keeps within its byte budget in LRU order (Тест, що рівень пам'яті тримається бюджету в порядку LRU)."""
+    entry_size = _entry("a", 3).size
+    cache = SimulationResultCache(memory_max_bytes=2 * entry_size, db_max_bytes=0)
+    cache.put("a", _entry("a", 3))
+    cache.put("b", _entry("b", 3))
+    assert cache.get("a").simulation_run_id == "a"
+    cache.put("c", _entry("c", 3))
+
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2
+    assert stats["memory_evictions"] == 1
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_run_endpoint_serves_seeded_requests_from_cache():
+    """Test a repeated seeded request is a cache hit with the same body (Тест, що повторний запит із зерном є влучанням з тим самим тілом)."""
+    payload = {"days": 8, "intensity": "medium", "t_market": 30.0, "use_agent": True, "in_memory": True, "seed": 321}
+    with TestClient(app) as client:
+        client.post("/api/v1/system-reset")
+        first = client.post("/api/v1/simulation/run", json=payload)
+        simulation_result_cache.clear()  # force the database tier (змусити використати рівень бази даних)
+        second = client.post("/api/v1/simulation/run", json=payload)
+        third = client.post("/api/v1/simulation/run", json=payload)
+        stats = client.get("/api/v1/simulation/cache/stats").json()
+        unseeded = client.post("/api/v1/simulation/run", json={**payload, "seed": None})
+
+    assert first.headers["X-Simulation-Cache"] == "miss"
+    assert second.headers["X-Simulation-Cache"] == "hit"
+    assert third.headers["X-Simulation-Cache"] == "hit"
+    assert first.json() == second.json() == third.json()
+    assert second.headers["X-Simulation-Run-Id"] == first.headers["X-Simulation-Run-Id"]
+    assert len(get_simulation_history()) == 9
+    assert stats["db_hits"] == 1 and stats["memory_hits"] == 1
+    assert stats["db_entries"] == 1
+    assert "X-Simulation-Cache" not in unseeded.headers
@@ -0,0 +1,104 @@
+"""
+Tests for hot-reloadable agent rule configs (Тести для конфігурацій правил агента з гарячим перезавантаженням).
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.agent_logic as agent_logic
+from app.agent_logic import DEFAULT_COEFFICIENTS, analyze_goal, rule_config, rule_index
+from app.main import app
+from app.models import ResourceType
+from app.repository import save_rule_config
+from app.rule_config import RuleConfigWatcher, reset_rule_coefficients
+
+
+def test_publish_swaps_rules_and_endpoint_reports_version():
+    """Test publishing a coefficient recompiles the rules in place and pinned tables stay untouched (Тест, що публікація коефіцієнта перекомпілює правила на місці, а закріплені таблиці не змінюються)."""
+    pinned = rule_index()
+    try:
+        with TestClient(app) as client:
+            before = client.get("/api/v1/agent/rules").json()
+            published = client.post("/api/v1/agent/rules", json={"coefficients": {"CUST_COMM": 7}})
+            unknown = client.post("/api/v1/agent/rules", json={"coefficients": {"NOPE": 1}})
+            out_of_range = client.post("/api/v1/agent/rules", json={"coefficients": {"CUST_COMM": 500}})
+            after = client.get("/api/v1/agent/rules").json()
+
+        assert published.status_code == 200 and after == published.json()
+        assert after["version"] > before["version"] and after["rule_table_version"] != before["rule_table_version"]
+        assert after["coefficients"]["CUST_COMM"] == 7 and after["overrides"] == {"CUST_COMM": 7}
+        assert unknown.status_code == 422 and out_of_range.status_code == 422
+
+        assert analyze_goal("Клієнтський сервіс", capture_logs=True)[0][ResourceType.COMMUNICATION] == 7
+        assert analyze_goal("Клієнтський сервіс", capture_logs=True, rules=pinned)[0][ResourceType.COMMUNICATION] == before["coefficients"]["CUST_COMM"]
+    finally:
+        reset_rule_coefficients()
+    assert rule_config().coefficients == DEFAULT_COEFFICIENTS
+
+
+def test_watcher_installs_config_published_elsewhere():
+    """Test the watcher picks up a version written by another process (Тест, що спостерігач підхоплює версію, записану іншим процесом)."""
+    watcher = RuleConfigWatcher(interval=0.02)
+    watcher.start()
+    try:
+        row = save_rule_config({"EDU_EDU": 3})
+        deadline = time.monotonic() + 5.0
+        while rule_config().version < row.version and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert rule_config().version == row.version
+        assert rule_config().coefficients == {**DEFAULT_COEFFICIENTS, "EDU_EDU": 3}
+        assert analyze_goal("Освіта та тренінги", capture_logs=True)[0][ResourceType.EDUCATIONAL] == 3
+    finally:
+        watcher.stop()
+        reset_rule_coefficients()
+
+
+def test_stored_overrides_keep_environment_defaults_and_reset():
+    """Test published values override only their own coefficients and a reset returns to the environment (Тест, що опубліковані значення перевизначають лише свої коефіцієнти, а скидання повертає значення з оточення)."""
+    try:
+        with pytest.MonkeyPatch.context() as monkeypatch, TestClient(app) as client:
+            client.post("/api/v1/agent/rules", json={"coefficients": {"CUST_COMM": 7}})
+            # A process started with another RULE_ECO_TECH (Процес, запущений з іншим RULE_ECO_TECH)
+            monkeypatch.setitem(agent_logic.DEFAULT_COEFFICIENTS, "ECO_TECH", 33)
+            published = client.post("/api/v1/agent/rules", json={"coefficients": {"EDU_EDU": 4}}).json()
+            reset = client.delete("/api/v1/agent/rules").json()
+
+        assert published["overrides"] == {"CUST_COMM": 7, "EDU_EDU": 4}
+        assert published["coefficients"]["ECO_TECH"] == 33 and published["coefficients"]["CUST_COMM"] == 7
+        assert reset["version"] > published["version"] and reset["overrides"] == {}
+        assert reset["coefficients"]["ECO_TECH"] == 33 and reset["coefficients"]["CUST_COMM"] == DEFAULT_COEFFICIENTS["CUST_COMM"]
+    finally:
+        reset_rule_coefficients()
+    assert rule_config().coefficients == DEFAULT_COEFFICIENTS
+
+
+def test_concurrent_publishers_get_distinct_versions():
+    """Test simultaneous publications neither fail nor lose each other's overrides (Тест, що одночасні публікації не падають і не втрачають перевизначень одна одної)."""
+    keys = ["ECO_TECH", "ECO_EDU", "CUST_COMM", "INNOV_TECH", "RISK_RISK", "EDU_EDU"]
+    barrier = threading.Barrier(len(keys))
+    rows, errors = [], []
+
+    def publish(key):
+        barrier.wait()
+        try:
+            rows.append(save_rule_config({key: 1}))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=publish, args=(key,)) for key in keys]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    try:
+        assert errors == []
+        assert len({row.version for row in rows}) == len(keys)
+        latest = max(rows, key=lambda row: row.version)
+        assert json.loads(latest.coefficients) == {key: 1 for key in keys}
+    finally:
+        reset_rule_coefficients()
@@ -0,0 +1,59 @@
+"""
+Tests for the per-run simulation registry (Тести для реєстру запусків симуляції).
+"""
+
+import time
+
+from app.run_registry import SimulationRunRegistry
+from app.simulation import clear_simulation_history, get_agent_logs_history, get_simulation_history, iter_simulation, run_simulation
+
+
+def test_registry_is_shared_through_database_and_bounded_locally():
+    """Test another process sees completed runs and evicts completed ones first (Тест, що інший процес бачить завершені запуски й витісняє спершу завершені)."""
+    clear_simulation_history()
+    runs = {run_id: run_simulation(days=3, in_memory=True, seed=n, simulation_run_id=run_id) for n, run_id in enumerate(["r1", "r2", "r3"])}
+
+    # A fresh registry stands in for another uvicorn worker (Новий реєстр імітує інший робочий процес uvicorn)
+    other = SimulationRunRegistry(max_runs=2)
+    assert other.latest_run_id == "r3"
+    assert other.get().metrics == runs["r3"]
+    for run_id in ("r1", "r2", "r3"):
+        assert other.get(run_id).metrics == runs[run_id]
+    assert len(other) == 2
+    assert other.get("r1").metrics == runs["r1"]
+
+    for run_id in ("x", "y"):
+        other.start(run_id)
+    assert list(other._runs) == ["x", "y"]  # completed runs are evicted first (завершені запуски витісняються першими)
+    other.start("z")
+    assert list(other._runs) == ["y", "z"]  # unfinished runs are bounded too (незавершені запуски теж обмежені)
+    clear_simulation_history()
+    assert other.get() is None
+
+
+def test_overlapping_runs_keep_separate_history_and_logs():
+    """Test interleaved runs do not overwrite each other (Тест, що переплетені запуски не перезаписують один одного)."""
+    clear_simulation_history()
+    first = iter_simulation(days=6, intensity="high", in_memory=True, seed=1, simulation_run_id="run-one")
+    second = iter_simulation(days=6, intensity="low", in_memory=True, seed=2, simulation_run_id="run-two")
+    for _ in zip(first, second):
+        pass
+
+    assert len(get_agent_logs_history("run-one")) > len(get_agent_logs_history("run-two")) > 0
+    assert get_simulation_history() == []  # iter_simulation alone does not publish a latest run (сам iter_simulation не публікує останній запуск)
+
+    metrics = run_simulation(days=4, in_memory=True, seed=3, simulation_run_id="run-three")
+    assert get_simulation_history() == metrics
+    assert get_simulation_history("run-three") == metrics
+    clear_simulation_history()
+
+
+def test_idle_unfinished_runs_are_dropped():
+    """Test runs that never complete, e.g. cancelled jobs, are dropped once idle (Тест, що запуски, які не завершуються, напр. скасовані, видаляються після простою)."""
+    registry = SimulationRunRegistry(max_runs=8, stale_seconds=60)
+    registry.start("cancelled")
+    registry.append_agent_logs("cancelled", ["line"])
+    registry._runs["cancelled"].last_used = time.monotonic() - 120
+    registry.start("active")
+
+    assert list(registry._runs) == ["active"]
@@ -0,0 +1,74 @@
+"""
+Tests for scenario compilation and scripted simulation runs (Тести для компіляції сценаріїв і скриптових запусків симуляції).
+"""
+
+from fastapi.testclient import TestClient
+
+import app.scenario as scenario_module
+from app.main import app
+from app.models import SimulationScenario
+from app.scenario import compile_scenario
+from app.simulation import iter_simulation
+
+
+SCENARIO = {
+    "name": "phased",
+    "events": [{"day": 2, "goal": "Цифрова трансформація"}, {"day": 2, "goal": "Екологічна переробка"}],
+    "generators": [{"goals": ["Клієнтський сервіс"], "every": 3, "start_day": 3, "end_day": 9}],
+    "phases": [{"start_day": 5, "intensity": "low"}],
+    "intensity_events": False,
+}
+
+
+def test_compile_scenario_builds_day_indexed_schedule(monkeypatch):
+    """Test phases, scripted events and generators land on the right days (Тест, що фази, заплановані події та генератори потрапляють у правильні дні)."""
+    calls = []
+    original = scenario_module.analyze_goal
+    monkeypatch.setattr(scenario_module, "analyze_goal", lambda goal, capture_logs=False, rules=None: calls.append(goal) or original(goal, capture_logs, rules))
+
+    schedule = compile_scenario(SimulationScenario(**SCENARIO, seed=123), days=10, intensity="high", seed=1)
+
+    assert schedule.days == 10
+    assert [schedule.intensity_for(day) for day in (1, 4, 5, 10)] == ["high", "high", "low", "low"]
+    assert [g.goal for g in schedule.goals_for(2)] == ["Цифрова трансформація", "Екологічна переробка"]
+    assert [day for day in range(1, 11) if schedule.goals_for(day) and day != 2] == [3, 6, 9]
+    assert sorted(calls) == sorted(set(calls))  # each goal classified once (кожна ціль класифікується один раз)
+    assert compile_scenario(SimulationScenario(**SCENARIO, seed=123), days=10, intensity="high", seed=2) is schedule
+
+
+def test_scheduled_goals_drive_the_agent():
+    """Test the agent reacts only on scheduled days (Тест, що агент реагує лише в заплановані дні)."""
+    schedule = compile_scenario(SimulationScenario(**SCENARIO), days=10, intensity="high", seed=1)
+    records = list(iter_simulation(days=10, intensity="high", in_memory=True, seed=1, schedule=schedule))
+
+    changed = [r.day for prev, r in zip(records, records[1:]) if r.s_index != prev.s_index]
+    assert changed and set(changed) <= {2, 3, 6, 9}
+    assert records[1].a_index == records[0].a_index  # no adaptation before the first event (немає адаптації до першої події)
+
+
+def test_run_endpoint_accepts_scenario():
+    """Test runs take an inline scenario and ensembles reject it (Тест, що запуски приймають вбудований сценарій, а ансамблі його відхиляють)."""
+    payload = {"days": 8, "use_agent": False, "in_memory": True, "seed": 3, "scenario": SCENARIO}
+    with TestClient(app) as client:
+        first = client.post("/api/v1/simulation/run", json=payload)
+        ensemble = client.post("/api/v1/simulation/ensemble", json={**payload, "replications": 2})
+
+    assert first.status_code == 200 and len(first.json()) == 9
+    assert ensemble.status_code == 422
+
+
+def test_extend_keeps_scenario_and_resolution():
+    """Test extending a scenario run with sub-day ticks equals one long run with both (Тест, що продовження сценарного запуску з тіками всередині дня дорівнює одному довгому запуску з ними)."""
+    from app.simulation import extend_simulation, run_simulation
+
+    def indices(metrics):
+        return [(m.s_index, m.c_index, m.a_index) for m in metrics]
+
+    scenario = SimulationScenario(**SCENARIO)
+    full = run_simulation(days=10, use_agent=True, in_memory=True, seed=4, ticks_per_day=4, simulation_run_id="scenario-full",
+                          schedule=compile_scenario(scenario, days=10, intensity="high", seed=4))
+    head = run_simulation(days=4, use_agent=True, in_memory=True, seed=4, ticks_per_day=4, simulation_run_id="scenario-extended",
+                          schedule=compile_scenario(scenario, days=4, intensity="high", seed=4))
+    tail = extend_simulation("scenario-extended", days=6, in_memory=True)
+
+    assert indices(head + tail) == indices(full)
@@ -162,3 +162,348 @@ def test_run_simulation_t_market_parameter(clean_simulation):
     assert all(m.a_index >= 0.0 for m in metrics_short)
     assert all(m.a_index >= 0.0 for m in metrics_long)
 
+
+
+def test_run_simulation_in_memory_leaves_live_state_untouched(clean_simulation, monkeypatch):
+    """Test in-memory mode never writes the live state (Тест, що режим у пам'яті не перезаписує живий стан)."""
+    import app.simulation as simulation
+
+    def _forbidden(*args, **kwargs):
+        raise AssertionError("live system state must not be accessed in in-memory mode")
+
+    monkeypatch.setattr(simulation, "read_system_state", _forbidden)
+    monkeypatch.setattr(simulation, "write_system_state", _forbidden)
+
+    for use_agent in (True, False):
+        metrics = run_simulation(days=5, intensity="high", t_market=30.0, use_agent=use_agent, in_memory=True)
+        assert len(metrics) == 6
+        assert get_simulation_history() == metrics
+
+
+def _indices(metrics):
+    """Strip timestamps from metrics (Прибрати часові мітки з метрик)."""
+    return [(m.s_index, m.c_index, m.a_index) for m in metrics]
+
+
+def test_run_simulation_seed_is_reproducible(clean_simulation):
+    """Test that the same seed replays the same run (Тест, що однакове зерно відтворює той самий запуск)."""
+    first = run_simulation(days=10, intensity="high", t_market=30.0, use_agent=True, in_memory=True, seed=2024)
+    second = run_simulation(days=10, intensity="high", t_market=30.0, use_agent=True, in_memory=True, seed=2024)
+    other = run_simulation(days=10, intensity="high", t_market=30.0, use_agent=True, in_memory=True, seed=2025)
+
+    assert _indices(first) == _indices(second)
+    assert _indices(first) != _indices(other)
+
+
+def test_run_simulation_stores_seed_with_run(clean_simulation):
+    """Test that the seed is stored with the run (Тест, що зерно зберігається разом із запуском)."""
+    from app.repository import get_simulation_run
+
+    run_simulation(days=3, intensity="low", t_market=30.0, in_memory=True, seed=77, simulation_run_id="seeded-run")
+
+    run = get_simulation_run("seeded-run")
+    assert run is not None
+    assert run.seed == 77
+    assert run.days == 3
+    assert run.intensity == "low"
+
+
+def test_metrics_writer_flushes_in_bulk(monkeypatch):
+    """Test buffered writer batches rows and flushes every K rows (Тест, що буферизований записувач групує рядки і скидає кожні K рядків)."""
+    import app.repository as repository
+    from app.models import SimulationMetrics
+
+    batches = []
+    monkeypatch.setattr(repository, "save_simulation_metrics_bulk", lambda rows: batches.append(rows) or len(rows))
+
+    with repository.SimulationMetricsWriter("bulk-run", use_agent=True, flush_every=4) as writer:
+        for day in range(10):
+            writer.add(SimulationMetrics(s_index=0.5, c_index=0.9, a_index=0.1), day=day)
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert writer.written == 10
+    assert [row["day"] for batch in batches for row in batch] == list(range(10))
+    assert all(row["simulation_run_id"] == "bulk-run" for batch in batches for row in batch)
+
+
+def test_run_simulation_persists_all_metrics(clean_simulation):
+    """Test that a run stores one metric row per day under its run ID (Тест, що запуск зберігає по рядку метрики на день під своїм ID)."""
+    from app.repository import get_simulation_metrics_by_run_id
+
+    metrics = run_simulation(days=7, intensity="medium", in_memory=True, seed=3, simulation_run_id="bulk-persisted")
+
+    stored = get_simulation_metrics_by_run_id("bulk-persisted")
+    assert _indices(stored) == _indices(metrics)
+
+
+def test_extend_simulation_matches_single_long_run(clean_simulation):
+    """Test that extending a run equals running all days at once (Тест, що продовження запуску дорівнює запуску всіх днів одразу)."""
+    from app.simulation import extend_simulation
+    from app.repository import get_simulation_run, get_simulation_metrics_by_run_id
+
+    full = run_simulation(days=12, intensity="medium", use_agent=True, in_memory=True, seed=8, simulation_run_id="full-run")
+    head = run_simulation(days=5, intensity="medium", use_agent=True, in_memory=True, seed=8, simulation_run_id="extended-run")
+    tail = extend_simulation("extended-run", days=7, in_memory=True)
+
+    assert len(head) == 6 and len(tail) == 7
+    assert _indices(head + tail) == _indices(full)
+    assert _indices(get_simulation_metrics_by_run_id("extended-run")) == _indices(full)
+    assert get_simulation_run("extended-run").days == 12
+    assert _indices(get_simulation_history()) == _indices(full)
+
+
+def test_extend_simulation_unknown_run():
+    """Test extending an unknown run raises LookupError (Тест, що продовження невідомого запуску викликає LookupError)."""
+    from app.simulation import extend_simulation
+
+    with pytest.raises(LookupError):
+        extend_simulation("no-such-run", days=3, in_memory=True)
+
+
+def test_extend_endpoint_runs_on_the_job_pool(monkeypatch, clean_simulation):
+    """Test the extend endpoint goes through the bounded job pool (Тест, що ендпоінт продовження проходить через обмежений пул завдань)."""
+    import threading
+    from fastapi.testclient import TestClient
+    import app.main as main_module
+    from app.jobs import SimulationJobManager
+    from app.models import SimulationRunRequest
+
+    run_simulation(days=4, intensity="medium", use_agent=True, in_memory=True, seed=8, simulation_run_id="extend-endpoint-run")
+    manager = SimulationJobManager(workers=1, queue_limit=0)
+    monkeypatch.setattr(main_module, "simulation_jobs", manager)
+    try:
+        with TestClient(main_module.app) as client:
+            extended = client.post("/api/v1/simulation/runs/extend-endpoint-run/extend", json={"days": 3, "in_memory": True})
+            missing = client.post("/api/v1/simulation/runs/no-such-run/extend", json={"days": 3, "in_memory": True})
+            release = threading.Event()
+            blocking = manager.submit(SimulationRunRequest(days=3, in_memory=True, seed=1), on_record=lambda record: release.wait(5))
+            try:
+                rejected = client.post("/api/v1/simulation/runs/extend-endpoint-run/extend", json={"days": 3, "in_memory": True})
+            finally:
+                release.set()
+                blocking.future.result(timeout=10)
+    finally:
+        manager.shutdown()
+
+    assert extended.status_code == 200 and len(extended.json()) == 3
+    assert missing.status_code == 404
+    assert rejected.status_code == 429
+
+
+def test_iter_simulation_yields_same_series_lazily(clean_simulation):
+    """Test the generator yields the run_simulation series one day at a time (Тест, що генератор повертає ряд run_simulation по одному дню)."""
+    from app.simulation import iter_simulation
+
+    full = run_simulation(days=10, intensity="high", use_agent=False, in_memory=True, seed=4)
+    records = iter_simulation(days=10, intensity="high", use_agent=False, in_memory=True, seed=4, include_state_delta=True)
+
+    first = next(records)
+    assert first.day == 0 and first.state_delta is None
+    rest = list(records)
+    assert [r.day for r in rest] == list(range(1, 11))
+    assert _indices([first] + rest) == _indices(full)
+    assert all(r.ops > 0 for r in rest)
+    assert all(delta == -2.0 for delta in rest[0].state_delta.values())
+
+
+def test_iter_simulation_early_stop_saves_produced_days(clean_simulation):
+    """Test stopping the generator early persists days produced so far (Тест, що рання зупинка генератора зберігає вже отримані дні)."""
+    from app.simulation import iter_simulation
+    from app.repository import get_simulation_metrics_by_run_id
+
+    records = iter_simulation(days=30, intensity="medium", in_memory=True, seed=5, simulation_run_id="stopped-run")
+    taken = [next(records) for _ in range(4)]
+    records.close()
+
+    assert _indices(get_simulation_metrics_by_run_id("stopped-run")) == _indices(taken)
+
+
+@pytest.mark.parametrize("intensity", ["low", "medium", "high", "unknown"])
+def test_control_fast_forward_matches_stepped_loop(clean_simulation, intensity):
+    """Test the closed-form control path reproduces the day-by-day loop exactly (Тест, що шлях контрольної групи за замкненою формулою точно відтворює покроковий цикл)."""
+    from app.simulation import iter_simulation
+    from app.simulation_events import SimulationEventChannel, SimulationEventType
+    from app.repository import get_latest_simulation_checkpoint
+
+    def run(run_id, stepped):
+        channel = SimulationEventChannel()
+        if stepped:
+            # A per-day subscriber forces the stepped loop (Підписник на кожен день змушує виконувати покроковий цикл)
+            channel.subscribe(lambda event: None, [SimulationEventType.DAY_START])
+        records = iter_simulation(days=120, intensity=intensity, use_agent=False, in_memory=True, seed=8,
+                                  simulation_run_id=run_id, events=channel)
+        return [(r.day, r.s_index, r.c_index, r.a_index, r.ops, r.alerts) for r in records]
+
+    assert run(f"fast-{intensity}", stepped=False) == run(f"stepped-{intensity}", stepped=True)
+    fast = get_latest_simulation_checkpoint(f"fast-{intensity}")
+    stepped = get_latest_simulation_checkpoint(f"stepped-{intensity}")
+    assert (fast.state_json, fast.rng_state, fast.total_ops) == (stepped.state_json, stepped.rng_state, stepped.total_ops)
+
+
+def test_sub_day_ticks_roll_up_to_daily_records(clean_simulation):
+    """Test an hourly year keeps daily rollups only and exposes alert bursts (Тест, що погодинний рік зберігає лише денні підсумки та показує сплески алертів)."""
+    from app.simulation import iter_simulation
+    from app.repository import get_simulation_metrics_by_run_id
+
+    records = list(iter_simulation(days=365, intensity="high", in_memory=True, seed=6, simulation_run_id="hourly-run", ticks_per_day=24))
+
+    assert len(records) == 366 and len(get_simulation_metrics_by_run_id("hourly-run")) == 366
+    days = records[1:]
+    assert all(160 <= r.ops <= 240 for r in days)  # high intensity: 200 ops per day ± 20% (висока інтенсивність: 200 операцій на день ± 20%)
+    assert all(r.peak_tick_alerts <= r.alerts for r in days)
+    assert any(r.peak_tick_alerts >= 7 for r in days)  # at least one burst in a year (принаймні один сплеск за рік)
+
+
+def test_run_ndjson_endpoint_streams_records():
+    """Test the NDJSON endpoint streams one record per day (Тест, що NDJSON-ендпоінт передає по запису на день)."""
+    import json
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    payload = {"days": 6, "intensity": "low", "use_agent": True, "in_memory": True, "seed": 9}
+    with TestClient(app) as client:
+        response = client.post("/api/v1/simulation/run-ndjson?include_state_delta=true", json=payload)
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["day"] for line in lines] == list(range(7))
+    assert lines[3]["state_delta"]  # low intensity: event on day 3 (низька інтенсивність: подія на 3-й день)
+    assert response.headers["X-Simulation-Seed"] == "9"
+    assert response.headers["X-Simulation-Job-Id"]
+
+
+def test_run_ndjson_endpoint_uses_the_bounded_job_pool(monkeypatch):
+    """Test NDJSON runs are rejected with 429 when the job pool is full (Тест, що NDJSON-запуски відхиляються з 429, коли пул завдань заповнений)."""
+    import threading
+    from fastapi.testclient import TestClient
+    import app.main as main_module
+    from app.jobs import SimulationJobManager
+    from app.models import SimulationRunRequest
+
+    manager = SimulationJobManager(workers=1, queue_limit=0)
+    monkeypatch.setattr(main_module, "simulation_jobs", manager)
+    release = threading.Event()
+    blocking = manager.submit(SimulationRunRequest(days=3, in_memory=True, seed=1), on_record=lambda record: release.wait(5))
+    try:
+        with TestClient(main_module.app) as client:
+            response = client.post("/api/v1/simulation/run-ndjson", json={"days": 3, "in_memory": True, "seed": 2})
+    finally:
+        release.set()
+        blocking.future.result(timeout=10)
+        manager.shutdown()
+
+    assert response.status_code == 429
+
+
+def test_run_stream_endpoint_respects_event_filter():
+    """Test the SSE endpoint sends day records only when "day" is requested (Тест, що SSE-ендпоінт надсилає записи днів, лише якщо запитано "day")."""
+    import json
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    payload = {"days": 3, "intensity": "low", "use_agent": False, "in_memory": True, "seed": 2}
+    with TestClient(app) as client:
+        filtered = client.post("/api/v1/simulation/run-stream?events=metrics", json=payload)
+        with_days = client.post("/api/v1/simulation/run-stream?events=metrics&events=day", json=payload)
+
+    def types(response):
+        return [json.loads(line[len("data: "):])["type"] for line in response.text.splitlines() if line.startswith("data: ")]
+
+    assert "day" not in types(filtered) and "log" in types(filtered)
+    assert types(with_days).count("day") == 4
+    assert types(filtered)[-1] == types(with_days)[-1] == "complete"
+
+
+def test_live_state_runs_overlap_and_restore_the_original():
+    """Test a paused live-state run does not block another one and the state is restored once both end (Тест, що призупинений запуск із живим станом не блокує інший, а стан відновлюється, коли обидва завершаться)."""
+    import threading
+    from app.repository import read_system_state
+    from app.simulation import iter_simulation
+
+    original = read_system_state()
+    first = iter_simulation(days=3, intensity="low", use_agent=False, seed=1)
+    next(first)
+    finished = threading.Event()
+
+    def run_second():
+        for _ in iter_simulation(days=3, intensity="high", use_agent=True, seed=2):
+            pass
+        finished.set()
+
+    worker = threading.Thread(target=run_second)
+    worker.start()
+    try:
+        assert finished.wait(10)
+        assert read_system_state() != original  # the paused run still owns the live state (призупинений запуск ще володіє живим станом)
+    finally:
+        first.close()
+        worker.join(10)
+
+    assert read_system_state() == original
+
+
+def test_run_endpoint_rejects_and_does_not_cache_cancelled_jobs(monkeypatch):
+    """Test a run cancelled in the queue returns 409 and leaves the cache empty (Тест, що запуск, скасований у черзі, повертає 409 і не потрапляє в кеш)."""
+    import threading
+    import time
+    from fastapi.testclient import TestClient
+    import app.main as main_module
+    from app.jobs import SimulationJobManager
+    from app.models import SimulationJobStatus, SimulationRunRequest
+
+    manager = SimulationJobManager(workers=1, queue_limit=1)
+    monkeypatch.setattr(main_module, "simulation_jobs", manager)
+    release = threading.Event()
+    blocking = manager.submit(SimulationRunRequest(days=3, in_memory=True, seed=1), on_record=lambda record: release.wait(5))
+    responses = []
+    body = {"days": 3, "in_memory": True, "seed": 424242}
+    try:
+        with TestClient(main_module.app) as client:
+            sender = threading.Thread(target=lambda: responses.append(client.post("/api/v1/simulation/run", json=body)))
+            sender.start()
+            for _ in range(500):
+                queued = [job for job in manager.list_jobs() if job is not blocking]
+                if queued:
+                    break
+                time.sleep(0.01)
+            manager.cancel(queued[0].job_id)
+            sender.join(10)
+            release.set()
+            blocking.future.result(timeout=10)
+            retried = client.post("/api/v1/simulation/run", json=body)
+    finally:
+        release.set()
+        manager.shutdown()
+
+    assert queued[0].status == SimulationJobStatus.CANCELLED
+    assert responses[0].status_code == 409
+    assert retried.status_code == 200 and retried.headers["X-Simulation-Cache"] == "miss"
+
+
+def test_await_simulation_job_rejects_partial_results():
+    """Test a job cancelled after some days is not returned as a result (Тест, що завдання, скасоване після кількох днів, не повертається як результат)."""
+    import asyncio
+    import threading
+    from fastapi import HTTPException
+    from app.jobs import SimulationJobManager
+    from app.main import _await_simulation_job
+    from app.models import SimulationJobStatus, SimulationRunRequest
+
+    manager = SimulationJobManager(workers=1, queue_limit=0)
+    submitted = threading.Event()
+
+    def cancel_on_day_two(record):
+        submitted.wait(5)
+        if record.day == 2:
+            job.cancel_event.set()
+
+    try:
+        job = manager.submit(SimulationRunRequest(days=10, in_memory=True, seed=3), on_record=cancel_on_day_two)
+        submitted.set()
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(_await_simulation_job(job))
+    finally:
+        manager.shutdown()
+
+    assert job.status == SimulationJobStatus.CANCELLED and 0 < len(job.result) < 11
+    assert excinfo.value.status_code == 409
@@ -0,0 +1,63 @@
+"""
+Unit tests for structured simulation events (Юніт-тести для структурованих подій симуляції).
+"""
+
+from app.simulation import run_simulation, clear_simulation_history
+from app.simulation_events import (
+    SimulationEventChannel,
+    SimulationEventType,
+    DegradationEvent,
+    MetricsEvent,
+    format_event,
+)
+
+
+def test_channel_delivers_only_subscribed_types():
+    """Test that sinks receive only the types they subscribed to (Тест, що обробники отримують лише підписані типи)."""
+    channel = SimulationEventChannel()
+    received = []
+    channel.subscribe(received.append, [SimulationEventType.METRICS])
+
+    assert channel.wants(SimulationEventType.METRICS)
+    assert not channel.wants(SimulationEventType.DEGRADATION)
+
+    run_simulation(days=4, intensity="high", use_agent=False, in_memory=True, seed=1, events=channel)
+    clear_simulation_history()
+
+    assert [type(e) for e in received] == [MetricsEvent] * 4
+    assert [e.day for e in received] == [1, 2, 3, 4]
+
+
+def test_events_carry_raw_numbers():
+    """Test degradation events carry raw before/after values (Тест, що події деградації містять сирі значення до/після)."""
+    channel = SimulationEventChannel()
+    received = []
+    channel.subscribe(received.append, [SimulationEventType.DEGRADATION])
+
+    run_simulation(days=2, intensity="medium", use_agent=False, in_memory=True, seed=1, events=channel)
+    clear_simulation_history()
+
+    first = received[0]
+    assert isinstance(first, DegradationEvent)
+    assert first.rate == 1.0
+    assert all(old - new == 1.0 for _, old, new in first.resources)
+
+
+def test_log_callback_receives_formatted_text():
+    """Test the legacy log callback still receives formatted lines (Тест, що старий callback логування отримує відформатовані рядки)."""
+    lines = []
+    run_simulation(days=2, intensity="high", use_agent=True, in_memory=True, seed=5, log_callback=lines.append)
+    clear_simulation_history()
+
+    assert lines[0].startswith("Starting simulation: 2 days")
+    assert "Day 1/2" in lines
+    assert any(line.startswith("📊 Operations:") for line in lines)
+    assert lines[-1] == "Agent actions: 2"
+
+
+def test_format_event_metrics():
+    """Test formatting of a metrics event (Тест форматування події метрик)."""
+    event = MetricsEvent(day=1, s_index=0.5, c_index=0.25, a_index=0.1, total_ops=100, total_alerts=5, t_adapt=1.0)
+    lines = format_event(event)
+    assert lines[1] == "   • S Index (Sustainability): 0.500"
+    assert "Total Ops=100" in lines[-1]
@@ -0,0 +1,90 @@
+"""
+Tests for the parameter sweep scheduler (Тести для планувальника перебору параметрів).
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.main import app
+from app.models import SimulationSweepRequest
+from app.sweep import expand_grid
+
+
+def _events(response) -> list:
+    """Parse SSE data lines (Розібрати рядки даних SSE)."""
+    return [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+
+
+def test_expand_grid_dedupes_cells():
+    """Test duplicate grid values collapse into unique cells (Тест, що дублікати в сітці згортаються в унікальні клітинки)."""
+    request = SimulationSweepRequest(intensities=["low", "low", "high"], t_markets=[30, 30.0], days=[5], use_agent=[True, False])
+    cells = expand_grid(request, seed=1)
+    assert len(cells) == 4
+    assert len({cell.key for cell in cells}) == 4
+
+
+def test_sweep_request_limits_grid_size():
+    """Test oversized grids are rejected (Тест, що завеликі сітки відхиляються)."""
+    with pytest.raises(ValidationError):
+        SimulationSweepRequest(intensities=["low"] * 11, t_markets=list(range(1, 11)), days=list(range(1, 11)), use_agent=[True])
+
+
+def test_sweep_endpoint_streams_and_reuses_cells():
+    """Test sweep streams every cell and skips cells computed before (Тест, що перебір передає кожну клітинку і пропускає обчислені раніше)."""
+    payload = {"intensities": ["low", "high"], "t_markets": [30.0], "days": [5], "use_agent": [True, False], "seed": 99, "workers": 2}
+    with TestClient(app) as client:
+        client.post("/api/v1/system-reset")
+        first = _events(client.post("/api/v1/simulation/sweep", json=payload))
+        second = _events(client.post("/api/v1/simulation/sweep", json=payload))
+        results = client.get("/api/v1/simulation/sweep/results").json()
+
+    first_cells = [e for e in first if e["type"] == "cell"]
+    assert len(first_cells) == 4
+    assert first[-1] == {"type": "complete", "seed": 99, "cells": 4, "computed": 4, "cached": 0}
+    assert second[-1]["computed"] == 0 and second[-1]["cached"] == 4
+    assert all(e["cached"] for e in second if e["type"] == "cell")
+    assert len(results["items"]) == 4
+
+
+def test_closing_the_sweep_stream_cancels_pending_cells(monkeypatch):
+    """Test a sweep closed after its first cell does not compute the remaining cells (Тест, що перебір, закритий після першої клітинки, не обчислює решту клітинок)."""
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    import app.sweep as sweep_module
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    started = []
+    run_cell = sweep_module._run_cell
+
+    closed = threading.Event()
+
+    def counted_run_cell(cell, rules):
+        started.append(cell.key)
+        if len(started) > 1:
+            # Later cells outlast the client (Пізніші клітинки триваліші за клієнта)
+            closed.wait(5)
+        return run_cell(cell, rules)
+
+    monkeypatch.setattr(sweep_module, "get_process_pool", lambda: executor)
+    monkeypatch.setattr(sweep_module, "_run_cell", counted_run_cell)
+    request = SimulationSweepRequest(intensities=["low", "medium", "high"], t_markets=[30.0, 45.0], days=[5], use_agent=[True], seed=424242, workers=1)
+
+    async def first_cell_then_close():
+        stream = sweep_module.iter_sweep(request)
+        first = await stream.__anext__()
+        await stream.aclose()
+        closed.set()
+        await asyncio.sleep(0.2)
+        return first
+
+    try:
+        first = asyncio.run(first_cell_then_close())
+    finally:
+        executor.shutdown(wait=True)
+
+    assert first["type"] == "cell" and not first["cached"]
+    assert len(started) == 2
@@ -0,0 +1,57 @@
+"""
+Tests for simulation phase timings (Тести для вимірювання часу фаз симуляції).
+"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.simulation import run_simulation, get_simulation_summary, get_simulation_timings
+from app.timing import RunTimings
+
+
+def test_run_timings_summary_counts_and_percentiles():
+    """Test laps are grouped by phase with ordered percentiles (Тест, що кола групуються за фазами з упорядкованими перцентилями)."""
+    timings = RunTimings()
+    mark = timings.mark()
+    for _ in range(10):
+        mark = timings.lap("work", mark)
+    summary = timings.summary()
+
+    stats = summary["work"]
+    assert stats["count"] == 10
+    assert stats["p50_us"] <= stats["p95_us"] <= stats["p99_us"] <= stats["max_us"]
+
+
+def test_timed_run_reports_phases_in_summary_and_endpoint():
+    """Test a timed run exposes its phases and an untimed one does not (Тест, що виміряний запуск показує фази, а невиміряний - ні)."""
+    metrics = run_simulation(days=5, intensity="low", in_memory=True, seed=2, simulation_run_id="timed-run", collect_timings=True)
+    run_simulation(days=5, intensity="low", in_memory=True, seed=2, simulation_run_id="untimed-run", collect_timings=False)
+
+    timings = get_simulation_timings("timed-run")
+    assert {"event_generation", "ops_generation", "agent", "metrics", "record", "persist"} <= set(timings)
+    assert timings["ops_generation"]["count"] == 5
+    assert get_simulation_summary(metrics, timings)["timings"] == timings
+
+    with TestClient(app) as client:
+        timed = client.get("/api/v1/simulation/timings", params={"run_id": "timed-run"})
+        untimed = client.get("/api/v1/simulation/timings", params={"run_id": "untimed-run"})
+        summary = client.get("/api/v1/simulation/summary", params={"run_id": "timed-run"})
+
+    assert timed.status_code == 200 and timed.json()["timings"]["agent"]["count"] == 5
+    assert untimed.status_code == 404
+    assert "timings" in summary.json()
+
+
+def test_run_request_chooses_timings_through_the_job_path():
+    """Test collect_timings on the request decides whether a job run is timed (Тест, що collect_timings у запиті визначає, чи вимірюється запуск завдання)."""
+    payload = {"days": 4, "intensity": "low", "in_memory": True, "seed": 31}
+    with TestClient(app) as client:
+        untimed = client.post("/api/v1/simulation/run", json={**payload, "collect_timings": False})
+        timed = client.post("/api/v1/simulation/run", json={**payload, "collect_timings": True})
+        untimed_timings = client.get("/api/v1/simulation/timings", params={"run_id": untimed.headers["X-Simulation-Run-Id"]})
+        timed_timings = client.get("/api/v1/simulation/timings", params={"run_id": timed.headers["X-Simulation-Run-Id"]})
+
+    assert timed.headers["X-Simulation-Cache"] == "miss"
+    assert [m["s_index"] for m in timed.json()] == [m["s_index"] for m in untimed.json()]
+    assert untimed_timings.status_code == 404
+    assert timed_timings.status_code == 200 and timed_timings.json()["timings"]["agent"]["count"] == 4